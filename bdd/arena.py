@@ -15,8 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+from bisect import bisect_left, bisect_right
 from collections import defaultdict
-from bdd.bdd_util import reachable_states
+from copy import copy
+
+import dd.cudd as bdd_func
+
+from bdd.bdd_util import reachable_states, rename
 
 
 class Arena:
@@ -44,6 +49,10 @@ class Arena:
         self.edges = None
         self.priorities = None  # priorities[i] yields the ith priority function in a generalized parity game arena
 
+        # unions of the sets of vertices of consecutive priorities, computed when needed (see cumulative_priorities) and
+        # shared with the sub-arenas, whose priorities are restrictions of those of the arena
+        self.priority_ranges = {}
+
     def subarena(self, vertices, manager):
         """
         Creates a sub-arena of the current arena by only keeping a provided set of vertices.
@@ -55,7 +64,6 @@ class Arena:
         :rtype: Arena
         """
 
-        edges_subarena = self.edges & vertices & manager.let(self.mapping_bis, vertices)
         player0_vertices_subarena = self.player0_vertices & vertices
         player1_vertices_subarena = self.player1_vertices & vertices
         priorities_subarena = [defaultdict(lambda: manager.false) for _ in range(self.nbr_functions)]
@@ -66,26 +74,194 @@ class Arena:
                 if not new_priority_bdd == manager.false:
                     priorities_subarena[function_index][priority] = new_priority_bdd
 
-        subarena = Arena()
-        subarena.vars = self.vars
-        subarena.vars_bis = self.vars_bis
-        subarena.all_vars = self.all_vars
-        subarena.mapping_bis = self.mapping_bis
-        subarena.inv_mapping_bis = self.inv_mapping_bis
-
-        # number of vertices is not updated in sub-games as it is never used
-        # subarena.nbr_vertices = ?
-
-        subarena.nbr_digits_vertices = self.nbr_digits_vertices
-        subarena.nbr_functions = self.nbr_functions
+        # the sub-arena shares the variables, mappings and other fields of the arena, including the number of vertices
+        # which is not updated in sub-games as it is never used
+        subarena = copy(self)
 
         subarena.player0_vertices = player0_vertices_subarena
         subarena.player1_vertices = player1_vertices_subarena
-        subarena.edges = edges_subarena
+        subarena.edges = self.restrict_edges(vertices, manager)
         subarena.priorities = priorities_subarena
+        subarena.priority_ranges = dict(self.priority_ranges)
 
         return subarena
 
+    def restrict_edges(self, vertices, manager):
+        """
+        Restrict the edges of the current arena to the edges between vertices of a provided set.
+        :param vertices: the vertices to be kept
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the restricted edges
+        :rtype: dd.cudd.Function
+        """
+
+        return self.edges & vertices & rename(self.mapping_bis, vertices, manager)
+
+    def cumulative_priorities(self, function_index, parity, ascending, manager):
+        """
+        Computes, once for the arena and its sub-arenas, the unions of the sets of vertices of the priorities of a
+        function that are smaller (or greater) than or equal to each priority. They may contain vertices removed from
+        a sub-arena.
+        :param function_index: the index of the priority function
+        :type function_index: int
+        :param parity: the parity of the priorities in the unions, or None for every priority
+        :type parity: int | None
+        :param ascending: whether the unions are of the smaller priorities, otherwise of the greater priorities
+        :type ascending: bool
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the sorted priorities of the function with this parity and the union for each of them
+        :rtype: (list of int, list of dd.cudd.Function)
+        """
+
+        key = (function_index, parity, ascending)
+        if key not in self.priority_ranges:
+            function = self.priorities[function_index]
+            priorities = sorted(priority for priority in function if parity is None or priority % 2 == parity)
+
+            unions = []
+            union = manager.false
+            for priority in (priorities if ascending else reversed(priorities)):
+                union |= function[priority]
+                unions.append(union)
+            if not ascending:
+                unions.reverse()
+
+            self.priority_ranges[key] = (priorities, unions)
+
+        return self.priority_ranges[key]
+
+    def priorities_at_most(self, function_index, priority, manager):
+        """
+        Computes the vertices whose priority for a function is smaller than or equal to a priority.
+        :param function_index: the index of the priority function
+        :type function_index: int
+        :param priority: the priority
+        :type priority: int
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the vertices of priority at most priority
+        :rtype: dd.cudd.Function
+        """
+
+        priorities, unions = self.cumulative_priorities(function_index, None, True, manager)
+        index = bisect_right(priorities, priority) - 1
+        if index < 0:
+            return manager.false
+
+        return unions[index] & (self.player0_vertices | self.player1_vertices)
+
+    def priorities_at_least(self, function_index, priority, manager, parity=None):
+        """
+        Computes the vertices whose priority for a function is greater than or equal to a priority.
+        :param function_index: the index of the priority function
+        :type function_index: int
+        :param priority: the priority
+        :type priority: int
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param parity: if not None, only the vertices whose priority has this parity are kept
+        :type parity: int | None
+        :return: the vertices of priority at least priority
+        :rtype: dd.cudd.Function
+        """
+
+        priorities, unions = self.cumulative_priorities(function_index, parity, False, manager)
+        index = bisect_left(priorities, priority)
+        if index == len(priorities):
+            return manager.false
+
+        return unions[index] & (self.player0_vertices | self.player1_vertices)
+
+    def cpre(self, target, player, manager):
+        """
+        Computes the controllable predecessors of a set of vertices for a player, that is the vertices of the player
+        with at least one successor in the set and the vertices of the opponent whose successors are all in the set.
+        Attractors are computed by iterating this operation.
+        :param target: the set of vertices
+        :type target: dd.cudd.Function
+        :param player: the player for which we compute the predecessors
+        :type player: int
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the controllable predecessors of target
+        :rtype: dd.cudd.Function
+        """
+
+        # BDD representing the target set, using prime variables
+        target_prime = rename(self.mapping_bis, target, manager)
+
+        # BDD representing vertices with at least one successor in the target
+        vertices_one_succ = bdd_func.and_exists(self.edges, target_prime, self.vars_bis)
+
+        # vertices for which there does not exist a successor outside the target, vertices in vertices_all_succ,
+        # which is a negation, that don't exist are ignored since they don't belong to the sets of vertices
+        vertices_all_succ = ~bdd_func.and_exists(self.edges, ~target_prime, self.vars_bis)
+
+        if not player:
+            return (self.player0_vertices & vertices_one_succ) | (self.player1_vertices & vertices_all_succ)
+        else:
+            return (self.player0_vertices & vertices_all_succ) | (self.player1_vertices & vertices_one_succ)
+
+    def pre(self, target, manager):
+        """
+        Computes the predecessors of a set of vertices, that is the vertices with at least one successor in the set.
+        :param target: the set of vertices
+        :type target: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the predecessors of target
+        :rtype: dd.cudd.Function
+        """
+
+        target_prime = rename(self.mapping_bis, target, manager)
+        predecessors = bdd_func.and_exists(self.edges, target_prime, self.vars_bis)
+
+        return (self.player0_vertices | self.player1_vertices) & predecessors
+
+    def post(self, source, manager):
+        """
+        Computes the successors of a set of vertices.
+        :param source: the set of vertices
+        :type source: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the successors of source
+        :rtype: dd.cudd.Function
+        """
+
+        successors_prime = bdd_func.and_exists(self.edges, source, self.vars)
+
+        return (self.player0_vertices | self.player1_vertices) & rename(self.inv_mapping_bis, successors_prime, manager)
+
+    def pick_vertex(self, vertices, manager):
+        """
+        Picks a single vertex in a non-empty set of vertices.
+        :param vertices: the set of vertices
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: one of the vertices
+        :rtype: dd.cudd.Function
+        """
+
+        return manager.cube(manager.pick(vertices, care_vars=set(self.vars)))
+
+    def count_vertices(self, vertices, manager):
+        """
+        Counts the vertices of a set of vertices.
+        :param vertices: the set of vertices
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the number of vertices
+        :rtype: int
+        """
+
+        return int(manager.count(vertices, nvars=len(self.vars)))
+
     def restrict_to_reachable_states(self, init_state, manager, restrict_reach_edges=False, mapping_bis=None):
         """
         Restrict the current arena to reachable states only, for vertices controlled by players and priorities.
@@ -113,7 +289,259 @@ class Arena:
         #       timeouts when the arena grows (see report of SPORE for SYNTCOMP 2022).
         if restrict_reach_edges:
             # No need to modify edges if we just restrict vertices, but this may impact performances.
-            self.edges &= reach_states & manager.let(mapping_bis, reach_states)
+            self.edges &= reach_states & rename(mapping_bis, reach_states, manager)
+
+        new_priorities = []
+        for function in self.priorities:
+            new_dim = defaultdict(lambda: manager.false)
+            for prio in function:
+                new_dim[prio] = function[prio] & reach_states
+            new_priorities.append(new_dim)
+        self.priorities = new_priorities
+
+    def reduce_dimensions(self, manager):
+        """
+        Creates an arena with the same winning regions and fewer or simpler priority functions (the original arena
+        remains unchanged). The priorities of each function are compressed: they are renumbered from 0 or 1, keeping
+        their order and parity, consecutive priorities of the same parity being merged. Then, since player 0 must win
+        every function, functions with even priorities only are removed, a function with odd priorities only is kept
+        alone, and a function B is removed if another function A dominates it: the vertices of each priority a for A
+        all have the same priority g(a) for B, where g is non-decreasing and g(a) is even for every even a, so that
+        every play won for A is also won for B. Identical functions dominate each other and only one of them is kept.
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: a new arena with the reduced priority functions
+        :rtype: Arena
+        """
+
+        vertices = self.player0_vertices | self.player1_vertices
+
+        # non-empty sets of vertices of each compressed priority, by increasing priority
+        compressed = []
+        for function in self.priorities:
+            function_sets = []
+            for priority in sorted(function):
+                bdd = function[priority] & vertices
+                if bdd == manager.false:
+                    continue
+                if not function_sets:
+                    function_sets.append((priority % 2, bdd))
+                elif (function_sets[-1][0] - priority) % 2:
+                    function_sets.append((function_sets[-1][0] + 1, bdd))
+                else:
+                    function_sets[-1] = (function_sets[-1][0], function_sets[-1][1] | bdd)
+            compressed.append(function_sets)
+
+        def dominates(a, b):
+            # whether function b is a non-decreasing and even-preserving map of function a
+            g = []
+            for priority_a, bdd_a in compressed[a]:
+                images = [priority_b for priority_b, bdd_b in compressed[b] if bdd_a & bdd_b != manager.false]
+                if len(images) != 1 or (priority_a % 2 == 0 and images[0] % 2) or (g and images[0] < g[-1]):
+                    return False
+                g.append(images[0])
+            return True
+
+        kept = [index for index in range(self.nbr_functions) if any(p % 2 for p, _ in compressed[index])]
+        odd_only = [index for index in kept if all(p % 2 for p, _ in compressed[index])]
+        if odd_only:
+            kept = odd_only[:1]
+        for index in list(kept):
+            if any(dominates(other, index) for other in kept if other != index):
+                kept.remove(index)
+
+        priorities = [defaultdict(lambda: manager.false, compressed[index]) for index in kept]
+        if not priorities:
+            priorities.append(defaultdict(lambda: manager.false, {0: vertices}))
+
+        # the reduced arena shares every other field of the arena
+        reduced = copy(self)
+
+        reduced.nbr_functions = len(priorities)
+        reduced.priorities = priorities
+        reduced.priority_ranges = {}
+
+        return reduced
+
+
+class OneStepArena(Arena):
+    """
+    Game arena in which each round of the game is a single transition of a symbolic automaton: the environment
+    (player 1) chooses the values of the input atomic propositions, then the system (player 0) chooses the values of the
+    output atomic propositions and the automaton takes a transition. Vertices of the environment are the states of the
+    automaton, with the variable i set to false. The intermediate vertices of the system are pairs of a state and an
+    input, with i set to true. Unlike the arena built by symb_dpa2gpg, the moves of the environment are not part of the
+    edges: they keep the state and only set the inputs, so inputs are quantified directly instead of being copied. The
+    edges are the transitions of the automaton, in which outputs are quantified, from intermediate vertices to states
+    and only next states have copies.
+
+    The sets of vertices are the same as in the arena built by symb_dpa2gpg, so that sub-arenas remain traps for the
+    solvers, but vertices of the environment do not depend on the inputs. Controllable predecessors are computed for a
+    whole round (see cpre).
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # the input atomic propositions and the variable that distinguishes intermediate vertices
+        self.inputs = None
+        self.intermediate = None
+
+    def restrict_edges(self, vertices, manager):
+        """
+        Restrict the edges of the current arena to the edges between vertices of a provided set.
+        :param vertices: the vertices to be kept
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the restricted edges
+        :rtype: dd.cudd.Function
+        """
+
+        intermediate_vertices = manager.let({self.intermediate: True}, vertices)
+        states = manager.let({self.intermediate: False}, vertices)
+
+        return self.edges & intermediate_vertices & rename(self.mapping_bis, states, manager)
+
+    def cpre(self, target, player, manager):
+        """
+        Computes the controllable predecessors of a set of vertices for a player in a whole round. Intermediate
+        vertices are predecessors of the states of target, then states are predecessors of the intermediate vertices
+        of target and of the intermediate vertices just computed. For player 0 and a target that only contains states,
+        the states in the result are the states from which, for all inputs, there exist outputs and a next state in
+        target, that is forall inputs exist outputs exist next-state (transitions & target').
+        :param target: the set of vertices
+        :type target: dd.cudd.Function
+        :param player: the player for which we compute the predecessors
+        :type player: int
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the controllable predecessors of target
+        :rtype: dd.cudd.Function
+        """
+
+        vari = manager.var(self.intermediate)
+
+        # intermediate vertices from which the system takes a transition to a state of target, outputs are already
+        # quantified in the edges
+        target_prime = rename(self.mapping_bis, manager.let({self.intermediate: False}, target), manager)
+        vertices_one_succ = bdd_func.and_exists(self.edges, target_prime, self.vars_bis)
+        vertices_all_succ = ~bdd_func.and_exists(self.edges, ~target_prime, self.vars_bis)
+        system_vertices = manager.let({self.intermediate: True}, self.player0_vertices)
+        system_predecessors = system_vertices & (vertices_all_succ if player else vertices_one_succ)
+
+        # states from which the environment chooses inputs that lead to an intermediate vertex of target
+        target_intermediate = manager.let({self.intermediate: True}, target) | system_predecessors
+        if player:
+            environment_predecessors = manager.exist(self.inputs, system_vertices & target_intermediate)
+        else:
+            environment_predecessors = ~manager.exist(self.inputs, system_vertices & ~target_intermediate)
+
+        return (vari & system_predecessors) | (self.player1_vertices & environment_predecessors)
+
+    def pre(self, target, manager):
+        """
+        Computes the predecessors of a set of vertices: the intermediate vertices from which a transition leads to a
+        state of target and the states with an input that leads to an intermediate vertex of target.
+        :param target: the set of vertices
+        :type target: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the predecessors of target
+        :rtype: dd.cudd.Function
+        """
+
+        vari = manager.var(self.intermediate)
+        system_vertices = manager.let({self.intermediate: True}, self.player0_vertices)
+
+        target_prime = rename(self.mapping_bis, manager.let({self.intermediate: False}, target), manager)
+        system_predecessors = system_vertices & bdd_func.and_exists(self.edges, target_prime, self.vars_bis)
+        environment_predecessors = manager.exist(self.inputs,
+                                                 system_vertices & manager.let({self.intermediate: True}, target))
+
+        return (vari & system_predecessors) | (self.player1_vertices & environment_predecessors)
+
+    def post(self, source, manager):
+        """
+        Computes the successors of a set of vertices: the intermediate vertices of the states of source, for every
+        input, and the states reached by a transition from the intermediate vertices of source.
+        :param source: the set of vertices
+        :type source: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the successors of source
+        :rtype: dd.cudd.Function
+        """
+
+        vari = manager.var(self.intermediate)
+        system_vertices = manager.let({self.intermediate: True}, self.player0_vertices)
+
+        states = manager.exist(self.inputs, manager.let({self.intermediate: False}, source & self.player1_vertices))
+        intermediate_vertices = manager.let({self.intermediate: True}, source & self.player0_vertices)
+        next_states = bdd_func.and_exists(self.edges, intermediate_vertices, self.vars)
+
+        return (vari & system_vertices & states) | \
+            (self.player1_vertices & rename(self.inv_mapping_bis, next_states, manager))
+
+    def pick_vertex(self, vertices, manager):
+        """
+        Picks a single vertex in a non-empty set of vertices. The vertices of the environment do not depend on the
+        inputs.
+        :param vertices: the set of vertices
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: one of the vertices
+        :rtype: dd.cudd.Function
+        """
+
+        assignment = manager.pick(vertices, care_vars=set(self.vars))
+        if not assignment[self.intermediate]:
+            assignment = {var: value for var, value in assignment.items() if var not in self.inputs}
+
+        return vertices & manager.cube(assignment)
+
+    def count_vertices(self, vertices, manager):
+        """
+        Counts the vertices of a set of vertices. The vertices of the environment do not depend on the inputs, each
+        of them is counted once.
+        :param vertices: the set of vertices
+        :type vertices: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the number of vertices
+        :rtype: int
+        """
+
+        intermediate = manager.var(self.intermediate)
+        states = manager.exist(self.inputs, vertices & ~intermediate)
+
+        return int(manager.count(states, nvars=len(self.vars) - len(self.inputs)) +
+                   manager.count(vertices & intermediate, nvars=len(self.vars)))
+
+    def restrict_to_reachable_states(self, init_state, manager, restrict_reach_edges=False, mapping_bis=None):
+        """
+        Restrict the current arena to reachable states only, for vertices controlled by players and priorities.
+        Every input can be chosen in a reachable state.
+        :param init_state: the initial state as boolean expression
+        :type init_state: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param restrict_reach_edges: if we have to restrict edges in addition to vertices
+        :type restrict_reach_edges: bool
+        :param mapping_bis: if restrict_reach_edges is set to True, it must contain the mapping of bis
+                            variables for the outgoing edges
+        :type mapping_bis: dict
+        """
+
+        states = manager.exist(self.inputs + [self.intermediate], init_state)
+        reach_states = reachable_states(states, self.edges, self.vars, self.inv_mapping_bis, [], manager)
+
+        self.player0_vertices &= reach_states
+        self.player1_vertices &= reach_states
+
+        if restrict_reach_edges:
+            self.edges &= reach_states & rename(mapping_bis, reach_states, manager)
 
         new_priorities = []
         for function in self.priorities:
@@ -15,8 +15,6 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-import dd.cudd as bdd_func
-
 
 def attractor(arena, s, player, manager):
     """
@@ -41,35 +39,16 @@ def attractor(arena, s, player, manager):
 
         old_attractor = new_attractor
 
-        # BDD representing the old attractor set, using prime variables
-        old_attractor_prime = manager.let(arena.mapping_bis, old_attractor)
-
-        # BDD representing vertices with at least one successor in the old attractor
-        bdd_vertices_one_succ = arena.edges & old_attractor_prime
-        vertices_one_succ = manager.exist(arena.vars_bis, bdd_vertices_one_succ)
-
-        # BDD representing vertices with at least one successor outside the previous attractor
-        bdd_vertices_all_succ = arena.edges & ~old_attractor_prime
-
-        # vertices for which there does not exist a successor outside the previous attractor
-        vertices_all_succ = ~manager.exist(arena.vars_bis, bdd_vertices_all_succ)
-
-        # if we compute the attractor for player 0
-        if not player:
-            player0_vertices_attractor = arena.player0_vertices & vertices_one_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_all_succ
-        else:
-            player0_vertices_attractor = arena.player0_vertices & vertices_all_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_one_succ
-
-        new_attractor = old_attractor | player0_vertices_attractor | player1_vertices_attractor
+        # the controllable predecessors are computed by the arena, see Arena.cpre
+        new_attractor = old_attractor | arena.cpre(old_attractor, player, manager)
 
     return new_attractor
 
 
 def attractor_cudd(arena, s, player, manager):
     """
-    Computes the attractor of set s for player in the arena. This version uses cudd-specific functions.
+    Computes the attractor of set s for player in the arena. Both attractor functions compute the controllable
+    predecessors with Arena.cpre, which uses cudd-specific functions, this one is kept for the solvers that use it.
     :param arena: the arena in which we compute the attractor
     :type arena: Arena
     :param s: the set for which we compute the attractor
@@ -82,36 +61,7 @@ def attractor_cudd(arena, s, player, manager):
     :rtype: dd.cudd.Function
     """
 
-    old_attractor = manager.false
-    new_attractor = s  # at first attractor only contains s
-
-    # while a fixpoint is not reached
-    while old_attractor != new_attractor:
-
-        old_attractor = new_attractor
-
-        # BDD representing the old attractor set, using prime variables
-        old_attractor_prime = manager.let(arena.mapping_bis, old_attractor)
-
-        # BDD representing vertices with at least one successor in the old attractor
-        vertices_one_succ = bdd_func.and_exists(arena.edges, old_attractor_prime, arena.vars_bis)
-
-        # BDD representing vertices with at least one successor outside the previous attractor
-        vertices_all_succ = ~bdd_func.and_exists(arena.edges, ~old_attractor_prime, arena.vars_bis)
-
-        # if we compute the attractor for player 0
-        if not player:
-            # vertices in vertices_all_succ, which is a negation, that don't exist are ignored since they dont belong to
-            # arena.player0_vertices
-            player0_vertices_attractor = arena.player0_vertices & vertices_one_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_all_succ
-        else:
-            player0_vertices_attractor = arena.player0_vertices & vertices_all_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_one_succ
-
-        new_attractor = old_attractor | player0_vertices_attractor | player1_vertices_attractor
-
-    return new_attractor
+    return attractor(arena, s, player, manager)
 
 
 def monotone_attractor(arena, s, priority, manager):
@@ -135,35 +85,14 @@ def monotone_attractor(arena, s, priority, manager):
     old_attractor = manager.true
     new_attractor = manager.false  # at first attractor only contains s
 
-    vertices_smaller_priority = manager.false
-    for prio, bdd in arena.priorities[0].items():
-        if prio <= priority:
-            vertices_smaller_priority = vertices_smaller_priority | bdd
+    vertices_smaller_priority = arena.priorities_at_most(0, priority, manager)
 
     # while a fixpoint is not reached
     while old_attractor != new_attractor:
 
         old_attractor = new_attractor
 
-        # BDD representing the old attractor set, using prime variables
-        old_attractor_prime = manager.let(arena.mapping_bis, old_attractor | s)
-
-        # BDD representing vertices with at least one successor in the old attractor
-        vertices_one_succ = bdd_func.and_exists(arena.edges, old_attractor_prime, arena.vars_bis)
-
-        # BDD representing vertices with at least one successor outside the previous attractor
-        vertices_all_succ = ~bdd_func.and_exists(arena.edges, ~old_attractor_prime, arena.vars_bis)
-
-        # if we compute the attractor for player 0
-        if not player:
-            player0_vertices_attractor = arena.player0_vertices & vertices_one_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_all_succ
-        else:
-            player0_vertices_attractor = arena.player0_vertices & vertices_all_succ
-            player1_vertices_attractor = arena.player1_vertices & vertices_one_succ
-
         # we impose that the computed predecessors have smaller or equal priority
-        new_attractor = (old_attractor | player0_vertices_attractor | player1_vertices_attractor) & \
-                        vertices_smaller_priority
+        new_attractor = (old_attractor | arena.cpre(old_attractor | s, player, manager)) & vertices_smaller_priority
 
     return new_attractor
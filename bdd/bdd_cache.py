@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+
+import dd.cudd as _bdd
+
+from bdd.arena import Arena, OneStepArena
+from bdd.bdd_util import declare_state_vars
+
+# Version of the format of the files of the cache, part of every key so that files written by a previous version are
+# never read
+CACHE_FORMAT = 1
+
+
+def content_key(paths, *parameters):
+    """
+    Compute the key of a cached object from the content of the files it is built from and the parameters of its
+    construction. Files are identified by their content, not by their path, so that copies of a file share their
+    cached objects.
+    :param paths: the paths to the files the object is built from
+    :type paths: list[str]
+    :param parameters: the parameters that change the object, they must have a stable representation by repr
+    :return: the key, a SHA-256 hexadecimal digest
+    :rtype: str
+    """
+
+    digest = hashlib.sha256(repr((CACHE_FORMAT,) + parameters).encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def declare_order(order, manager):
+    """
+    Make the variables of a recorded order follow this order in a manager. The levels of these variables in the
+    manager do not change, the variables are permuted so that they appear at these levels in the recorded order. Other
+    variables keep their level. The variables of the order must be declared.
+    :param order: the variables, from the top level to the bottom level
+    :type order: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    """
+
+    recorded = set(order)
+    current = [manager.var_at_level(level) for level in range(len(manager.vars))]
+    levels = [level for level, var in enumerate(current) if var in recorded]
+
+    new_order = list(current)
+    for level, var in zip(levels, order):
+        new_order[level] = var
+
+    if new_order != current:
+        _bdd.reorder(manager, {var: level for level, var in enumerate(new_order)})
+
+
+class BDDCache:
+    """
+    On-disk cache of the symbolic automata and arenas built from HOA files, so that they are not built again by each
+    run. Each object is stored under its key (see content_key) in two files of the directory: KEY.json holds the BDDs,
+    written by the dump method of dd in JSON format, and KEY.manifest.json holds the other fields of the object, the
+    names of its BDDs and its variables (the variables of its BDDs, its state variables and their copies) from the top
+    level to the bottom level of the manager. Constant BDDs are only recorded in the manifest since dd cannot dump them.
+
+    Objects are loaded in a manager that may be fresh: the state variables and their copies are declared as when the
+    object is built, the other variables of the manifest are declared at the end of the order, then the variables of
+    the manifest are permuted to follow the recorded order if reorder is True (see declare_order).
+
+    :param directory: the directory of the cache, created if needed
+    :type directory: str
+    :param reorder: whether loading an object makes the order of the manager follow the recorded order, default to True
+    :type reorder: bool
+    """
+
+    def __init__(self, directory, reorder=True):
+        self.directory = directory
+        self.reorder = reorder
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key):
+        return os.path.join(self.directory, key + ".json"), os.path.join(self.directory, key + ".manifest.json")
+
+    def _dump(self, key, fields, roots, manager):
+        # write the BDDs of roots (dict name -> BDD) and the manifest made of fields and the names of the BDDs
+        bdd_path, manifest_path = self._paths(key)
+
+        constants = {name: u == manager.true for name, u in roots.items() if u in [manager.true, manager.false]}
+        dumped = {name: u for name, u in roots.items() if name not in constants}
+        if dumped:
+            manager.dump(bdd_path, dumped, filetype='json')
+
+        support = set(fields['mapping_bis']) | set(fields['mapping_bis'].values())
+        for u in dumped.values():
+            support |= manager.support(u)
+
+        manifest = dict(fields,
+                        order=[var for var in map(manager.var_at_level, range(len(manager.vars))) if var in support],
+                        roots=sorted(dumped),
+                        constants=constants)
+
+        # the manifest is written last, through a temporary file, an object is only cached once its manifest exists
+        with open(manifest_path + ".tmp", 'w') as f:
+            json.dump(manifest, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def _load(self, key, manager, interleaved=True, grouped=False):
+        # return the manifest and the BDDs of the object of key, or None if it is not cached
+        bdd_path, manifest_path = self._paths(key)
+        if not os.path.exists(manifest_path):
+            self.misses += 1
+            return None
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        declare_state_vars(list(manifest['mapping_bis']), list(manifest['mapping_bis'].values()), manager,
+                           interleaved=interleaved, grouped=grouped)
+        manager.declare(*[var for var in manifest['order'] if var not in manager.vars])
+        if self.reorder:
+            declare_order(manifest['order'], manager)
+
+        roots = manager.load(bdd_path) if manifest['roots'] else {}
+        for name, value in manifest['constants'].items():
+            roots[name] = manager.true if value else manager.false
+
+        self.hits += 1
+        return manifest, roots
+
+    def dump_automaton(self, key, aut, manager):
+        """
+        Store a symbolic automaton in the cache.
+        :param key: the key of the automaton
+        :type key: str
+        :param aut: the automaton
+        :type aut: SymbolicGenDPA
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        """
+
+        roots = {'transitions': aut.transitions, 'init': aut.init}
+        priorities = []
+        for function_index, function in enumerate(aut.priorities):
+            priorities.append(sorted(function))
+            for priority, bdd in function.items():
+                roots['priority_' + str(function_index) + '_' + str(priority)] = bdd
+
+        fields = {'vars': aut.vars,
+                  'vars_bis': aut.vars_bis,
+                  'all_vars': aut.all_vars,
+                  'mapping_bis': aut.mapping_bis,
+                  'nbr_vertices': aut.nbr_vertices,
+                  'nbr_digits_vertices': aut.nbr_digits_vertices,
+                  'dimension': aut.dimension,
+                  'priorities': priorities}
+
+        self._dump(key, fields, roots, manager)
+
+    def load_automaton(self, key, manager, interleaved=True, grouped=False):
+        """
+        Load a symbolic automaton from the cache.
+        :param key: the key of the automaton
+        :type key: str
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param interleaved: whether each state variable is declared next to its copy, default to True
+        :type interleaved: bool
+        :param grouped: if variables are interleaved, whether each pair of a state variable and its copy is registered
+                        as a CUDD variable group, default to False
+        :type grouped: bool
+        :return: the automaton, or None if it is not cached
+        :rtype: SymbolicGenDPA
+        """
+
+        # imported here since dpa2bdd uses the cache
+        from bdd.dpa2bdd import SymbolicGenDPA
+
+        loaded = self._load(key, manager, interleaved=interleaved, grouped=grouped)
+        if loaded is None:
+            return None
+        manifest, roots = loaded
+
+        priorities = [defaultdict(lambda: manager.false) for _ in range(manifest['dimension'])]
+        for function_index, function in enumerate(manifest['priorities']):
+            for priority in function:
+                priorities[function_index][priority] = roots['priority_' + str(function_index) + '_' + str(priority)]
+
+        return SymbolicGenDPA(vars=manifest['vars'],
+                              vars_bis=manifest['vars_bis'],
+                              all_vars=manifest['all_vars'],
+                              mapping_bis=manifest['mapping_bis'],
+                              inv_mapping_bis={var_bis: var for var, var_bis in manifest['mapping_bis'].items()},
+                              nbr_vertices=manifest['nbr_vertices'],
+                              nbr_digits_vertices=manifest['nbr_digits_vertices'],
+                              dimension=manifest['dimension'],
+                              transitions=roots['transitions'],
+                              priorities=priorities,
+                              init=roots['init'])
+
+    def dump_arena(self, key, arena, init, manager):
+        """
+        Store an arena built by symb_dpa2gpg or symb_dpa2onestep in the cache, with its initial vertex.
+        :param key: the key of the arena
+        :type key: str
+        :param arena: the arena
+        :type arena: Arena
+        :param init: the initial vertex of the arena
+        :type init: dd.cudd.Function
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        """
+
+        roots = {'player0_vertices': arena.player0_vertices,
+                 'player1_vertices': arena.player1_vertices,
+                 'edges': arena.edges,
+                 'init': init}
+        priorities = []
+        for function_index, function in enumerate(arena.priorities):
+            priorities.append(sorted(function))
+            for priority, bdd in function.items():
+                roots['priority_' + str(function_index) + '_' + str(priority)] = bdd
+
+        fields = {'one_step': isinstance(arena, OneStepArena),
+                  'vars': arena.vars,
+                  'vars_bis': arena.vars_bis,
+                  'all_vars': arena.all_vars,
+                  'mapping_bis': arena.mapping_bis,
+                  'nbr_vertices': arena.nbr_vertices,
+                  'nbr_digits_vertices': arena.nbr_digits_vertices,
+                  'nbr_functions': arena.nbr_functions,
+                  'priorities': priorities}
+        if isinstance(arena, OneStepArena):
+            fields['inputs'] = arena.inputs
+            fields['intermediate'] = arena.intermediate
+
+        self._dump(key, fields, roots, manager)
+
+    def load_arena(self, key, manager, interleaved=True, grouped=False):
+        """
+        Load an arena and its initial vertex from the cache.
+        :param key: the key of the arena
+        :type key: str
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param interleaved: whether each variable of a vertex is declared next to its copy, default to True
+        :type interleaved: bool
+        :param grouped: if variables are interleaved, whether each pair of a variable and its copy is registered as a
+                        CUDD variable group, default to False
+        :type grouped: bool
+        :return: the arena and its initial vertex, or None if it is not cached
+        :rtype: (Arena, dd.cudd.Function)
+        """
+
+        loaded = self._load(key, manager, interleaved=interleaved, grouped=grouped)
+        if loaded is None:
+            return None
+        manifest, roots = loaded
+
+        if manifest['one_step']:
+            arena = OneStepArena()
+            arena.inputs = manifest['inputs']
+            arena.intermediate = manifest['intermediate']
+        else:
+            arena = Arena()
+
+        arena.vars = manifest['vars']
+        arena.vars_bis = manifest['vars_bis']
+        arena.all_vars = manifest['all_vars']
+        arena.mapping_bis = manifest['mapping_bis']
+        arena.inv_mapping_bis = {var_bis: var for var, var_bis in manifest['mapping_bis'].items()}
+
+        arena.nbr_vertices = manifest['nbr_vertices']
+        arena.nbr_digits_vertices = manifest['nbr_digits_vertices']
+        arena.nbr_functions = manifest['nbr_functions']
+
+        arena.player0_vertices = roots['player0_vertices']
+        arena.player1_vertices = roots['player1_vertices']
+        arena.edges = roots['edges']
+        arena.priorities = [defaultdict(lambda: manager.false) for _ in range(manifest['nbr_functions'])]
+        for function_index, function in enumerate(manifest['priorities']):
+            for priority in function:
+                arena.priorities[function_index][priority] = \
+                    roots['priority_' + str(function_index) + '_' + str(priority)]
+
+        return arena, roots['init']
@@ -1,6 +1,7 @@
 import dd.cudd as _bdd
 
 import copy
+import warnings
 from functools import reduce
 
 
@@ -9,6 +10,184 @@ def xb(x_): return "xb" + str(x_)
 def and_iter(u, v): return u & v
 
 
+def declare_state_vars(vars, vars_bis, manager, interleaved=True, grouped=False):
+    """
+    Declare the variables used to encode states and their copies used for the destination of edges. By default, the
+    variables are interleaved, each variable vars[i] is directly followed by vars_bis[i] in the order of the manager
+    (x0, xb0, x1, xb1, ...). This keeps the edge relation small and makes renaming between the two copies cheap since
+    it only swaps adjacent variables. Otherwise, all variables of vars are declared before variables of vars_bis
+    (x0, x1, ..., xb0, xb1, ...). Variables that are already declared keep their position.
+    :param vars: variables that represent the states
+    :type vars: list[str]
+    :param vars_bis: copies of vars used as destination of edges, vars_bis[i] is the copy of vars[i]
+    :type vars_bis: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param interleaved: whether each variable is declared next to its copy, default to True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each newly declared pair (vars[i], vars_bis[i]) is registered
+                    as a CUDD variable group, so that dynamic reordering keeps the pair together, default to False
+    :type grouped: bool
+    """
+
+    if interleaved:
+        new_pairs = [(var, var_bis) for var, var_bis in zip(vars, vars_bis)
+                     if var not in manager.vars and var_bis not in manager.vars]
+        manager.declare(*[var for pair in zip(vars, vars_bis) for var in pair])
+        if grouped:
+            for var, var_bis in new_pairs:
+                group_vars([var, var_bis], manager)
+    else:
+        manager.declare(*vars)
+        manager.declare(*vars_bis)
+
+
+def group_vars(vars, manager):
+    """
+    Register a CUDD variable group for variables that are at contiguous levels in the manager. Dynamic reordering moves
+    a group as a block, groups can be nested. Nothing is done for less than two variables.
+    :param vars: variables of the group, their levels must form a contiguous range
+    :type vars: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    """
+
+    if len(vars) > 1:
+        manager.group({min(vars, key=manager.level_of_var): len(vars)})
+
+
+def set_reordering_phase(phase, manager, reordering_phases=None, reordering_method="sift"):
+    """
+    Enable the dynamic reordering of the manager iff the given phase of the computation is one of reordering_phases.
+    Phases of the full BDD approach are "load" (automata are translated into BDDs), "product" (the product automaton
+    is computed), "arena" (the symbolic arena is built) and "solve" (the game is solved). If reordering_phases is None,
+    the configuration of the manager is not modified. With the "sift-converge" method, the manager is reordered until
+    convergence when a phase during which dynamic reordering is enabled ends.
+    :param phase: the phase that starts
+    :type phase: str
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param reordering_phases: phases during which dynamic reordering is enabled
+    :type reordering_phases: list[str]
+    :param reordering_method: the reordering method, one of REORDERING_METHODS, default to "sift"
+    :type reordering_method: str
+    """
+
+    if reordering_phases is not None:
+        if reordering_method == "sift-converge" and manager.configure()["reordering"]:
+            reorder_until_convergence(manager)
+        manager.configure(reordering=phase in reordering_phases)
+
+
+# Reordering methods of CUDD that can be used through dd, the dynamic reordering of dd always uses group sifting
+REORDERING_METHODS = ["sift", "sift-converge"]
+
+
+def create_manager(memory_estimate=None, initial_cache_size=None, **config):
+    """
+    Create a BDD manager with CUDD as backend. The memory estimate and the initial size of the computed table can only
+    be set when the manager is created, other parameters are the ones of dd.cudd.BDD.configure (reordering,
+    garbage_collection, max_memory, loose_up_to, max_cache_hard, min_hit, max_growth, max_swaps, max_vars). Parameters
+    that are None keep the default value of CUDD.
+    :param memory_estimate: the memory in bytes that the manager is expected to use, in order to size its tables
+    :type memory_estimate: int
+    :param initial_cache_size: the initial number of entries of the computed table (cache)
+    :type initial_cache_size: int
+    :param config: parameters of the manager given to dd.cudd.BDD.configure
+    :type config: dict[str, int | float | bool]
+    :return: the BDD manager
+    :rtype: dd.cudd.BDD
+    """
+
+    manager = _bdd.BDD(memory_estimate=memory_estimate, initial_cache_size=initial_cache_size)
+
+    config = {key: value for key, value in config.items() if value is not None}
+    if config:
+        manager.configure(**config)
+
+    return manager
+
+
+def reorder_until_convergence(manager):
+    """
+    Reorder the variables of the manager by (group) sifting until the number of nodes does not decrease anymore.
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    """
+
+    size = len(manager)
+    manager.reorder()
+    while len(manager) < size:
+        size = len(manager)
+        manager.reorder()
+
+
+def manager_config(manager, reordering_method="sift"):
+    """
+    Describe the effective configuration of the manager as a string "key=value;key=value;..." that can be recorded
+    with the result of a benchmark.
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param reordering_method: the reordering method, one of REORDERING_METHODS, default to "sift"
+    :type reordering_method: str
+    :return: the configuration of the manager
+    :rtype: str
+    """
+
+    # dd warns that the unit of the memory statistics changed, it is not used here
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        stats = manager.statistics()
+    config = manager.configure()
+    config["reordering_method"] = reordering_method
+    config["unique_size"] = stats["unique_size"]
+    config["cache_size"] = stats["cache_size"]
+
+    return ";".join(key + "=" + str(value) for key, value in sorted(config.items()))
+
+
+def memory_size(size):
+    """
+    Convert a memory size such as "512M" or "48G" to a number of bytes. Suffixes K, M and G are powers of 1024, a size
+    without suffix is a number of bytes.
+    :param size: the memory size
+    :type size: str
+    :return: the number of bytes
+    :rtype: int
+    """
+
+    units = {"K": 2 ** 10, "M": 2 ** 20, "G": 2 ** 30}
+    size = size.strip().upper()
+    if size and size[-1] in units:
+        return int(float(size[:-1]) * units[size[-1]])
+    return int(size)
+
+
+def rename(mapping, u, manager):
+    """
+    Rename the variables of u according to mapping, e.g. mapping_bis to get the copy of a set of vertices over the
+    bis variables. The renaming is done by swapping variables with CUDD instead of composing the function, which is
+    cheaper, especially when variables and their copies are adjacent. A swap exchanges the variables in both
+    directions: the keys of mapping are replaced by their values and the values by their keys. It is therefore only
+    equivalent to manager.let(mapping, u) if u does not depend on the variables that are values of mapping, which is
+    the case for sets of vertices. The swap is a private method of dd (dd.cudd.BDD._swap), if the installed version
+    of dd does not provide it, the function is composed with manager.let.
+    :param mapping: dict that maps variables of u to new variables, no variable can appear twice
+    :type mapping: dict[str, str]
+    :param u: the function to rename, it must not depend on values of mapping
+    :type u: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the renamed function
+    :rtype: dd.cudd.Function
+    """
+
+    swap = getattr(manager, "_swap", None)
+    if swap is None:
+        return manager.let(mapping, u)
+    return swap(u, mapping)
+
+
 def decomp_data_file(path):
     """
     Reads a file data.txt and return a tuple of length 3 : the list of APs input, the list of APs output
@@ -43,10 +222,12 @@ def decomp_data_file(path):
     return input_signals, output_signals, automata_path
 
 
-def arbitrary_reorder(nbr_var, aps, manager, declare=True):
+def arbitrary_reorder(nbr_var, aps, manager, declare=True, interleaved=True, grouped=False):
     """
     Reorder the BDD to an arbitrary order besides the dynamic reordering. The new order is :
-    (1) variable states, (2) atomic propositions, (3) successor variable state.
+    (1) variable states, (2) atomic propositions, (3) successor variable state. If interleaved is True, each successor
+    variable state directly follows its variable state and the order is : (1) variable states interleaved with
+    successor variable states, (2) atomic propositions.
 
     In his master thesis, Remco Abraham took the following arbitrary order (without dynamic) :
     (1) APs, (2) current state, (3) successor state, but experimental results showed that our reorder is slightly
@@ -58,32 +239,46 @@ def arbitrary_reorder(nbr_var, aps, manager, declare=True):
 
     :param nbr_var: the number of variable to reorder starting from x0 to x{nbr_var}.
     :type nbr_var: int
-    :param aps: a list of all atomic propositions
+    :param aps: a list of all atomic propositions, with their copies if they are already declared
     :type aps: list[str]
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: a symbolic DPA object that represents the product automaton
-    :rtype: SymbolicGenDPA
+    :param declare: whether the variables states must be declared, default to True
+    :type declare: bool
+    :param interleaved: whether each successor variable state follows its variable state, default to True
+    :type interleaved: bool
+    :param grouped: whether declared pairs of variable states are registered as CUDD variable groups, default to False
+    :type grouped: bool
     """
+
+    if declare:
+        declare_state_vars([x(var) for var in range(nbr_var)], [xb(var) for var in range(nbr_var)], manager,
+                           interleaved=interleaved, grouped=grouped)
+
     new_order = dict()
     i = 0
 
-    # (1) variable states
+    # (1) variable states, with successor variable states in between if interleaved
     for var in range(nbr_var):
-        if declare:
-            manager.declare(x(var))
         new_order[x(var)] = i
         i += 1
+        if interleaved:
+            new_order[xb(var)] = i
+            i += 1
     # (2) atomic propositions
     for var in aps:
         new_order[var] = i
         i += 1
     # (3) successor variable state.
-    for var in range(nbr_var):
-        if declare:
-            manager.declare(xb(var))
-        new_order[xb(var)] = i
-        i += 1
+    if not interleaved:
+        for var in range(nbr_var):
+            new_order[xb(var)] = i
+            i += 1
+    # other variables keep their relative order at the end
+    for var in sorted(manager.vars, key=manager.level_of_var):
+        if var not in new_order:
+            new_order[var] = i
+            i += 1
 
     _bdd.reorder(manager, new_order)
 
@@ -131,7 +326,7 @@ def reachable_states(init, transitions, vars, inv_mapping_bis, ap, manager):
         # Unless we don't use AP on edges anymore
         single_step = manager.exist(var_and_ap, transi_starting_by_states)
 
-        tmp2 = manager.let(inv_mapping_bis, single_step)
+        tmp2 = rename(inv_mapping_bis, single_step, manager)
 
         states = states | tmp2
 
@@ -0,0 +1,113 @@
+def acceptance_shape(arena, manager):
+    """
+    Recognize the games whose priority functions have at most two priorities, up to a compression of the priorities
+    (see Arena.reduce_dimensions). Player 0 must win every function. A function with even priorities only is always
+    won, a function with odd priorities only is always lost. A function whose greatest priority is even and whose other
+    priorities are odd is a Buchi objective: visit its vertices of even priority infinitely often. A function whose
+    greatest priority is odd and whose other priorities are even is a co-Buchi objective: visit its vertices of odd
+    priority finitely often. The conjunction of co-Buchi objectives is the co-Buchi objective of the union of their
+    sets.
+    :param arena: a game arena
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: ("lost", None) if a function is always lost, ("buchi", sets) if every other function is a Buchi objective
+             (with its set of vertices of even priority), ("co-buchi", set) if every other function is a co-Buchi
+             objective (with the union of their vertices of odd priority), None otherwise
+    :rtype: (str, list[dd.cudd.Function] | dd.cudd.Function) | None
+    """
+
+    vertices = arena.player0_vertices | arena.player1_vertices
+
+    buchi_sets = []
+    co_buchi_set = manager.false
+    for function in arena.priorities:
+        priorities = sorted(priority for priority, bdd in function.items() if bdd & vertices != manager.false)
+        parity_changes = sum(1 for p, q in zip(priorities, priorities[1:]) if (p - q) % 2)
+
+        if parity_changes == 0:
+            if priorities and priorities[0] % 2:
+                return "lost", None
+        elif parity_changes == 1:
+            top_parity = priorities[-1] % 2
+            top_set = manager.false
+            for priority in priorities:
+                if priority % 2 == top_parity:
+                    top_set |= function[priority]
+            if top_parity:
+                co_buchi_set |= top_set & vertices
+            else:
+                buchi_sets.append(top_set & vertices)
+        else:
+            return None
+
+    if buchi_sets and co_buchi_set != manager.false:
+        return None
+    if co_buchi_set != manager.false:
+        return "co-buchi", co_buchi_set
+    return "buchi", buchi_sets
+
+
+def generalized_buchi(arena, sets, player, manager):
+    """
+    Solve the game in which player must visit each set of sets infinitely often, with the nested fixpoint
+    nu Z. /\\_j mu Y. cpre(Y) \\/ (sets[j] /\\ cpre(Z)), where cpre is Arena.cpre for player.
+    :param arena: a game arena
+    :type arena: Arena
+    :param sets: the sets of vertices to visit infinitely often
+    :type sets: list[dd.cudd.Function]
+    :param player: the player with the generalized Buchi objective
+    :type player: int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the solution of the game, that is the set of vertices won by each player
+    :rtype: (dd.cudd.Function, dd.cudd.Function)
+    """
+
+    vertices = arena.player0_vertices | arena.player1_vertices
+
+    z = vertices
+    while True:
+        new_z = vertices
+        for target in sets:
+            # vertices from which player can force a visit to target, then a move to z
+            recurrent = target & arena.cpre(z, player, manager)
+            y = manager.false
+            while True:
+                new_y = recurrent | arena.cpre(y, player, manager)
+                if new_y == y:
+                    break
+                y = new_y
+            new_z &= y
+        if new_z == z:
+            break
+        z = new_z
+
+    if player:
+        return vertices & ~z, z
+    return z, vertices & ~z
+
+
+def buchi_fast_path(arena, manager):
+    """
+    Solve the game with a nested fixpoint if it is a (generalized) Buchi or a co-Buchi game (see acceptance_shape). A
+    co-Buchi objective of player 0 is solved as the Buchi objective of player 1 on the same set.
+    :param arena: a game arena
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the solution of the game, that is the set of vertices won by each player, or None if the game is not a
+             Buchi or co-Buchi game
+    :rtype: (dd.cudd.Function, dd.cudd.Function) | None
+    """
+
+    shape = acceptance_shape(arena, manager)
+    if shape is None:
+        return None
+
+    kind, sets = shape
+    if kind == "lost":
+        return manager.false, arena.player0_vertices | arena.player1_vertices
+    if kind == "buchi":
+        return generalized_buchi(arena, sets, 0, manager)
+    return generalized_buchi(arena, [sets], 1, manager)
@@ -1,9 +1,12 @@
+from bdd.bdd_cache import content_key
 from bdd.bdd_util import *
+from bdd.hoa_reader import HOAReader, shift_priorities
+from bdd.label2bdd import label2bdd, merge_edges
 from collections import defaultdict, deque
 from functools import reduce
 
 
-def explicit2symbolic_spot(aut, manager):
+def explicit2symbolic_spot(aut, manager, interleaved=True):
     """
     Construct a new symbolic automaton from a parity automaton generated by Spot. Spot uses BuDDy as binary decision
     diagram (BDD) library for atomic propositions, but deals with explicit automata.
@@ -12,6 +15,8 @@ def explicit2symbolic_spot(aut, manager):
     :type aut: spot.twa_graph
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
     :return: a symbolic DPA object that represents the explicit automaton
     :rtype: SymbolicGenDPA
     """
@@ -32,7 +37,7 @@ def explicit2symbolic_spot(aut, manager):
     mapping_bis = dict(zip(vars, vars_bis))
     inv_mapping_bis = dict(zip(vars_bis, vars))
 
-    manager.declare(*all_vars)
+    declare_state_vars(vars, vars_bis, manager, interleaved=interleaved)
 
     # Get bool expression that is true iff we use digits of init state
     init = build_symbolic_equal(aut.get_init_state_number(), nbr_digits_vertices, manager)
@@ -76,7 +81,7 @@ def explicit2symbolic_spot(aut, manager):
                 label_str = "True"
 
             label = manager.add_expr(label_str)  # use label in transition expression
-            transitions |= src_bdd & label & manager.let(mapping_bis, dst_bdd)
+            transitions |= src_bdd & label & rename(mapping_bis, dst_bdd, manager)
 
     # Add every previous variables in the new automaton
     dpa = SymbolicGenDPA(vars, vars_bis, all_vars, mapping_bis, inv_mapping_bis, nbr_states,
@@ -85,11 +90,13 @@ def explicit2symbolic_spot(aut, manager):
     return dpa
 
 
-def explicit2symbolic_path(path, manager, digit_offset=0):
+def explicit2symbolic_path(path, manager, digit_offset=0, interleaved=True, grouped=False):
     """
-    Construct a new symbolic automaton from a parity automaton generated by Spot (ltl2tgba command)
+    Construct a new symbolic automaton from a parity automaton in HOA format, e.g. generated by Spot (ltl2tgba
+    command). The file is read by HOAReader one state at a time and the priorities are converted to the max even parity
+    condition.
 
-    :param path: the path to the file that contains an automaton as HOA format created by ltl2tgba command.
+    :param path: the path to the file that contains an automaton as HOA format, e.g. created by ltl2tgba command.
     :type path: str
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
@@ -97,21 +104,21 @@ def explicit2symbolic_path(path, manager, digit_offset=0):
                          named x{digit_offset} and the last x{n+digit_offset}. Useful to construct a product so the
                          automata do not need to be remapped. Default to 0.
     :type digit_offset: int
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each pair (x{i}, xb{i}) is registered as a CUDD variable
+                    group, default to False
+    :type grouped: bool
     :return: a symbolic DPA object that represents the explicit automaton
     :rtype: SymbolicGenDPA
     """
 
-    with open(path, 'r') as f:
-        f.readline()  # HOA: v1
-        f.readline()  # name
-        nbr_states = int(f.readline().strip().split('States: ')[1])
-        init_state_number = int(f.readline().strip().split('Start: ')[1])
-        ap = list(map(lambda x_: x_[1:-1], f.readline().strip().split(" ")[2:]))  # remove first and last character
-        f.readline()  # acc-name (parity max even)
-        f.readline()  # Acceptance (priorities Inf Fin ...)
-        f.readline()  # properties
-        f.readline()  # properties
-        f.readline()  # --BODY--
+    with HOAReader(path) as reader:
+        if reader.nbr_states is None or len(reader.start) != 1:
+            raise ValueError("The automaton " + path + " must have a number of states and a single initial state")
+        nbr_states = reader.nbr_states
+        init_state_number = reader.start[0]
+        ap = reader.aps
 
         nbr_digits_vertices = len(bin(nbr_states - 1)) - 2  # binary representation is prefixed by '0b'
         # equivalent : math.ceil(math.log(num_states, 2))
@@ -123,76 +130,61 @@ def explicit2symbolic_path(path, manager, digit_offset=0):
         mapping_bis = dict(zip(vars, vars_bis))
         inv_mapping_bis = dict(zip(vars_bis, vars))
 
-        manager.declare(*all_vars)
+        declare_state_vars(vars, vars_bis, manager, interleaved=interleaved, grouped=grouped)
 
         # Get bool expression that is true iff we use digits of init state
         states = [build_symbolic_equal(i, nbr_digits_vertices, manager, digit_offset=digit_offset) for i in
                   range(nbr_states)]
         init = states[init_state_number]
 
-        # Get a state automaton, colors are encoded in transitions, size is exactly the dimension
-        # We don't know dimension yet, first state will give us the dimension
+        # Get a state automaton, colors are encoded in states, size is exactly the dimension
+        # We don't know dimension yet, first colored state will give us the dimension
         dimension = -1
         priorities = None
         transitions = manager.false
+        # states without acceptance set
+        uncolored = manager.false
 
-        read = f.readline().strip()
-        # while there is a state or a transition
-        while read != "--END--":
-
-            # We read a state information (number, priorities)
-            # e.g. "State: 3 {1,3}" : state number 3, two dimensions
-            if read.startswith("State: "):
-                state_info = read[7:].split(" ")
-                state_number = int(state_info[0])
-                src_bdd = states[state_number]
-                prios = list(map(lambda x_: int(x_), state_info[1][1:-1].split(",")))
+        # BDDs of the sub-expressions of labels, shared by every label of the automaton
+        label_cache = {}
+
+        # The body is read one state at a time, e.g. "State: 3 {1,3}" : state number 3, two dimensions, followed by its
+        # edges "[0 | 1&!0] 3" : transition to the state number 3, the label is first AP or (second AP and not first AP)
+        for state in reader.states():
+            src_bdd = states[state.number]
+
+            if state.priorities is None:
+                uncolored |= src_bdd
+            else:
                 if dimension == -1:
-                    dimension = len(prios)
+                    dimension = len(state.priorities)
                     priorities = [defaultdict(lambda: manager.false) for _ in range(dimension)]
 
                 for dim in range(dimension):
-                    priorities[dim][int(prios[dim])] |= src_bdd
+                    priorities[dim][state.priorities[dim]] |= src_bdd
 
-            # We read a transition coming from the previous state that we saw to a node that we have to read
-            # e.g. "[0 | 1&!0] 3" : the previous src state has a transition to the state number 3, the label is
-            # first AP or (second AP and not first AP).
-            else:
-                label_str, dst_nbr = read.split("] ")
-                label_str = label_str[1:]
-                dst_bdd = states[int(dst_nbr)]  # dst node as bdd function
+            # The labels are compiled directly into BDDs, parallel edges are merged
+            edges = {}
+            for label_str, dst_nbr in state.edges:
+                label = label2bdd(label_str, ap, manager, cache=label_cache, aliases=reader.aliases)
+                if dst_nbr not in edges:
+                    edges[dst_nbr] = (states[dst_nbr], [])
+                edges[dst_nbr][1].append(label)
 
-                if label_str == "t":
-                    label_str = "True"  # if the label is "t", it means true
-                else:
-                    new_label_str = ""
-                    cur_nbr = ""
-                    # We read the label, when we see a number, we concatenate it to a str cur_nbr, when we see other
-                    # char than digit, the corresponding AP of the number is added to the final label then we add the
-                    # read character
-                    for i in range(len(label_str)):
-                        char = label_str[i]
-                        if not char.isdigit():
-                            if cur_nbr != "":
-                                new_label_str += ap[int(cur_nbr)]
-                                cur_nbr = ""
-                            new_label_str += char
-                        else:
-                            cur_nbr += char
-
-                    if cur_nbr != "":  # if the last char was a digit
-                        new_label_str += ap[int(cur_nbr)]
-
-                    label_str = new_label_str
-
-                # Add the transition and the label as bdd function
-                # TODO: Produces "maximum recursion depth exceeded" for some benchmarks, when there are too many labels,
-                #       coming from the parser yacc. Increase the recursion limit solve it for some cases, otherwise we
-                #       get "Segmentation fault (core dumped)" or "killed" then the program exits.
-                label = manager.add_expr(label_str)
-                transitions |= src_bdd & label & manager.let(mapping_bis, dst_bdd)
-
-            read = f.readline().strip()  # loop, read the next line
+            if edges:
+                transitions |= merge_edges(src_bdd, edges, mapping_bis, manager)
+
+        # States without acceptance set are less important than every other state
+        if uncolored != manager.false:
+            if dimension == -1:
+                dimension = 1
+                priorities = [defaultdict(lambda: manager.false)]
+
+            for dim in range(dimension):
+                priorities[dim][reader.uncolored_priority] |= uncolored
+
+            if reader.uncolored_priority == -1:
+                priorities = shift_priorities(priorities)
 
         # Add every previous variables in the new automaton
         dpa = SymbolicGenDPA(vars, vars_bis, all_vars, mapping_bis, inv_mapping_bis, nbr_states,
@@ -201,7 +193,67 @@ def explicit2symbolic_path(path, manager, digit_offset=0):
         return dpa
 
 
-def get_product_automaton(automata_paths, manager, arbitrary_reordering=False, aps=None, remap=True):
+def load_automaton(path, manager, cache=None, digit_offset=0, interleaved=True, grouped=False):
+    """
+    Construct a new symbolic automaton from a parity automaton in HOA format with explicit2symbolic_path, or load it
+    from a cache. The key of the automaton depends on the content of the file and on digit_offset, which changes the
+    names of its variables.
+    :param path: the path to the file that contains an automaton as HOA format
+    :type path: str
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param cache: the cache of automata, default to None (no cache)
+    :type cache: BDDCache
+    :param digit_offset: the offset of the number of digit (see explicit2symbolic_path), default to 0
+    :type digit_offset: int
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each pair (x{i}, xb{i}) is registered as a CUDD variable
+                    group, default to False
+    :type grouped: bool
+    :return: a symbolic DPA object that represents the explicit automaton
+    :rtype: SymbolicGenDPA
+    """
+
+    if cache is None:
+        return explicit2symbolic_path(path, manager, digit_offset=digit_offset, interleaved=interleaved,
+                                      grouped=grouped)
+
+    key = content_key([path], "automaton", digit_offset)
+    aut = cache.load_automaton(key, manager, interleaved=interleaved, grouped=grouped)
+    if aut is None:
+        aut = explicit2symbolic_path(path, manager, digit_offset=digit_offset, interleaved=interleaved,
+                                     grouped=grouped)
+        cache.dump_automaton(key, aut, manager)
+
+    return aut
+
+
+def unique_automata(automata_paths):
+    """
+    Remove the automata whose file has the same content as a previous one. The specification is the conjunction of the
+    automata, a repeated automaton only adds a copy of its states and of its priority function to the product.
+    :param automata_paths: the list of paths to the files that contain an automaton as HOA format
+    :type automata_paths: list[str]
+    :return: the paths to the first file of each content, in their order
+    :rtype: list[str]
+    """
+
+    keys = set()
+    unique_paths = []
+    for path in automata_paths:
+        key = content_key([path])
+        if key not in keys:
+            keys.add(key)
+            unique_paths.append(path)
+
+    return unique_paths
+
+
+def get_product_automaton(automata_paths, manager, arbitrary_reordering=False, aps=None, remap=True,
+                          interleaved=True, grouped=False, reordering_phases=None, reordering_method="sift",
+                          product_order="sequential", prune_reachable=False, stats=None, reencode=False,
+                          minimize=False, cache=None, step_callback=None, fold_weak=False):
     """
     Construct a new symbolic automaton, product of all automata from the list automata_paths generated by Spot
     (ltl2tgba command). This function calls explicit2symbolic_path, then creates a product and returns it.
@@ -214,32 +266,275 @@ def get_product_automaton(automata_paths, manager, arbitrary_reordering=False, a
     :type arbitrary_reordering: bool
     :param aps: if arbitrary_reordering is true, then this must be a list of all atomic propositions
     :type aps: list[str]
+    :param remap: if the automata are remapped when the product is computed, otherwise each automaton is created with
+                  new variables, default to True
+    :type remap: bool
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each pair (x{i}, xb{i}) is registered as a CUDD variable
+                    group, default to False
+    :type grouped: bool
+    :param reordering_phases: if not None, dynamic reordering is enabled only during the phases of this list, "load"
+                              for the translation of automata and "product" for the computation of the product
+    :type reordering_phases: list[str]
+    :param reordering_method: the reordering method, "sift" or "sift-converge" to reorder until convergence at the end
+                              of each phase during which dynamic reordering is enabled, default to "sift"
+    :type reordering_method: str
+    :param product_order: the order in which automata are multiplied, one of PRODUCT_ORDERS (see schedule_product),
+                          default to "sequential"
+    :type product_order: str
+    :param prune_reachable: whether each intermediate product is restricted to the states reachable from its initial
+                            state, so that unreachable combinations of states are not used in the next products,
+                            default to False
+    :type prune_reachable: bool
+    :param stats: if not None, a tuple (number of automata, number of nodes of the transitions, number of nodes of the
+                  transitions once restricted to reachable states and minimized, number of nodes in the manager) is
+                  appended to this list after each product
+    :type stats: list[(int, int, int, int)]
+    :param reencode: whether the reachable states of the product are re-encoded with fewer state variables (see
+                     SymbolicGenDPA.reencode), default to False
+    :type reencode: bool
+    :param minimize: whether bisimilar states are merged in each automaton and each intermediate product (see
+                     SymbolicGenDPA.minimize), default to False
+    :type minimize: bool
+    :param cache: if not None, the automata are loaded from this cache when they are in it and stored in it otherwise
+                  (see load_automaton), default to None
+    :type cache: BDDCache
+    :param step_callback: if not None, a function called with each automaton and each intermediate product, but not
+                          with the complete product, if it returns True the construction stops and the automaton or
+                          intermediate product is returned (see UnrealizabilityCheck), default to None
+    :type step_callback: function
+    :param fold_weak: whether the safety and co-safety dimensions of the product are removed and their rejecting states
+                      become a restriction of the remaining dimensions (see SymbolicGenDPA.fold_weak_dimensions),
+                      default to False
+    :type fold_weak: bool
     :return: a symbolic DPA object that represents the product automaton
     :rtype: SymbolicGenDPA
     """
 
+    set_reordering_phase("load", manager, reordering_phases, reordering_method)
+
     # iterate through all automaton and create each one with or without a shift in the BDD variables used
     if remap:
-        automata = [explicit2symbolic_path(path, manager) for path in automata_paths]
+        automata = [load_automaton(path, manager, cache=cache, interleaved=interleaved, grouped=grouped)
+                    for path in automata_paths]
         digit = sum(map(lambda a: a.nbr_digits_vertices, automata))
     else:
         automata = []
         digit = 0
         for path in automata_paths:
-            aut = explicit2symbolic_path(path, manager, digit_offset=digit)
+            aut = load_automaton(path, manager, cache=cache, digit_offset=digit, interleaved=interleaved,
+                                 grouped=grouped)
             automata.append(aut)
             digit += aut.nbr_digits_vertices
 
+    if minimize:
+        automata_aps = aps if aps is not None else \
+            list(reduce(lambda u, v: u | v, [manager.support(a.transitions) - set(a.all_vars) for a in automata]))
+        automata = [automaton.minimize(automata_aps, manager, interleaved=interleaved, grouped=grouped)
+                    for automaton in automata]
+
+    if step_callback is not None and len(automata) > 1:
+        for automaton in automata:
+            if step_callback(automaton):
+                return automaton
+
+    set_reordering_phase("product", manager, reordering_phases, reordering_method)
+
     if arbitrary_reordering and aps is not None:
         # if we shifted variables for automata computation, variables are already declared so not need to declare here
-        arbitrary_reorder(digit, aps, manager, declare=remap)
+        arbitrary_reorder(digit, aps, manager, declare=remap, interleaved=interleaved, grouped=grouped)
+
+    if product_order == "sequential":
+        # the product is created from left to right, other automata are remapped if we did not shift them
+        product = automata[0]
+        for i in range(1, len(automata)):
+            product = product.product(automata[i], remap=remap, manager=manager, interleaved=interleaved,
+                                      grouped=grouped)
+            product = prune_product(product, i + 1, manager, aps, prune_reachable, stats, minimize,
+                                    interleaved=interleaved, grouped=grouped)
+            if step_callback is not None and i < len(automata) - 1 and step_callback(product):
+                return product
 
-    # the product is created, no need to remap because we already shifted the automata
-    product = reduce(lambda a1, a2: a1.product(a2, remap=remap, manager=manager), automata)
+    else:
+        if remap:
+            # each automaton gets its own variables, as in the sequential product, so that automata can be multiplied
+            # in any order without remapping
+            offset = automata[0].nbr_digits_vertices
+            for i in range(1, len(automata)):
+                nbr_digits = automata[i].nbr_digits_vertices
+                automata[i] = automata[i].remap(offset, manager, interleaved=interleaved, grouped=grouped)
+                offset += nbr_digits
+
+        product = schedule_product(automata, product_order, manager, aps=aps, prune_reachable=prune_reachable,
+                                   stats=stats, minimize=minimize, step_callback=step_callback,
+                                   interleaved=interleaved, grouped=grouped)
+
+    if reencode:
+        if aps is None:
+            aps = list(manager.support(product.transitions) - set(product.all_vars))
+        product = product.reencode(aps, manager, interleaved=interleaved, grouped=grouped)
+
+    if fold_weak:
+        if aps is None:
+            aps = list(manager.support(product.transitions) - set(product.all_vars))
+        product = product.fold_weak_dimensions(aps, manager)
+
+    return product
+
+
+# Orders in which get_product_automaton multiplies automata
+PRODUCT_ORDERS = ["sequential", "smallest", "overlap", "balanced"]
+
+
+def prune_product(product, nbr_automata, manager, aps=None, prune_reachable=False, stats=None, minimize=False,
+                  interleaved=True, grouped=False):
+    """
+    Restrict an intermediate product to its reachable states if prune_reachable is True, merge its bisimilar states if
+    minimize is True, and append its size before and after to stats if stats is not None.
+    :param product: the intermediate product, modified in place by the restriction
+    :type product: SymbolicGenDPA
+    :param nbr_automata: the number of automata multiplied in product
+    :type nbr_automata: int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param aps: the atomic propositions, by default every variable of the transition relation that is not a state
+                variable
+    :type aps: list[str]
+    :param prune_reachable: whether product is restricted to its reachable states, default to False
+    :type prune_reachable: bool
+    :param stats: the list of tuples (number of automata, number of nodes of the transitions, number of nodes of the
+                  transitions once restricted to reachable states and minimized, number of nodes in the manager)
+    :type stats: list[(int, int, int, int)]
+    :param minimize: whether the bisimilar states of product are merged, default to False
+    :type minimize: bool
+    :param interleaved: whether each temporary variable of the minimization is declared next to its copy, default to
+                        True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each pair of temporary variables of the minimization is
+                    registered as a CUDD variable group, default to False
+    :type grouped: bool
+    :return: the pruned product
+    :rtype: SymbolicGenDPA
+    """
+
+    size = product.transitions.dag_size
+
+    if prune_reachable or minimize:
+        if aps is None:
+            aps = list(manager.support(product.transitions) - set(product.all_vars))
+        if prune_reachable:
+            product.restrict_reachable_states(aps, manager)
+        if minimize:
+            product = product.minimize(aps, manager, interleaved=interleaved, grouped=grouped)
+
+    if stats is not None:
+        stats.append((nbr_automata, size, product.transitions.dag_size, len(manager)))
 
     return product
 
 
+def schedule_product(automata, product_order, manager, aps=None, prune_reachable=False, stats=None, minimize=False,
+                     step_callback=None, interleaved=True, grouped=False):
+    """
+    Compute the product of automata whose variables are pairwise disjoint, following a schedule that keeps the
+    intermediate products small:
+    - "sequential": automata are multiplied from left to right.
+    - "smallest": the two automata (or intermediate products) with the smallest transition relations are multiplied
+      first, as in the construction of a Huffman tree.
+    - "overlap": the two automata that share the largest number of atomic propositions are multiplied first, since
+      their labels constrain each other, ties are broken by the size of the transition relations.
+    - "balanced": automata are multiplied pairwise, from left to right, in a balanced binary tree.
+    :param automata: the automata, with disjoint variables
+    :type automata: list[SymbolicGenDPA]
+    :param product_order: the schedule, one of PRODUCT_ORDERS
+    :type product_order: str
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param aps: the atomic propositions, used by "overlap" and to restrict products to reachable states, by default
+                every variable of a transition relation that is not a state variable
+    :type aps: list[str]
+    :param prune_reachable: whether each intermediate product is restricted to its reachable states, default to False
+    :type prune_reachable: bool
+    :param stats: if not None, a tuple (number of automata, number of nodes of the transitions, number of nodes of the
+                  transitions once restricted to reachable states and minimized, number of nodes in the manager) is
+                  appended to this list after each product
+    :type stats: list[(int, int, int, int)]
+    :param minimize: whether the bisimilar states of each intermediate product are merged, default to False
+    :type minimize: bool
+    :param step_callback: if not None, a function called with each intermediate product, if it returns True the
+                          intermediate product is returned, default to None
+    :type step_callback: function
+    :param interleaved: whether each temporary variable of the minimization is declared next to its copy, default to
+                        True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether each pair of temporary variables of the minimization is
+                    registered as a CUDD variable group, default to False
+    :type grouped: bool
+    :return: the product of the automata, or the intermediate product for which step_callback returned True
+    :rtype: SymbolicGenDPA
+    """
+
+    # pairs (automaton or intermediate product, number of automata in it)
+    queue = [(automaton, 1) for automaton in automata]
+
+    def multiply(i, j):
+        # replace queue[i] and queue[j] (i < j) by their product, at position i, and return whether the construction
+        # stops, step_callback is not called with the complete product
+        (a1, n1), (a2, n2) = queue[i], queue[j]
+        prod = a1.product(a2, manager=manager)
+        prod = prune_product(prod, n1 + n2, manager, aps, prune_reachable, stats, minimize, interleaved=interleaved,
+                             grouped=grouped)
+        queue[i] = (prod, n1 + n2)
+        del queue[j]
+        return step_callback is not None and len(queue) > 1 and step_callback(prod)
+
+    def used_aps(automaton):
+        support = manager.support(automaton.transitions)
+        if aps is not None:
+            return support & set(aps)
+        return support - set(automaton.all_vars)
+
+    if product_order == "sequential":
+        while len(queue) > 1:
+            if multiply(0, 1):
+                return queue[0][0]
+
+    elif product_order == "smallest":
+        while len(queue) > 1:
+            first, second = sorted(range(len(queue)), key=lambda k: queue[k][0].transitions.dag_size)[:2]
+            if multiply(min(first, second), max(first, second)):
+                return queue[min(first, second)][0]
+
+    elif product_order == "overlap":
+        supports = [used_aps(automaton) for automaton, _ in queue]
+        while len(queue) > 1:
+            best, best_key = None, None
+            for i in range(len(queue)):
+                for j in range(i + 1, len(queue)):
+                    key = (-len(supports[i] & supports[j]),
+                           queue[i][0].transitions.dag_size + queue[j][0].transitions.dag_size)
+                    if best_key is None or key < best_key:
+                        best, best_key = (i, j), key
+            i, j = best
+            supports[i] = supports[i] | supports[j]
+            del supports[j]
+            if multiply(i, j):
+                return queue[i][0]
+
+    elif product_order == "balanced":
+        while len(queue) > 1:
+            # one level of the tree, the last automaton is kept for the next level if their number is odd
+            for i in range(len(queue) // 2):
+                if multiply(i, i + 1):
+                    return queue[i][0]
+
+    else:
+        raise ValueError("Unknown product order " + product_order)
+
+    return queue[0][0]
+
+
 class SymbolicGenDPA:
     """
     This class represents a symbolic generalized deterministic parity automaton (DPA) encoded with DD library.
@@ -293,7 +588,7 @@ class SymbolicGenDPA:
 
         self.init = init
 
-    def remap(self, new_base_index, manager):
+    def remap(self, new_base_index, manager, interleaved=True, grouped=False):
         """
         Create a new DPA, but shift variables by "new_base_index" value. The first variable goes
         from x{0} to x{new_base_index} in variable list and also in boolean expressions, for every variable.
@@ -303,6 +598,11 @@ class SymbolicGenDPA:
         :type new_base_index: int
         :param manager: the BDD manager
         :type manager: dd.cudd.BDD
+        :param interleaved: whether each new variable x{i} is declared next to its copy xb{i}, default to True
+        :type interleaved: bool
+        :param grouped: if variables are interleaved, whether each new pair (x{i}, xb{i}) is registered as a CUDD
+                        variable group, default to False
+        :type grouped: bool
         :return: a symbolic DPA object with the renamed variables.
         :rtype: SymbolicGenDPA
         """
@@ -321,9 +621,11 @@ class SymbolicGenDPA:
         new.mapping_bis = dict(zip(new.vars, new.vars_bis))
         new.inv_mapping_bis = dict(zip(new.vars_bis, new.vars))
 
-        manager.declare(*new.all_vars)  # No effect if we declare a same variable many times
+        # No effect if we declare a same variable many times
+        declare_state_vars(new.vars, new.vars_bis, manager, interleaved=interleaved, grouped=grouped)
 
-        remap_vars = dict(zip(self.all_vars, new.all_vars))  # Dict to rename vars inside boolean expressions
+        # Dict to rename vars inside boolean expressions, old and new variables can overlap, so we cannot use rename
+        remap_vars = dict(zip(self.all_vars, new.all_vars))
 
         # Rename boolean expressions that represent DPA
         new.init = manager.let(remap_vars, new.init)
@@ -339,7 +641,7 @@ class SymbolicGenDPA:
 
         return new
 
-    def product(self, other, remap=False, manager=None):
+    def product(self, other, remap=False, manager=None, interleaved=True, grouped=False):
         """
         Construct the synchronized product of two automata : self and other.
         :param other: the other automaton to construct the product with
@@ -348,13 +650,19 @@ class SymbolicGenDPA:
         :type remap: bool
         :param manager: the BDD manager used only for the remapped. If remap is False, this can be None, default to None
         :type manager: dd.cudd.BDD
+        :param interleaved: if other is remapped, whether each new variable x{i} is declared next to its copy xb{i},
+                            default to True
+        :type interleaved: bool
+        :param grouped: if other is remapped and variables are interleaved, whether each new pair (x{i}, xb{i}) is
+                        registered as a CUDD variable group, default to False
+        :type grouped: bool
         :return: a symbolic DPA object which is the synchronized product of the two automata self and other
         :rtype: SymbolicGenDPA
         """
 
         # Remap other to have different variable names
         if remap:
-            other = other.remap(len(self.vars), manager)
+            other = other.remap(len(self.vars), manager, interleaved=interleaved, grouped=grouped)
 
         prod = SymbolicGenDPA()
 
@@ -368,7 +676,7 @@ class SymbolicGenDPA:
         # ceiling logs, e.g. for 5 states we use 3 variables, but a product of two 5-states automata, for a total of
         # 25 nodes, does not need 6 variables but only 5 (2^5 = 32 > 25). We have at most one unused variable. In
         # practical, all variables are used but not fully used, since every state is not represented.
-        # TODO: improve the variable loss for big product (might be less performant to reconstruct BDD functions)...
+        # The variable loss for big products can be avoided by re-encoding the reachable states, see reencode.
         prod.nbr_digits_vertices = len(bin(prod.nbr_vertices - 1)) - 2  # binary representation is prefixed by '0b'
 
         # Append lists and mapping of variables
@@ -394,8 +702,8 @@ class SymbolicGenDPA:
 
     def restrict_reachable_states(self, ap, manager):
         """
-        Calculate reachable states of the automaton and restrict this automaton. It's not used anywhere since we
-        restrict in the game.
+        Calculate reachable states of the automaton and restrict this automaton. It is used by get_product_automaton
+        to restrict intermediate products, otherwise we restrict in the game.
         :param ap: atomic propositions over the automaton
         :type ap: list[str]
         :param manager: the BDD manager
@@ -406,7 +714,7 @@ class SymbolicGenDPA:
         reach_states = reachable_states(self.init, self.transitions, self.vars, self.inv_mapping_bis, ap, manager)
 
         # Without this, we can get illegal transitions e.g. from vertices that does not exist
-        self.transitions &= reach_states & manager.let(self.mapping_bis, reach_states)
+        self.transitions &= reach_states & rename(self.mapping_bis, reach_states, manager)
 
         self.priorities = copy.copy(self.priorities)
         for i in range(len(self.priorities)):
@@ -418,6 +726,292 @@ class SymbolicGenDPA:
 
         return reach_states
 
+    def minimize(self, ap, manager, interleaved=True, grouped=False):
+        """
+        Create a new DPA where bisimilar states are merged. Two states are bisimilar if they have the same priority in
+        every dimension and, for every valuation of the atomic propositions, their successors are bisimilar. The
+        equivalence E(x, y) is computed symbolically by partition refinement over the reachable states, with
+        temporary copies xc{i} (and xcb{i}) of the state variables for y. Each class is represented by its smallest
+        state (x0 being the least significant bit), the states of the new DPA are the representatives and it uses the
+        same variables.
+        :param ap: atomic propositions over the automaton
+        :type ap: list[str]
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param interleaved: whether each temporary variable is declared next to its copy, default to True
+        :type interleaved: bool
+        :param grouped: if variables are interleaved, whether each pair of temporary variables is registered as a
+                        CUDD variable group, default to False
+        :type grouped: bool
+        :return: a symbolic DPA object with the merged states
+        :rtype: SymbolicGenDPA
+        """
+
+        vars_c = ['xc' + var[1:] for var in self.vars]
+        vars_c_bis = ['xcb' + var[1:] for var in self.vars]
+        declare_state_vars(vars_c, vars_c_bis, manager, interleaved=interleaved, grouped=grouped)
+
+        to_c = dict(zip(self.vars + self.vars_bis, vars_c + vars_c_bis))  # x -> y, x" -> y"
+        to_bis = merge_two_dicts(self.mapping_bis, dict(zip(vars_c, vars_c_bis)))  # x -> x", y -> y"
+
+        reach_states = reachable_states(self.init, self.transitions, self.vars, self.inv_mapping_bis, ap, manager)
+        transitions = self.transitions & reach_states
+        # rename swaps variables: the functions renamed with to_c do not depend on y and y", and the equivalence
+        # renamed with to_bis does not depend on x" and y"
+        transitions_c = rename(to_c, transitions, manager)
+
+        # labels enabled from each state
+        enabled = manager.exist(self.vars_bis, transitions)
+        same_enabled = ~manager.exist(ap, ~enabled.equiv(rename(to_c, enabled, manager)))
+
+        # initial partition: same priority in every dimension
+        equivalence = reach_states & rename(to_c, reach_states, manager) & same_enabled
+        for dim in self.priorities:
+            same_priority = manager.false
+            for function in dim.values():
+                same_priority |= function & rename(to_c, function, manager)
+            equivalence &= same_priority
+
+        # refinement: x and y are split if, for some valuation, their successors are not equivalent
+        old_equivalence = None
+        while equivalence != old_equivalence:
+            old_equivalence = equivalence
+            not_equivalent_bis = ~rename(to_bis, equivalence, manager)
+            split = manager.exist(ap + self.vars_bis + vars_c_bis,
+                                  transitions & transitions_c & not_equivalent_bis)
+            equivalence &= ~split
+
+        # representative(x, y): y is the smallest state equivalent to x, bits are fixed from the last variable, which
+        # is the most significant one
+        representative = equivalence
+        for var_c in reversed(vars_c):
+            zero = ~manager.var(var_c)
+            can_be_zero = manager.exist(vars_c, representative & zero)
+            representative &= ~can_be_zero | zero
+
+        is_representative = manager.let(dict(zip(vars_c, [manager.var(var) for var in self.vars])), representative)
+
+        def to_representative(function, bis=False):
+            # replace the states of function by their representatives
+            if bis:
+                # destination states x" of function are replaced
+                representative_bis = rename(self.mapping_bis, representative, manager)
+                function = manager.exist(self.vars_bis, function & representative_bis)
+                return rename(dict(zip(vars_c, self.vars_bis)), function, manager)
+            function = manager.exist(self.vars, function & representative)
+            return rename(dict(zip(vars_c, self.vars)), function, manager)
+
+        new = copy.copy(self)
+        new.init = to_representative(self.init)
+        new.transitions = to_representative(transitions & is_representative, bis=True)
+        new.priorities = []
+        for dim in self.priorities:
+            prios = defaultdict(lambda: manager.false)
+            for prio, function in dim.items():
+                prios[prio] = function & is_representative
+            new.priorities.append(prios)
+        new.nbr_vertices = int(manager.count(is_representative, nvars=len(self.vars)))
+
+        return new
+
+    def reencode(self, ap, manager, max_explicit_states=4096, interleaved=True, grouped=False):
+        """
+        Create a new DPA whose reachable states are encoded with fewer state variables. The product of automata
+        concatenates their state variables while only a few combinations of states are reachable. If the number of
+        reachable states is at most max_explicit_states, they are enumerated and the i-th one gets the code i over the
+        first state variables. Otherwise, variables that are constant over the reachable states, or equal to (or the
+        negation of) another variable, are removed symbolically. Transitions, priorities and the initial state are
+        rewritten accordingly.
+        :param ap: atomic propositions over the automaton
+        :type ap: list[str]
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :param max_explicit_states: the largest number of reachable states that are enumerated, default to 4096
+        :type max_explicit_states: int
+        :param interleaved: whether each temporary variable is declared next to its copy, default to True
+        :type interleaved: bool
+        :param grouped: if variables are interleaved, whether each pair of temporary variables is registered as a
+                        CUDD variable group, default to False
+        :type grouped: bool
+        :return: a symbolic DPA object with the new encoding, self if no variable can be removed
+        :rtype: SymbolicGenDPA
+        """
+
+        reach_states = reachable_states(self.init, self.transitions, self.vars, self.inv_mapping_bis, ap, manager)
+        nbr_states = int(manager.count(reach_states, nvars=len(self.vars)))
+
+        new = SymbolicGenDPA()
+        new.nbr_vertices = nbr_states
+        new.dimension = self.dimension
+
+        # Transitions and priorities are restricted to reachable states, so that they can be rewritten
+        transitions = self.transitions & reach_states & rename(self.mapping_bis, reach_states, manager)
+        priorities = [{prio: function & reach_states for prio, function in dim.items()} for dim in self.priorities]
+
+        nbr_digits = len(bin(nbr_states - 1)) - 2
+        if nbr_states <= max_explicit_states and nbr_digits < len(self.vars):
+            # The i-th reachable state is encoded by i over temporary variables, that are renamed to the first state
+            # variables once the previous variables are quantified
+            tmp_vars = ['xr{}'.format(j) for j in range(nbr_digits)]
+            tmp_vars_bis = ['xrb{}'.format(j) for j in range(nbr_digits)]
+            declare_state_vars(tmp_vars, tmp_vars_bis, manager, interleaved=interleaved, grouped=grouped)
+
+            encoding = manager.false
+            for index, state in enumerate(manager.pick_iter(reach_states, care_vars=self.vars)):
+                code = {tmp_vars[j]: bool((index >> j) & 1) for j in range(nbr_digits)}
+                encoding |= manager.cube(state) & manager.cube(code)
+            encoding_bis = rename(merge_two_dicts(self.mapping_bis, dict(zip(tmp_vars, tmp_vars_bis))), encoding,
+                                  manager)
+
+            new.vars = self.vars[:nbr_digits]
+            new.vars_bis = self.vars_bis[:nbr_digits]
+            to_new_vars = dict(zip(tmp_vars + tmp_vars_bis, new.vars + new.vars_bis))
+
+            def encode(function, bis=False):
+                if bis:
+                    function = manager.exist(self.all_vars, function & encoding & encoding_bis)
+                else:
+                    function = manager.exist(self.vars, function & encoding)
+                return rename(to_new_vars, function, manager)
+
+            new.init = encode(self.init)
+            new.transitions = encode(transitions, bis=True)
+            new.priorities = []
+            for dim in priorities:
+                prios = defaultdict(lambda: manager.false)
+                for prio, function in dim.items():
+                    prios[prio] = encode(function)
+                new.priorities.append(prios)
+
+        else:
+            # Variables that are constant, or equal to another variable up to a negation, are replaced in every
+            # function, which does not change them over reachable states
+            substitution = {}
+            new.vars, new.vars_bis = [], []
+            for var, var_bis in zip(self.vars, self.vars_bis):
+                u = manager.var(var)
+                if reach_states & u == manager.false or reach_states & ~u == manager.false:
+                    value = manager.false if reach_states & u == manager.false else manager.true
+                    substitution[var], substitution[var_bis] = value, value
+                    continue
+
+                for kept, kept_bis in zip(new.vars, new.vars_bis):
+                    v = manager.var(kept)
+                    if reach_states & ~u.equiv(v) == manager.false:
+                        substitution[var], substitution[var_bis] = v, manager.var(kept_bis)
+                        break
+                    if reach_states & u.equiv(v) == manager.false:
+                        substitution[var], substitution[var_bis] = ~v, ~manager.var(kept_bis)
+                        break
+                else:
+                    new.vars.append(var)
+                    new.vars_bis.append(var_bis)
+
+            if not substitution:
+                return self
+
+            new.init = manager.let(substitution, self.init & reach_states)
+            new.transitions = manager.let(substitution, transitions)
+            new.priorities = []
+            for dim in priorities:
+                prios = defaultdict(lambda: manager.false)
+                for prio, function in dim.items():
+                    prios[prio] = manager.let(substitution, function)
+                new.priorities.append(prios)
+
+        new.nbr_digits_vertices = len(new.vars)
+        new.all_vars = new.vars + new.vars_bis
+        new.mapping_bis = dict(zip(new.vars, new.vars_bis))
+        new.inv_mapping_bis = dict(zip(new.vars_bis, new.vars))
+
+        return new
+
+    def weak_dimensions(self, ap, manager):
+        """
+        Find the dimensions that are safety or co-safety conditions. In a safety dimension, the set of reachable states
+        with an odd priority is closed under successors: a run is accepted iff it never enters this set. In a co-safety
+        dimension, the set of reachable states with an even priority is closed: a run is accepted iff it enters this
+        set. In both cases, every run eventually stays in the odd states (and is rejected) or outside them (and its
+        priorities are even).
+        :param ap: atomic propositions over the automaton
+        :type ap: list[str]
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: the list of the indexes of the safety and co-safety dimensions
+        :rtype: list[int]
+        """
+
+        reach_states = reachable_states(self.init, self.transitions, self.vars, self.inv_mapping_bis, ap, manager)
+        transitions = self.transitions & reach_states
+
+        def closed(states):
+            # no transition from states leads outside states
+            leaving = manager.exist(ap + self.all_vars, transitions & states & ~rename(self.mapping_bis, states,
+                                                                                       manager))
+            return leaving == manager.false
+
+        weak = []
+        for index, dim in enumerate(self.priorities):
+            odd = reduce(lambda u, v: u | v, [function for prio, function in dim.items() if prio % 2 == 1],
+                         manager.false) & reach_states
+            even = reduce(lambda u, v: u | v, [function for prio, function in dim.items() if prio % 2 == 0],
+                          manager.false) & reach_states
+            if closed(odd) or closed(even):
+                weak.append(index)
+
+        return weak
+
+    def fold_weak_dimensions(self, ap, manager):
+        """
+        Create a new DPA without its safety and co-safety dimensions (see weak_dimensions). Such a dimension is
+        rejecting iff the run eventually stays in its odd states. The union of the odd states of these dimensions, the
+        bad states, is such that a run is rejected by one of them iff it eventually stays in the bad states, and
+        otherwise it eventually never visits them. Bad states become a restriction of the remaining dimensions: they
+        get, in the first remaining dimension, an odd priority greater than every other priority, so that a run that
+        stays in them is rejected while the priorities of the other runs are unchanged from some point on. If every
+        dimension is weak, the new DPA has a single dimension where bad states have priority 1 and other states 0.
+        :param ap: atomic propositions over the automaton
+        :type ap: list[str]
+        :param manager: the BDD manager
+        :type manager: dd.cudd.BDD
+        :return: a symbolic DPA object with fewer dimensions, self if no dimension is weak or if there is a single
+                 dimension
+        :rtype: SymbolicGenDPA
+        """
+
+        weak = self.weak_dimensions(ap, manager)
+        if not weak or self.dimension == 1:
+            return self
+
+        bad = manager.false
+        states = manager.false
+        for index in weak:
+            for prio, function in self.priorities[index].items():
+                states |= function
+                if prio % 2 == 1:
+                    bad |= function
+
+        new = copy.copy(self)
+        new.priorities = [dim for index, dim in enumerate(self.priorities) if index not in weak]
+
+        if new.priorities:
+            dim = new.priorities[0]
+            top = max(dim) + 1 if max(dim) % 2 == 0 else max(dim) + 2
+            prios = defaultdict(lambda: manager.false)
+            for prio, function in dim.items():
+                prios[prio] = function & ~bad
+            prios[top] = bad
+            new.priorities[0] = prios
+        else:
+            prios = defaultdict(lambda: manager.false)
+            prios[0] = states & ~bad
+            prios[1] = bad
+            new.priorities = [prios]
+
+        new.dimension = len(new.priorities)
+
+        return new
+
     def __str__(self):
         return "Generalised Parity Automaton : variables: {}, number of states: {}, dimension: {}" \
             .format(self.vars, self.nbr_vertices, self.dimension)
@@ -1,9 +1,83 @@
 from bdd.bdd_util import *
 import math
-from bdd.arena import Arena
+from bdd.arena import Arena, OneStepArena
 
 
-def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
+def copies(aps):
+    """
+    Return the names of the copies of the given atomic propositions, used to store the assignment of input atomic
+    propositions chosen by the environment in the vertices of the arena.
+    :param aps: atomic propositions
+    :type aps: list[str]
+    :return: the copies of the atomic propositions
+    :rtype: list[str]
+    """
+
+    return list(map(lambda s: s + 'b"', aps))
+
+
+def declare_signals(ap_inpt, ap_oupt, manager, interleaved=True, grouped=False):
+    """
+    Declare the input and output atomic propositions. If interleaved is True, each input atomic proposition is directly
+    followed by its copy used in the arena (see symb_dpa2gpg). If grouped is True, the input atomic propositions (and
+    their copies) and the output atomic propositions are registered as two CUDD variable groups, as well as each pair
+    made of an input atomic proposition and its copy, so that dynamic reordering keeps them together. Groups are
+    registered before any other variable is declared after the atomic propositions, since variables inserted inside a
+    group are not part of it.
+    :param ap_inpt: the input atomic propositions, controlled by the environment (player 1).
+    :type ap_inpt: list[str]
+    :param ap_oupt: the output atomic propositions, controlled by the system (player 0).
+    :type ap_oupt: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param interleaved: whether copies of input atomic propositions are declared next to them, default to True
+    :type interleaved: bool
+    :param grouped: whether CUDD variable groups are registered, default to False
+    :type grouped: bool
+    :return: the declared variables, in the order of their declaration
+    :rtype: list[str]
+    """
+
+    if interleaved:
+        inputs = [var for pair in zip(ap_inpt, copies(ap_inpt)) for var in pair]
+        declare_state_vars(ap_inpt, copies(ap_inpt), manager, interleaved=True, grouped=grouped)
+    else:
+        inputs = list(ap_inpt)
+        manager.declare(*inputs)
+    manager.declare(*ap_oupt)
+
+    if grouped:
+        group_vars(inputs, manager)
+        group_vars(ap_oupt, manager)
+
+    return inputs + ap_oupt
+
+
+def declare_copies(aps, aps_bis, manager, interleaved=True):
+    """
+    Declare copies of atomic propositions that are already declared. If interleaved is True, each copy is inserted
+    just below its atomic proposition in the order of the manager, otherwise copies are declared at the end of the
+    order. Copies that are already declared keep their position.
+    :param aps: declared atomic propositions
+    :type aps: list[str]
+    :param aps_bis: copies of atomic propositions, aps_bis[i] is the copy of aps[i]
+    :type aps_bis: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param interleaved: whether each copy is inserted next to its atomic proposition, default to True
+    :type interleaved: bool
+    """
+
+    for ap, ap_bis in zip(aps, aps_bis):
+        if ap_bis in manager.vars:
+            continue
+        if interleaved:
+            manager.insert_var(ap_bis, manager.level_of_var(ap) + 1)
+        else:
+            manager.declare(ap_bis)
+
+
+def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False, interleaved=True, grouped=False):
     """
     Construct a new symbolic generalized parity game (gpg) from a symbolic generalized parity automaton (dpa).
     :param aut: the source automaton
@@ -16,6 +90,12 @@ def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
     :type manager: dd.cudd.BDD
     :param restrict_reach_edges: true to restrict edges in addition to vertices, it may not be needed
     :type restrict_reach_edges: bool
+    :param interleaved: whether each input atomic proposition is directly followed by its copy in the order of the
+                        manager, as is the case for the variables of the automaton, default to True
+    :type interleaved: bool
+    :param grouped: if variables are interleaved, whether the pair of variables (i, ib) is registered as a CUDD
+                    variable group, default to False
+    :type grouped: bool
     :return: a symbolic gpg object that represents the symbolic dpa
     :rtype: Arena
     """
@@ -23,7 +103,7 @@ def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
     # First, we define the variables to represent the symbolic arena through the BDD,
     # we need bis variables to define the outgoing vertex of each edge.
 
-    ap_inpt_bis = list(map(lambda s: s + 'b"', ap_inpt))
+    ap_inpt_bis = copies(ap_inpt)
 
     vars = aut.vars + ap_inpt + ['i']
     vars_bis = aut.vars_bis + ap_inpt_bis + ['ib']
@@ -32,9 +112,9 @@ def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
     mapping_bis = dict(zip(vars, vars_bis))
     inv_mapping_bis = dict(zip(vars_bis, vars))
 
-    # other variable are already declared
-    manager.declare(*ap_inpt_bis)
-    manager.declare('i', 'ib')
+    # other variable are already declared, copies of input atomic propositions can be declared by declare_signals
+    declare_copies(ap_inpt, ap_inpt_bis, manager, interleaved=interleaved)
+    declare_state_vars(['i'], ['ib'], manager, interleaved=interleaved, grouped=grouped)
 
     nbr_vertices = aut.nbr_vertices * (1 + int(math.pow(2, len(ap_inpt))))
     nbr_digits_vertices = len(bin(nbr_vertices - 1)) - 2
@@ -101,3 +181,67 @@ def symb_dpa2gpg(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
                                        mapping_bis=mapping_bis)
 
     return arena, init
+
+
+def symb_dpa2onestep(aut, ap_inpt, ap_oupt, manager, restrict_reach_edges=False):
+    """
+    Construct a new symbolic generalized parity game (gpg) from a symbolic generalized parity automaton (dpa), in which
+    each round is a single transition of the automaton (see OneStepArena). Compared to symb_dpa2gpg, there are no
+    copies of the input atomic propositions and of the variable i, and the edges do not contain the equivalence of
+    each state variable and its copy for the moves of the environment. The game and its solution are the same.
+    :param aut: the source automaton
+    :type aut: SymbolicGenDPA
+    :param ap_inpt: the input atomic propositions, controlled by the environment (player 1).
+    :type ap_inpt: list[str]
+    :param ap_oupt: the output atomic propositions, controlled by the system (player 0).
+    :type ap_oupt: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param restrict_reach_edges: true to restrict edges in addition to vertices, it may not be needed
+    :type restrict_reach_edges: bool
+    :return: a symbolic gpg object that represents the symbolic dpa
+    :rtype: OneStepArena
+    """
+
+    vars = aut.vars + ap_inpt + ['i']
+
+    # only the states of the automaton have copies, for the next state of the transitions
+    mapping_bis = dict(zip(aut.vars, aut.vars_bis))
+    inv_mapping_bis = dict(zip(aut.vars_bis, aut.vars))
+
+    if 'i' not in manager.vars:
+        manager.declare('i')
+
+    nbr_vertices = aut.nbr_vertices * (1 + int(math.pow(2, len(ap_inpt))))
+    nbr_digits_vertices = len(bin(nbr_vertices - 1)) - 2
+
+    vari = manager.var("i")
+
+    init = aut.init & ~vari & reduce(and_iter, [~manager.var(a) for a in ap_inpt], manager.true)
+
+    arena = OneStepArena()
+
+    arena.vars = vars
+    arena.vars_bis = aut.vars_bis
+    arena.all_vars = vars + aut.vars_bis
+    arena.mapping_bis = mapping_bis
+    arena.inv_mapping_bis = inv_mapping_bis
+
+    arena.inputs = ap_inpt
+    arena.intermediate = 'i'
+
+    arena.nbr_vertices = nbr_vertices
+    arena.nbr_digits_vertices = nbr_digits_vertices
+    arena.nbr_functions = aut.dimension
+
+    # vertices of the environment do not depend on the inputs, the system chooses the outputs in its vertices
+    arena.player0_vertices = vari
+    arena.player1_vertices = ~vari
+    arena.edges = manager.exist(ap_oupt, aut.transitions)
+    arena.priorities = aut.priorities
+
+    arena.restrict_to_reachable_states(init, manager,
+                                       restrict_reach_edges=restrict_reach_edges,
+                                       mapping_bis=mapping_bis)
+
+    return arena, init
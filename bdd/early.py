@@ -0,0 +1,88 @@
+from bdd.dpa2gpg import symb_dpa2onestep
+from bdd.generalizedBuchiSolver import buchi_solver_gen
+from bdd.generalizedRecursive import generalized_recursive
+
+
+def lost_by_system(aut, ap_inpt, ap_oupt, manager, use_partial_solver=True):
+    """
+    Check whether the system (player 0) loses the game of an automaton from its initial vertex. The game is built by
+    symb_dpa2onestep. If use_partial_solver is True, the game is first given to the partial solver buchi_solver_gen and
+    is only solved by the recursive algorithm when the initial vertex is not in a partial winning region.
+    :param aut: the automaton
+    :type aut: SymbolicGenDPA
+    :param ap_inpt: the input atomic propositions, controlled by the environment (player 1).
+    :type ap_inpt: list[str]
+    :param ap_oupt: the output atomic propositions, controlled by the system (player 0).
+    :type ap_oupt: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param use_partial_solver: whether the partial solver is called first, default to True
+    :type use_partial_solver: bool
+    :return: whether the environment wins from the initial vertex, and whether the partial solver decided it
+    :rtype: (bool, bool)
+    """
+
+    arena, init = symb_dpa2onestep(aut, ap_inpt, ap_oupt, manager)
+    init_vertex = next(manager.pick_iter(init))
+
+    if use_partial_solver:
+        partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen(arena, manager)
+
+        if manager.let(init_vertex, partial_winning_region_player1) == manager.true:
+            return True, True
+        if manager.let(init_vertex, partial_winning_region_player0) == manager.true:
+            return False, True
+
+        arena = arena.subarena(~(partial_winning_region_player0 | partial_winning_region_player1), manager)
+
+    _, winning_region_player1 = generalized_recursive(arena, manager)
+
+    return manager.let(init_vertex, winning_region_player1) == manager.true, False
+
+
+class UnrealizabilityCheck:
+    """
+    Step callback of get_product_automaton that detects unrealizable specifications before the product of their
+    automata is complete. The specification is the conjunction of the automata, a strategy of the system for the
+    specification is also winning for each automaton and each partial product. Hence, if the system loses the game of
+    an automaton or of an intermediate product (see lost_by_system), the specification is unrealizable and the
+    callback stops the construction of the product.
+
+    :param ap_inpt: the input atomic propositions, controlled by the environment (player 1).
+    :type ap_inpt: list[str]
+    :param ap_oupt: the output atomic propositions, controlled by the system (player 0).
+    :type ap_oupt: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param use_partial_solver: whether the partial solver is called before the recursive algorithm, default to True
+    :type use_partial_solver: bool
+    """
+
+    def __init__(self, ap_inpt, ap_oupt, manager, use_partial_solver=True):
+        self.ap_inpt = ap_inpt
+        self.ap_oupt = ap_oupt
+        self.manager = manager
+        self.use_partial_solver = use_partial_solver
+
+        # whether a game lost by the system was found, the number of games solved and the number of games decided by
+        # the partial solver
+        self.unrealizable = False
+        self.nbr_games = 0
+        self.nbr_partial = 0
+
+    def __call__(self, aut):
+        """
+        Solve the game of an automaton or an intermediate product.
+        :param aut: the automaton
+        :type aut: SymbolicGenDPA
+        :return: whether the system loses, in which case the construction of the product can stop
+        :rtype: bool
+        """
+
+        lost, partial = lost_by_system(aut, self.ap_inpt, self.ap_oupt, self.manager, self.use_partial_solver)
+
+        self.nbr_games += 1
+        self.nbr_partial += partial
+        self.unrealizable = self.unrealizable or lost
+
+        return lost
@@ -17,51 +17,16 @@
 
 from bdd.attractor import attractor
 from itertools import product
-import dd.cudd as bdd_func
 
 def attractor_pos(bdd, g, i, f):
-    k = 1
-
-    # Code non-optimized
-    # f_1 = (g.tau & bdd.let(g.mapping_bis, f))
-    # f_1 = bdd.exist(g.bis_vars, f_1)
-    f_1 = bdd_func.and_exists(g.edges, bdd.let(g.mapping_bis, f), g.vars_bis)
-
-    # Code non-optimized
-    # f_2 = g.tau & bdd.let(g.mapping_bis, ~f)
-    # f_2 = ~(bdd.exist(g.bis_vars, f_2))
-    f_2 = ~ bdd_func.and_exists(g.edges, bdd.let(g.mapping_bis, ~f), g.vars_bis)
-    if i == 0:
-        f_1 = g.player0_vertices & f_1
-        f_2 = g.player1_vertices & f_2
-    else:
-        f_1 = g.player1_vertices & f_1
-        f_2 = g.player0_vertices & f_2
-
-    attr_old = f_1 | f_2
+    # vertices from which player i can force a visit to f in at least one step, the controllable predecessors are
+    # computed by the arena, see Arena.cpre
+    attr_old = g.cpre(f, i, bdd)
     while True:
-        # Code non-optimized
-        # f_1 = (g.tau & bdd.let(g.mapping_bis, attr_old))
-        # f_1 = (bdd.exist(g.bis_vars, f_1))
-        f_1 = bdd_func.and_exists(g.edges, bdd.let(g.mapping_bis, attr_old), g.vars_bis)
-
-        # Code non-optimized
-        # f_2 = g.tau & bdd.let(g.mapping_bis, ~(attr_old | f))
-        # f_2 = ~(bdd.exist(g.bis_vars, f_2))
-        f_2 = ~ bdd_func.and_exists(g.edges, bdd.let(g.mapping_bis, ~(attr_old | f)), g.vars_bis)
-
-        if i == 0:
-            f_1 = g.player0_vertices & f_1
-            f_2 = g.player1_vertices & f_2
-        else:
-            f_1 = g.player1_vertices & f_1
-            f_2 = g.player0_vertices & f_2
-
-        attr_new = attr_old | f_1 | f_2
+        attr_new = attr_old | g.cpre(attr_old | f, i, bdd)
         if attr_new == attr_old:
             break
         attr_old = attr_new
-        k = k + 1
     return attr_old
 
 def recur(bdd, g, i, f):
@@ -89,50 +54,27 @@ def buchi_inter_safety(bdd, g, i, f, s):
     g_bar = g.subarena(~attr_adv_f, bdd)
     return buchi(bdd, g_bar, i, f)
 
-# Return vertices with even priorities greater or equal than min_prio on dimension f_index
+# Return vertices with even priorities greater or equal than min_prio on dimension f_index, the unions of priorities
+# are computed once by the arena and max_values is no longer needed
 def sup_prio_expr_even(arena, bdd, min_prio, f_index, max_values):
-    expr_res = bdd.false
-    if min_prio % 2 == 0:
-        init_prio = min_prio
-    else:
-        init_prio = min_prio + 1
-    for curr_prio in range(init_prio, max_values[f_index] + 1, 2):
-        expr_res = expr_res | arena.priorities[f_index][curr_prio]
-    return expr_res
+    return arena.priorities_at_least(f_index, min_prio, bdd, parity=0)
 
 # Return vertices with odd priorities greater or equal than min_prio on dimension f_index
 def sup_prio_expr_odd(arena, bdd, min_prio, f_index, max_values):
-    expr_res = bdd.false
-    if min_prio % 2 == 1:
-        init_prio = min_prio
-    else:
-        init_prio = min_prio + 1
-    for curr_prio in range(init_prio, max_values[f_index] + 1, 2):
-        expr_res = expr_res | arena.priorities[f_index][curr_prio]
-    return expr_res
+    return arena.priorities_at_least(f_index, min_prio, bdd, parity=1)
 
 # Return vertices with a odd priority greater or equal than min_prios[l] in at least one dimension l
 def sup_one_prio_odd(arena, bdd, min_prios, max_values):
     expr_res = bdd.false
     for prio_f_index in range(arena.nbr_functions):
-        if min_prios[prio_f_index] % 2 == 0:
-            init_prio = min_prios[prio_f_index] + 1
-        else:
-            init_prio = min_prios[prio_f_index]
-        for curr_prio in range(init_prio, max_values[prio_f_index] + 1, 2):
-            expr_res = expr_res | arena.priorities[prio_f_index][curr_prio]
+        expr_res = expr_res | arena.priorities_at_least(prio_f_index, min_prios[prio_f_index], bdd, parity=1)
     return expr_res
 
 # Return vertices with a even priority greater or equal than min_prios[l] in at least one dimension l
 def sup_one_prio_even(arena, bdd, min_prios, max_values):
     expr_res = bdd.false
     for prio_f_index in range(arena.nbr_functions):
-        if min_prios[prio_f_index] % 2 == 1:
-            init_prio = min_prios[prio_f_index] + 1
-        else:
-            init_prio = min_prios[prio_f_index]
-        for curr_prio in range(init_prio, max_values[prio_f_index] + 1, 2):
-            expr_res = expr_res | arena.priorities[prio_f_index][curr_prio]
+        expr_res = expr_res | arena.priorities_at_least(prio_f_index, min_prios[prio_f_index], bdd, parity=0)
     return expr_res
 
 # Return winning regions in a game with a generalized Buchi objective for player 0
@@ -161,13 +103,18 @@ def buchi_inter_safety_gen(bdd, g, f, s):
     return buchi_gen(bdd, g_bar, f)
 
 
-def buchi_solver_gen(arena, manager):
+def buchi_solver_gen(arena, manager, init=None, player1_exhausted=False):
     """
     k = nbr func
     @param arena:
     @type arena:
     @param manager:
     @type manager:
+    @param init: if not None, a vertex, the solver stops as soon as a region that contains it is found
+    @type init: dd.cudd.Function
+    @param player1_exhausted: whether no 1-priority gives a region to player 1, which stays true in the sub-arena
+                              obtained by removing an attractor of player 0, where player 1 has fewer choices
+    @type player1_exhausted: bool
     @return:
     @rtype:
     """
@@ -183,7 +130,7 @@ def buchi_solver_gen(arena, manager):
                 max_priorities[function_index] = (priority)
 
     # Iterate over all 1-priority
-    for prio_f_index in range(arena.nbr_functions):
+    for prio_f_index in range(arena.nbr_functions if not player1_exhausted else 0):
         # arena.d[prio_f_index] max prio selon cette dimension ?
         for curr_prio in range(max_priorities[prio_f_index] + 1):
             if curr_prio % 2 == 1 and not arena.priorities[prio_f_index][curr_prio] == manager.false:
@@ -193,25 +140,52 @@ def buchi_solver_gen(arena, manager):
                 w = attractor(arena, buchi_inter_safety(manager, arena, 1, u, u_bis), 1, manager)
 
                 if not w == manager.false:
+                    if init is not None and init & ~w == manager.false:
+                        return manager.false, w
                     ind_game = arena.subarena(~w, manager)
-                    (z0, z1) = buchi_solver_gen(ind_game, manager)
+                    (z0, z1) = buchi_solver_gen(ind_game, manager, init)
                     return z0, z1 | w
 
+    # greatest priorities first, their safety objectives are the weakest
     even_priorities = [[] for _ in range(arena.nbr_functions)]
     for prio_f_index in range(arena.nbr_functions):
-        for curr_prio in range(0, max_priorities[prio_f_index] + 1, 2):
+        for curr_prio in range(max_priorities[prio_f_index] - max_priorities[prio_f_index] % 2, -1, -2):
             if not arena.priorities[prio_f_index][curr_prio] == manager.false:
                 even_priorities[prio_f_index].append(curr_prio)
 
+    vertices = arena.player0_vertices | arena.player1_vertices
+
+    # the attractor of player 1 to the vertices to avoid is shared by the vectors that have the same ones
+    safety_attractors = {}
+
+    # vectors whose safe vertices miss one of the targets (the function index) or all of them (None), the vectors that
+    # are smaller for every function and have the same target have fewer safe vertices and are skipped
+    failed = []
+
     all_combinations = product(*even_priorities)
     # Iterate over all 0-priority vectors
     for curr_comb in all_combinations:
+        if any(all(curr_comb[l] <= comb[l] for l in range(arena.nbr_functions)) and
+               (index is None or curr_comb[index] == comb[index]) for comb, index in failed):
+            continue
+
         u = [arena.priorities[l][curr_comb[l]] for l in range(arena.nbr_functions)]
         u_bis = sup_one_prio_odd(arena, manager, curr_comb, max_priorities)
-        w = attractor(arena, buchi_inter_safety_gen(manager, arena, u, u_bis), 0, manager)
+        if u_bis not in safety_attractors:
+            safety_attractors[u_bis] = attractor(arena, u_bis, 1, manager)
+        safe = vertices & ~safety_attractors[u_bis]
+
+        missed = [l for l in range(arena.nbr_functions) if u[l] & safe == manager.false]
+        if missed:
+            failed.append((curr_comb, missed[0] if safe != manager.false else None))
+            continue
+
+        w = attractor(arena, buchi_gen(manager, arena.subarena(safe, manager), u), 0, manager)
         if not w == manager.false:
+            if init is not None and init & ~w == manager.false:
+                return w, manager.false
             ind_game = arena.subarena(~w, manager)
-            (z0, z1) = buchi_solver_gen(ind_game, manager)
+            (z0, z1) = buchi_solver_gen(ind_game, manager, init, player1_exhausted=True)
             return z0 | w, z1
 
     return manager.false, manager.false
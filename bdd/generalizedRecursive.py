@@ -19,6 +19,7 @@ from bdd.attractor import attractor_cudd
 from collections import defaultdict
 
 from bdd.generalizedBuchiSolver import buchi_solver_gen, buchi_solver_gen_inverted_players
+from bdd.localSolver import restrict_to_init
 
 
 def complement_priorities(arena, manager):
@@ -54,35 +55,56 @@ def complement_priorities(arena, manager):
         if not max_priorities[function_index] % 2:
             max_priorities[function_index] += 1
 
+    # the unions of consecutive priorities are those of the former priorities
+    arena.priority_ranges = {}
+
     return max_priorities
 
 
-def generalized_recursive(arena, manager):
+def generalized_recursive(arena, manager, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using the recursive algorithm.
     :param arena: a game arena
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames, only used for sub-arenas of arena
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_par_win)
+    :type init: dd.cudd.Function
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
     max_priorities = complement_priorities(arena, manager)
 
-    return disj_par_win(arena, max_priorities, manager)
+    return disj_par_win(arena, max_priorities, manager, cache, init)
 
 
-def disj_par_win(arena, max_priorities, manager):
+def disj_par_win(arena, max_priorities, manager, cache=None, init=None):
     """
-    Procedure to solve the generalized parity game provided in arena using the recursive algorithm.
+    Procedure to solve the generalized parity game provided in arena using the recursive algorithm. With a cache, the
+    solution of a subgame is looked up by the BDD of its vertices and the maximal priorities before it is computed:
+    the loops of the algorithm and its calls for different priority functions often meet the same subgames.
+
+    With init, only the winner of the vertex init is decided. The attractor a1 of q_bar for player 1 is won by player 1
+    in the arena, so the call returns as soon as a1 contains init, and otherwise solves the rest of the arena
+    restricted to the vertices reachable from init, which keeps the winner of init. The calls on the subgames h solve
+    them entirely: their winning regions are attracted in g_bar and decide whether the loop stops, so h cannot be
+    restricted. The partial solutions are not stored in the cache.
     :param arena: a game arena
     :type arena: Arena
     :param max_priorities: the maximal priorities occurring in the arena
     :type max_priorities: list of int
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: dd.cudd.Function
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
@@ -90,6 +112,12 @@ def disj_par_win(arena, max_priorities, manager):
             ((arena.player0_vertices == manager.false) and (arena.player1_vertices == manager.false)):
         return arena.player0_vertices | arena.player1_vertices, manager.false
 
+    if cache is not None:
+        key = (arena.player0_vertices | arena.player1_vertices, tuple(max_priorities))
+        solution = cache.get(key)
+        if solution is not None:
+            return solution
+
     for function_index in range(arena.nbr_functions):
 
         if max_priorities[function_index] != 1:
@@ -112,7 +140,7 @@ def disj_par_win(arena, max_priorities, manager):
                 copy_max_priorities = max_priorities[:]  # faster copy
                 copy_max_priorities[function_index] -= 2
 
-                w0, w1 = disj_par_win(h, copy_max_priorities, manager)
+                w0, w1 = disj_par_win(h, copy_max_priorities, manager, cache)
 
                 if g_bar.player0_vertices | g_bar.player1_vertices == manager.false \
                         or w1 == (h.player0_vertices | h.player1_vertices):
@@ -134,14 +162,26 @@ def disj_par_win(arena, max_priorities, manager):
                                     q_bar,
                                     1,
                                     manager)
-                w0_bis, w1_bis = disj_par_win(arena.subarena(~a1, manager), max_priorities, manager)
+                if init is not None and init & ~a1 == manager.false:
+                    return manager.false, a1
+
+                remaining = arena.subarena(~a1, manager)
+                if init is not None:
+                    remaining = restrict_to_init(remaining, init, manager)
+                w0_bis, w1_bis = disj_par_win(remaining, max_priorities, manager, cache, init)
 
-                return w0_bis, a1 | w1_bis
+                solution = w0_bis, a1 | w1_bis
+                if cache is not None and init is None:
+                    cache.put(key, solution)
+                return solution
 
-    return arena.player0_vertices | arena.player1_vertices, manager.false
+    solution = arena.player0_vertices | arena.player1_vertices, manager.false
+    if cache is not None:
+        cache.put(key, solution)
+    return solution
 
 
-def generalized_recursive_with_psolver(arena, manager):
+def generalized_recursive_with_psolver(arena, manager, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using a combination of a provided partial solver and the
     recursive algorithm.
@@ -149,13 +189,24 @@ def generalized_recursive_with_psolver(arena, manager):
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames, only used for sub-arenas of arena
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_par_win), the regions of the
+                 partial solver are also won in the arena
+    :type init: dd.cudd.Function
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
     partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen(arena, manager)
 
+    if init is not None and init & ~(partial_winning_region_player0 | partial_winning_region_player1) == manager.false:
+        return partial_winning_region_player0, partial_winning_region_player1
+
     remaining_unsolved = arena.subarena(~(partial_winning_region_player0 | partial_winning_region_player1), manager)
+    if init is not None:
+        remaining_unsolved = restrict_to_init(remaining_unsolved, init, manager)
 
     if (remaining_unsolved.player0_vertices == manager.false) and \
             (remaining_unsolved.player1_vertices == manager.false):
@@ -163,12 +214,13 @@ def generalized_recursive_with_psolver(arena, manager):
 
     max_priorities = complement_priorities(remaining_unsolved, manager)
 
-    winning_region_player0, winning_region_player1 = disj_par_win(remaining_unsolved, max_priorities, manager)
+    winning_region_player0, winning_region_player1 = disj_par_win(remaining_unsolved, max_priorities, manager, cache,
+                                                                  init)
 
     return winning_region_player0 | partial_winning_region_player0, winning_region_player1 | partial_winning_region_player1
 
 
-def generalized_recursive_with_psolver_multiple_calls(arena, manager):
+def generalized_recursive_with_psolver_multiple_calls(arena, manager, schedule=None, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using a combination of a provided partial solver and the
     recursive algorithm.
@@ -176,27 +228,50 @@ def generalized_recursive_with_psolver_multiple_calls(arena, manager):
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_par_win_multiple_calls)
+    :type init: dd.cudd.Function
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
     max_priorities = complement_priorities(arena, manager)
 
-    winning_region_player0, winning_region_player1 = disj_par_win_multiple_calls(arena, max_priorities, manager)
+    winning_region_player0, winning_region_player1 = disj_par_win_multiple_calls(arena, max_priorities, manager,
+                                                                                 schedule, cache=cache, init=init)
 
     return winning_region_player0, winning_region_player1
 
 
-def disj_par_win_multiple_calls(arena, max_priorities, manager):
+def disj_par_win_multiple_calls(arena, max_priorities, manager, schedule=None, depth=0, cache=None, init=None):
     """
-    Procedure to solve the generalized parity game provided in arena using the recursive algorithm.
+    Procedure to solve the generalized parity game provided in arena using the recursive algorithm. With a cache, the
+    solution of a subgame is looked up as in disj_par_win, before the partial solver is called on it. With init, only
+    the winner of the vertex init is decided as in disj_par_win, the regions of the partial solver are also won in the
+    arena and the call returns if they contain init. The rest of the arena is then restricted in this call, so none
+    of its solutions is stored in the cache.
     :param arena: a game arena
     :type arena: Arena
     :param max_priorities: the maximal priorities occurring in the arena
     :type max_priorities: list of int
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param depth: the level of recursion of this call
+    :type depth: int
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: dd.cudd.Function
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
@@ -204,13 +279,35 @@ def disj_par_win_multiple_calls(arena, max_priorities, manager):
             ((arena.player0_vertices == manager.false) and (arena.player1_vertices == manager.false)):
         return arena.player0_vertices | arena.player1_vertices, manager.false
 
-    partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen_inverted_players(arena, manager)
+    if cache is not None:
+        key = (arena.player0_vertices | arena.player1_vertices, tuple(max_priorities))
+        solution = cache.get(key)
+        if solution is not None:
+            return solution
+
+    if schedule is None or schedule.should_call(depth):
+        partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen_inverted_players(arena,
+                                                                                                           manager)
+
+        if schedule is not None:
+            schedule.record(depth, arena.count_vertices(partial_winning_region_player0 |
+                                                        partial_winning_region_player1, manager))
+    else:
+        partial_winning_region_player0, partial_winning_region_player1 = manager.false, manager.false
+
+    if init is not None and init & ~(partial_winning_region_player0 | partial_winning_region_player1) == manager.false:
+        return partial_winning_region_player0, partial_winning_region_player1
 
     remaining_unsolved = arena.subarena(~(partial_winning_region_player0 | partial_winning_region_player1), manager)
+    if init is not None:
+        remaining_unsolved = restrict_to_init(remaining_unsolved, init, manager)
 
     if (remaining_unsolved.player0_vertices == manager.false) and \
             (remaining_unsolved.player1_vertices == manager.false):
-        return partial_winning_region_player0, partial_winning_region_player1
+        solution = partial_winning_region_player0, partial_winning_region_player1
+        if cache is not None and init is None:
+            cache.put(key, solution)
+        return solution
 
     for function_index in range(remaining_unsolved.nbr_functions):
 
@@ -234,7 +331,7 @@ def disj_par_win_multiple_calls(arena, max_priorities, manager):
                 copy_max_priorities = max_priorities[:]  # faster copy
                 copy_max_priorities[function_index] -= 2
 
-                w0, w1 = disj_par_win_multiple_calls(h, copy_max_priorities, manager)
+                w0, w1 = disj_par_win_multiple_calls(h, copy_max_priorities, manager, schedule, depth + 1, cache)
 
                 if g_bar.player0_vertices | g_bar.player1_vertices == manager.false \
                         or w1 == (h.player0_vertices | h.player1_vertices):
@@ -256,8 +353,22 @@ def disj_par_win_multiple_calls(arena, max_priorities, manager):
                                     q_bar,
                                     1,
                                     manager)
-                w0_bis, w1_bis = disj_par_win_multiple_calls(remaining_unsolved.subarena(~a1, manager), max_priorities, manager)
-
-                return w0_bis | partial_winning_region_player0, a1 | w1_bis | partial_winning_region_player1
-
-    return remaining_unsolved.player0_vertices | remaining_unsolved.player1_vertices | partial_winning_region_player0, partial_winning_region_player1
+                if init is not None and init & ~a1 == manager.false:
+                    return partial_winning_region_player0, a1 | partial_winning_region_player1
+
+                remaining = remaining_unsolved.subarena(~a1, manager)
+                if init is not None:
+                    remaining = restrict_to_init(remaining, init, manager)
+                w0_bis, w1_bis = disj_par_win_multiple_calls(remaining, max_priorities, manager, schedule, depth + 1,
+                                                             cache, init)
+
+                solution = w0_bis | partial_winning_region_player0, a1 | w1_bis | partial_winning_region_player1
+                if cache is not None and init is None:
+                    cache.put(key, solution)
+                return solution
+
+    solution = (remaining_unsolved.player0_vertices | remaining_unsolved.player1_vertices |
+                partial_winning_region_player0, partial_winning_region_player1)
+    if cache is not None and init is None:
+        cache.put(key, solution)
+    return solution
@@ -17,15 +17,20 @@
 
 from collections import defaultdict
 import bdd.arena as ar
+from bdd.bdd_util import declare_state_vars, rename
 
 
-def gpg2bdd(gpg_path, manager):
+def gpg2bdd(gpg_path, manager, interleaved=True, prune_unreachable=False):
     """
     Loads a generalized parity game from file and represent it as a Binary Decision Diagram (BDD).
     :param gpg_path: path to the .gpg file containing a generalized parity game in extended PGSolver format
     :type gpg_path: str
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
+    :param prune_unreachable: whether the arena is restricted to the vertices reachable from vertex 0
+    :type prune_unreachable: bool
     :return: an arena object for the arena provided in the file and a list of its vertices represented by BDDs
     :rtype: Arena, list of dd.cudd.Function
     """
@@ -46,7 +51,7 @@ def gpg2bdd(gpg_path, manager):
         vars = ['x{i}'.format(i=j) for j in range(nbr_digits_vertices)]  # variables to encode the vertices
         vars_bis = ['xb{i}'.format(i=j) for j in range(nbr_digits_vertices)]
         all_vars = vars + vars_bis
-        manager.declare(*all_vars)
+        declare_state_vars(vars, vars_bis, manager, interleaved=interleaved)
         mapping_bis = dict(zip(vars, vars_bis))
         inv_mapping_bis = dict(zip(vars_bis, vars))
 
@@ -94,7 +99,7 @@ def gpg2bdd(gpg_path, manager):
 
             for succ in infos[3].split(","):
                 successor = int(succ)
-                edges = edges | (all_vertices[index] & manager.let(mapping_bis, all_vertices[successor]))
+                edges = edges | (all_vertices[index] & rename(mapping_bis, all_vertices[successor], manager))
 
         # create an Arena object and fill it in
         arena = ar.Arena()
@@ -113,4 +118,9 @@ def gpg2bdd(gpg_path, manager):
         arena.edges = edges
         arena.priorities = priorities
 
+        # only the winner of vertex 0 is reported, the vertices it cannot reach do not matter
+        if prune_unreachable:
+            arena.restrict_to_reachable_states(all_vertices[0], manager, restrict_reach_edges=True,
+                                               mapping_bis=mapping_bis)
+
         return arena, all_vertices
@@ -0,0 +1,361 @@
+import re
+from collections import defaultdict
+
+# Tokens of the HOA format, comments are skipped and labels, strings and acceptance sets that span several lines are
+# completed by HOAReader._token
+TOKEN = re.compile(r'--BODY--|--END--|--ABORT--|[A-Za-z_][\w\-]*:|"(?:[^"\\]|\\.)*"|\[[^\]]*\]|\{[^}]*\}|/\*'
+                   r'|[^\s\[{"]+|["\[{]')
+
+
+class HOAState:
+    """
+    A state of an automaton in HOA format read by HOAReader, with its outgoing edges.
+
+    :param number: the number of the state
+    :type number: int
+    :param priorities: the priorities of the state, converted to the max even parity condition, the i-th one is the
+                       priority of the state in the i-th dimension. None if the state has no acceptance set.
+    :type priorities: list[int] | None
+    :param edges: the outgoing edges, pairs (label, destination) where label is a HOA label without the square brackets
+    :type edges: list[(str, int)]
+    """
+
+    def __init__(self, number, priorities, edges):
+        self.number = number
+        self.priorities = priorities
+        self.edges = edges
+
+
+class HOAReader:
+    """
+    Streaming reader of automata in the Hanoi Omega-Automata (HOA) format (http://adl.github.io/hoaf/). The header is
+    read when the reader is created, items can appear in any order and unknown items are ignored. The body is read one
+    state at a time by states(), so that large automata are never held in memory.
+
+    Parity acceptance conditions (min or max, even or odd), Buchi and co-Buchi are converted to the max even parity
+    condition used by SPORE. As in the automata generated for SPORE, the acceptance sets of a state are its priorities,
+    one per dimension. States without acceptance set have no priorities, they get the priority uncolored_priority,
+    which is -1 if it is lower than every priority (see shift_priorities). Acceptance sets on edges are moved to their
+    source state when every edge of the state has the same sets. Otherwise, unless the automaton has the property
+    state-acc, the body is read once more when the reader is created, and each state is split into one state per
+    acceptance sets of its incoming edges (see _split_states): nbr_states and start then refer to the split states,
+    numbered from 0, which are yielded by states() with the priorities of their incoming edges.
+
+    :param path: the path to the file that contains the automaton
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.file = open(path, 'r')
+        self.buffer = ""
+        self.position = 0
+        self.pending = None
+
+        self.name = None
+        self.nbr_states = None
+        self.start = []
+        self.aps = []
+        self.controllable_aps = []
+        self.aliases = {}
+        self.acc_name = []
+        self.acceptance = []
+        self.properties = []
+
+        # maps each state to the numbers of its split states, indexed by the acceptance sets of their incoming edges
+        self.split_states = None
+
+        # the file is not closed by __exit__ if the reader cannot be created
+        try:
+            self._read_header()
+            self._read_acceptance()
+            if "state-acc" not in self.properties:
+                self._split_states()
+        except Exception:
+            self.file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def _fill(self):
+        # append the next line of the file to the buffer, without the characters that are already read, return False
+        # at the end of the file
+        line = self.file.readline()
+        if not line:
+            return False
+        self.buffer = self.buffer[self.position:] + line
+        self.position = 0
+        return True
+
+    def _token(self):
+        # return the next token of the file, or None at the end of the file
+        if self.pending is not None:
+            token, self.pending = self.pending, None
+            return token
+
+        while True:
+            match = TOKEN.search(self.buffer, self.position)
+            if match is None:
+                if not self._fill():
+                    return None
+                continue
+
+            token = match.group(0)
+            if token == "/*":
+                # comments can be nested and span several lines
+                self.position = match.start()
+                depth, i = 1, self.position + 2
+                while depth > 0:
+                    if i + 1 >= len(self.buffer):
+                        shift = self.position
+                        if not self._fill():
+                            raise ValueError("Unterminated comment in HOA file")
+                        i -= shift
+                    elif self.buffer.startswith("/*", i):
+                        depth, i = depth + 1, i + 2
+                    elif self.buffer.startswith("*/", i):
+                        depth, i = depth - 1, i + 2
+                    else:
+                        i += 1
+                self.position = i
+                continue
+
+            if token in ['[', '{', '"']:
+                # a label, set of acceptance sets or string that continues on the next line
+                self.position = match.start()
+                if not self._fill():
+                    raise ValueError("Unterminated " + token + " in HOA file")
+                continue
+
+            self.position = match.end()
+            return token
+
+    def _push_back(self, token):
+        # the next call to _token returns token
+        self.pending = token
+
+    def _read_header(self):
+        # read the items of the header until --BODY--
+        item, values = None, []
+        while True:
+            token = self._token()
+            if token is None:
+                raise ValueError("Missing --BODY-- in HOA file")
+            if token == "--BODY--" or (token.endswith(":") and not token.startswith('"')):
+                if item is not None:
+                    self._header_item(item, values)
+                if token == "--BODY--":
+                    return
+                item, values = token[:-1], []
+            else:
+                values.append(token)
+
+    def _header_item(self, item, values):
+        if item == "name":
+            self.name = values[0][1:-1]
+        elif item == "States":
+            self.nbr_states = int(values[0])
+        elif item == "Start":
+            if len(values) != 1 or not values[0].isdigit():
+                raise ValueError("Alternating automata are not supported: Start: " + " ".join(values))
+            self.start.append(int(values[0]))
+        elif item == "AP":
+            self.aps = [value[1:-1] for value in values[1:]]
+            if len(self.aps) != int(values[0]):
+                raise ValueError("Wrong number of atomic propositions: AP: " + " ".join(values))
+        elif item == "controllable-AP":
+            self.controllable_aps = [self.aps[int(value)] if self.aps else int(value) for value in values]
+        elif item == "Alias":
+            self.aliases[values[0]] = " ".join(values[1:])
+        elif item == "acc-name":
+            self.acc_name = values
+        elif item == "Acceptance":
+            self.acceptance = values
+        elif item == "properties":
+            self.properties.extend(values)
+
+    def _read_acceptance(self):
+        # recognize the acceptance condition, self.max_parity, self.even_parity and self.nbr_sets describe it as a
+        # parity condition
+        acc_name = [value.lower() for value in self.acc_name]
+        acceptance = "".join(self.acceptance[1:])
+        if acc_name[:1] == ["parity"] and len(acc_name) == 4:
+            self.max_parity = acc_name[1] == "max"
+            self.even_parity = acc_name[2] == "even"
+            self.nbr_sets = int(acc_name[3])
+        elif acc_name == ["buchi"] or (not acc_name and acceptance == "Inf(0)"):
+            self.max_parity, self.even_parity, self.nbr_sets = True, True, 1
+        elif acc_name == ["co-buchi"] or (not acc_name and acceptance == "Fin(0)"):
+            self.max_parity, self.even_parity, self.nbr_sets = True, False, 1
+        else:
+            raise ValueError("Unsupported acceptance condition: " + " ".join(self.acc_name + self.acceptance))
+
+        # a state without acceptance set is less important than every set
+        self.uncolored_priority = self.convert_priority(-1 if self.max_parity else self.nbr_sets)
+
+    def convert_priority(self, priority):
+        """
+        Convert a priority of the acceptance condition of the automaton to the max even parity condition.
+        :param priority: the priority (acceptance set), -1 for max and nbr_sets for min parity stand for no set
+        :type priority: int
+        :return: the converted priority, -1 if it is lower than every other priority
+        :rtype: int
+        """
+
+        if not self.max_parity:
+            # the priority is reversed, with an even bound so that its parity does not change
+            priority = self.nbr_sets + self.nbr_sets % 2 - priority
+        if not self.even_parity:
+            priority += 1
+        return priority
+
+    def implicit_label(self, index):
+        """
+        Compute the label of the index-th edge of a state with implicit labels: atomic proposition i is true iff the
+        i-th bit of index is 1.
+        :param index: the index of the edge
+        :type index: int
+        :return: the label
+        :rtype: str
+        """
+
+        if not self.aps:
+            return "t"
+        return "&".join(str(i) if (index >> i) & 1 else "!" + str(i) for i in range(len(self.aps)))
+
+    def _acc_sets(self):
+        # read the acceptance sets "{...}" that may follow a state or an edge
+        token = self._token()
+        if token is not None and token.startswith("{"):
+            return [int(value) for value in token[1:-1].replace(",", " ").split()]
+        self._push_back(token)
+        return None
+
+    def _priorities(self, acc):
+        # the priorities of a state with acceptance sets acc
+        return None if not acc else [self.convert_priority(p) for p in acc]
+
+    def _read_states(self):
+        # read the body one state at a time, yield the number of each state, its acceptance sets and its outgoing
+        # edges (label, destination, acceptance sets), the sets of a state being the sets of each of its edges
+        token = self._token()
+        while token is not None and token != "--END--":
+            if token == "--ABORT--":
+                raise ValueError("The HOA file was aborted")
+            if token != "State:":
+                raise ValueError("Expected State: in HOA file but read " + token)
+
+            state_label = None
+            token = self._token()
+            if token is not None and token.startswith("["):
+                state_label, token = token[1:-1], self._token()
+            if token is None:
+                raise ValueError("Missing state number after State: in HOA file")
+            number = int(token)
+
+            token = self._token()
+            if token is not None and not token.startswith('"'):
+                self._push_back(token)
+            state_acc = self._acc_sets()
+
+            edges = []
+            token = self._token()
+            while token is not None and token not in ["State:", "--END--", "--ABORT--"]:
+                if token.startswith("["):
+                    label, token = token[1:-1], self._token()
+                    if token is None:
+                        raise ValueError("Missing destination of an edge of state " + str(number) + " in HOA file")
+                elif state_label is not None:
+                    label = state_label
+                else:
+                    label = self.implicit_label(len(edges))
+                if not token.isdigit():
+                    raise ValueError("Alternating automata are not supported: " + token)
+                edge_acc = self._acc_sets()
+                if state_acc is not None and edge_acc is not None:
+                    raise ValueError("State " + str(number) + " and its edges have acceptance sets")
+                edges.append((label, int(token), tuple(edge_acc) if edge_acc is not None else None))
+                token = self._token()
+
+            if state_acc is not None:
+                state_acc = tuple(state_acc)
+            yield number, state_acc, [(label, destination, state_acc if edge_acc is None else edge_acc)
+                                      for label, destination, edge_acc in edges]
+
+    def _split_states(self):
+        # read the body once and, if the edges of a state have different acceptance sets, split each state q into one
+        # state (q, acc) per acceptance sets acc of the edges that enter q, and (q, None) if q is initial, the state
+        # (q, acc) has the priorities acc and the edges of q towards the states (q', acc') given by the acceptance
+        # sets acc' of the edges; the file is then read again from the start of the body
+        body = self.file.tell(), self.buffer, self.position, self.pending
+
+        incoming = defaultdict(set)
+        transition_based = False
+        for _, _, edges in self._read_states():
+            if len({edge_acc for _, _, edge_acc in edges}) > 1:
+                transition_based = True
+            for _, destination, edge_acc in edges:
+                incoming[destination].add(edge_acc)
+
+        self.file.seek(body[0])
+        self.buffer, self.position, self.pending = body[1:]
+
+        if not transition_based:
+            return
+
+        for state in self.start:
+            incoming[state].add(None)
+
+        # the split states are numbered in the order of the states, the states that are never entered are removed
+        self.split_states = {}
+        self.nbr_states = 0
+        for state in sorted(incoming):
+            self.split_states[state] = {}
+            for acc in sorted(incoming[state], key=lambda sets: (sets is not None, sets or ())):
+                self.split_states[state][acc] = self.nbr_states
+                self.nbr_states += 1
+        self.start = [self.split_states[state][None] for state in self.start]
+
+    def states(self):
+        """
+        Read the body of the automaton one state at a time.
+        :return: a generator of the states of the automaton
+        :rtype: collections.Iterable[HOAState]
+        """
+
+        for number, state_acc, edges in self._read_states():
+            if self.split_states is None:
+                edges_acc = [edge_acc for _, _, edge_acc in edges]
+                if edges_acc and any(acc != edges_acc[0] for acc in edges_acc):
+                    raise ValueError("The edges of state " + str(number) + " have different acceptance sets")
+                acc = edges_acc[0] if edges_acc else state_acc
+                yield HOAState(number, self._priorities(acc), [(label, destination) for label, destination, _ in edges])
+            elif number in self.split_states:
+                split_edges = [(label, self.split_states[destination][edge_acc])
+                               for label, destination, edge_acc in edges]
+                for acc, split_number in self.split_states[number].items():
+                    yield HOAState(split_number, self._priorities(acc), split_edges)
+
+        self.close()
+
+
+def shift_priorities(priorities, shift=2):
+    """
+    Shift the priorities of an automaton, e.g. by 2 when some states have priority -1 (states without acceptance set
+    that are less important than every other state), so that priorities are non-negative and keep their parity.
+    :param priorities: for each dimension, a dict that maps each priority to the set of states with this priority
+    :type priorities: list[defaultdict[int, dd.cudd.Function]]
+    :param shift: the even number added to each priority, default to 2
+    :type shift: int
+    :return: the shifted priorities
+    :rtype: list[defaultdict[int, dd.cudd.Function]]
+    """
+
+    return [defaultdict(prio_dict.default_factory, {priority + shift: states for priority, states in prio_dict.items()})
+            for prio_dict in priorities]
@@ -0,0 +1,155 @@
+from functools import reduce
+
+from bdd.bdd_util import rename
+
+# Precedence of the operators of HOA labels, negation binds tighter than conjunction, which binds tighter than
+# disjunction
+PRECEDENCE = {"!": 3, "&": 2, "|": 1}
+
+
+def tokenize_label(label):
+    """
+    Split a HOA label into tokens: integers for atomic propositions (indexes in the AP header), "t", "f", "!", "&",
+    "|", "(", ")" and aliases "@name".
+    :param label: the label without the square brackets, e.g. "0&!1 | 2"
+    :type label: str
+    :return: the list of tokens
+    :rtype: list[int | str]
+    """
+
+    tokens = []
+    i = 0
+    length = len(label)
+    while i < length:
+        char = label[i]
+        if char.isspace():
+            i += 1
+        elif char.isdigit():
+            start = i
+            while i < length and label[i].isdigit():
+                i += 1
+            tokens.append(int(label[start:i]))
+        elif char == "@":
+            start = i
+            i += 1
+            while i < length and (label[i].isalnum() or label[i] in "_-."):
+                i += 1
+            tokens.append(label[start:i])
+        elif char in "tf!&|()":
+            tokens.append(char)
+            i += 1
+        else:
+            raise ValueError("Unexpected character '" + char + "' in label " + label)
+
+    return tokens
+
+
+def label2bdd(label, aps, manager, cache=None, aliases=None):
+    """
+    Compile a HOA label into a BDD with apply operations. The label is read by an iterative precedence (shunting-yard)
+    parser so that long labels do not need a deep recursion, unlike manager.add_expr. Every sub-expression is
+    identified by the identifiers of its operands, the BDD of a sub-expression that appears in a previous label is
+    taken from cache instead of being computed again. Operands of conjunctions and disjunctions are ordered since
+    both operations are commutative.
+    :param label: the label without the square brackets, e.g. "0&!1 | 2"
+    :type label: str
+    :param aps: the atomic propositions of the automaton, the i-th one is the BDD variable aps[i]
+    :type aps: list[str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param cache: maps the key of each sub-expression to its identifier and its BDD, it should be shared by every
+                  label of an automaton since keys depend on aps, default to None (no sharing)
+    :type cache: dict[tuple, (int, dd.cudd.Function)]
+    :param aliases: maps an alias "@name" to its label, default to None
+    :type aliases: dict[str, str]
+    :return: the BDD of the label
+    :rtype: dd.cudd.Function
+    """
+
+    if cache is None:
+        cache = {}
+
+    def node(key, compute):
+        # return the (identifier, BDD) pair of a sub-expression, computed once
+        if key not in cache:
+            # the BDD is computed before the identifier is taken since an alias adds its own sub-expressions
+            u = compute()
+            cache[key] = (len(cache), u)
+        return cache[key]
+
+    def apply(operator):
+        # pop the operands of the operator and push the result
+        if operator == "!":
+            operand = operands.pop()
+            operands.append(node(("!", operand[0]), lambda: ~operand[1]))
+        else:
+            right = operands.pop()
+            left = operands.pop()
+            if left[0] > right[0]:
+                left, right = right, left
+            if operator == "&":
+                operands.append(node(("&", left[0], right[0]), lambda: left[1] & right[1]))
+            else:
+                operands.append(node(("|", left[0], right[0]), lambda: left[1] | right[1]))
+
+    operands = []  # pairs (identifier, BDD)
+    operators = []
+    try:
+        for token in tokenize_label(label):
+            if isinstance(token, int):
+                operands.append(node(("ap", token), lambda: manager.var(aps[token])))
+            elif token == "t":
+                operands.append(node(("t",), lambda: manager.true))
+            elif token == "f":
+                operands.append(node(("f",), lambda: manager.false))
+            elif token.startswith("@"):
+                operands.append(node(("@", token), lambda: label2bdd(aliases[token], aps, manager, cache, aliases)))
+            elif token == "(" or token == "!":
+                # negation is a prefix operator, its operand is not read yet
+                operators.append(token)
+            elif token == ")":
+                while operators[-1] != "(":
+                    apply(operators.pop())
+                operators.pop()
+            else:
+                while operators and operators[-1] != "(" and PRECEDENCE[operators[-1]] >= PRECEDENCE[token]:
+                    apply(operators.pop())
+                operators.append(token)
+
+        while operators:
+            apply(operators.pop())
+
+    # missing operands, unbalanced parentheses and unknown atomic propositions or aliases
+    except (IndexError, KeyError, TypeError):
+        raise ValueError("Malformed label " + label)
+
+    if len(operands) != 1:
+        raise ValueError("Malformed label " + label)
+
+    return operands[0][1]
+
+
+def merge_edges(src, edges, mapping_bis, manager):
+    """
+    Compute the transitions from the state src. The labels of parallel edges (with the same destination) are merged by
+    a disjunction before they are conjoined with the destination, and src is conjoined once with the disjunction of
+    all outgoing transitions.
+    :param src: the BDD of the source state
+    :type src: dd.cudd.Function
+    :param edges: maps each destination state number to the BDD of its destination state and the list of labels of
+                  the edges from src to this state
+    :type edges: dict[int, (dd.cudd.Function, list[dd.cudd.Function])]
+    :param mapping_bis: dict to map the state variables to their copies
+    :type mapping_bis: dict[str, str]
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the BDD of the transitions from src
+    :rtype: dd.cudd.Function
+    """
+
+    successors = manager.false
+    for dst, labels in edges.values():
+        label = reduce(lambda u, v: u | v, labels)
+        successors |= label & rename(mapping_bis, dst, manager)
+
+    return src & successors
@@ -0,0 +1,95 @@
+from copy import copy
+from functools import reduce
+
+from bdd.arena import OneStepArena
+from bdd.attractor import attractor
+from bdd.generalizedBuchiSolver import buchi_solver_gen
+
+
+def restrict_to_init(arena, init, manager):
+    """
+    Create a copy of an arena restricted to the vertices reachable from a vertex, the winner of this vertex only
+    depends on them (see Arena.restrict_to_reachable_states).
+    :param arena: a game arena
+    :type arena: Arena
+    :param init: the vertex
+    :type init: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the restricted arena
+    :rtype: Arena
+    """
+
+    restricted = copy(arena)
+    # the unions of priorities computed for the restricted arena must not be shared with arena
+    restricted.priority_ranges = dict(arena.priority_ranges)
+    restricted.restrict_to_reachable_states(init, manager, restrict_reach_edges=True, mapping_bis=arena.mapping_bis)
+    return restricted
+
+
+def self_loop_regions(arena, manager):
+    """
+    Computes the vertices with a self-loop that are won by the player who controls them by taking the loop forever:
+    vertices of player 0 whose priorities are all even and vertices of player 1 with an odd priority. The vertices of a
+    one-step arena have no self-loops, its edges are whole rounds.
+    :param arena: a game arena
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices won by player 0 and the vertices won by player 1 with their self-loop
+    :rtype: (dd.cudd.Function, dd.cudd.Function)
+    """
+
+    if isinstance(arena, OneStepArena):
+        return manager.false, manager.false
+
+    same_vertex = reduce(lambda u, v: u & v,
+                         [manager.var(var).equiv(manager.var(var_bis)) for var, var_bis in arena.mapping_bis.items()],
+                         manager.true)
+    self_loops = manager.exist(arena.vars_bis, arena.edges & same_vertex)
+
+    all_even = manager.true
+    for function in arena.priorities:
+        all_even &= reduce(lambda u, v: u | v,
+                           [bdd for priority, bdd in function.items() if priority % 2 == 0], manager.false)
+
+    return arena.player0_vertices & self_loops & all_even, arena.player1_vertices & self_loops & ~all_even
+
+
+def local_prepass(arena, init, manager):
+    """
+    Prepare the game for a solver when only the winner of the initial vertex is needed. The arena is restricted to the
+    vertices reachable from init, then the attractors of the vertices won with a self-loop and the regions of the
+    partial solver are removed, and the remaining arena is restricted again to the vertices reachable from init. The
+    partial solver stops as soon as it finds a region that contains init.
+    :param arena: a game arena
+    :type arena: Arena
+    :param init: the initial vertex
+    :type init: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the remaining arena and, if the winner of init is known, partial winning regions of each player, one of
+             them containing init, otherwise None
+    :rtype: (Arena, (dd.cudd.Function, dd.cudd.Function) | None)
+    """
+
+    def contains_init(region):
+        return init & ~region == manager.false
+
+    arena = restrict_to_init(arena, init, manager)
+
+    won_player0, won_player1 = self_loop_regions(arena, manager)
+    attractor_player0 = attractor(arena, won_player0, 0, manager)
+    if contains_init(attractor_player0):
+        return arena, (attractor_player0, manager.false)
+    attractor_player1 = attractor(arena, won_player1, 1, manager)
+    if contains_init(attractor_player1):
+        return arena, (manager.false, attractor_player1)
+    arena = arena.subarena(~(attractor_player0 | attractor_player1), manager)
+
+    partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen(arena, manager, init=init)
+    if contains_init(partial_winning_region_player0 | partial_winning_region_player1):
+        return arena, (partial_winning_region_player0, partial_winning_region_player1)
+    arena = arena.subarena(~(partial_winning_region_player0 | partial_winning_region_player1), manager)
+
+    return restrict_to_init(arena, init, manager), None
@@ -0,0 +1,194 @@
+from functools import reduce
+
+# number of regions kept for each node of the Zielonka tree to warm start its fixpoint
+MEMORY_SIZE = 8
+
+
+def bounded_vertices(arena, bounds, manager):
+    """
+    Computes the vertices whose priorities are all smaller than or equal to their bound.
+    :param arena: a game arena
+    :type arena: Arena
+    :param bounds: the bound of the priorities of each function
+    :type bounds: tuple of int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices whose priorities are within the bounds
+    :rtype: dd.cudd.Function
+    """
+
+    return reduce(lambda u, v: u & v,
+                  [arena.priorities_at_most(function_index, bound, manager)
+                   for function_index, bound in enumerate(bounds)],
+                  arena.player0_vertices | arena.player1_vertices)
+
+
+def tighten_bounds(arena, bounds, manager):
+    """
+    Lowers each bound to the greatest priority of its function that occurs among the vertices within the bounds, until
+    every bound occurs. Two vectors of bounds have the same vertices if and only if their tightened vectors are equal.
+    :param arena: a game arena
+    :type arena: Arena
+    :param bounds: the bound of the priorities of each function
+    :type bounds: tuple of int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the tightened bounds and the vertices within them, or None if no vertex is within the bounds
+    :rtype: (tuple of int, dd.cudd.Function) | None
+    """
+
+    while True:
+        vertices = bounded_vertices(arena, bounds, manager)
+        if vertices == manager.false:
+            return None
+
+        tight_bounds = tuple(max(priority for priority, bdd in arena.priorities[function_index].items()
+                                 if priority <= bound and bdd & vertices != manager.false)
+                             for function_index, bound in enumerate(bounds))
+        if tight_bounds == bounds:
+            return bounds, vertices
+        bounds = tight_bounds
+
+
+def children(arena, bounds, vertices, manager):
+    """
+    Computes the children of a node of the Zielonka tree of the winning condition. A node is a vector of tightened
+    bounds, it stands for the vertices within the bounds, and player 0 wins the plays that visit them all infinitely
+    often if and only if every bound is even. If so, the children are the largest sets of vertices whose plays are won
+    by player 1: for each function with an odd priority below its bound, the vertices within the bounds whose priority
+    for this function is at most the greatest such odd priority. Otherwise, the only child is the largest set of
+    vertices whose plays are won by player 0, obtained by lowering the odd bounds until every bound is even.
+    :param arena: a game arena
+    :type arena: Arena
+    :param bounds: the tightened bounds of the node
+    :type bounds: tuple of int
+    :param vertices: the vertices within the bounds
+    :type vertices: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the tightened bounds of the children and the vertices within them
+    :rtype: list of (tuple of int, dd.cudd.Function)
+    """
+
+    if any(bound % 2 for bound in bounds):
+        child = (bounds, vertices)
+        while child is not None and any(bound % 2 for bound in child[0]):
+            child = tighten_bounds(arena, tuple(bound - bound % 2 for bound in child[0]), manager)
+        return [child] if child is not None else []
+
+    candidates = []
+    for function_index, bound in enumerate(bounds):
+        odd_priorities = [priority for priority, bdd in arena.priorities[function_index].items()
+                          if priority % 2 and priority < bound and bdd & vertices != manager.false]
+        if odd_priorities:
+            candidates.append(tighten_bounds(arena, bounds[:function_index] + (max(odd_priorities),) +
+                                             bounds[function_index + 1:], manager))
+
+    # a child is not needed if the vertices of another child contain its vertices
+    maximal = []
+    for index, (child_bounds, child_vertices) in enumerate(candidates):
+        if not any((child_vertices & ~other_vertices == manager.false) and
+                   (child_vertices != other_vertices or other_index < index)
+                   for other_index, (_, other_vertices) in enumerate(candidates) if other_index != index):
+            maximal.append((child_bounds, child_vertices))
+    return maximal
+
+
+def node_region(arena, bounds, vertices, target, tree, memory, manager):
+    """
+    Computes the vertices from which player 0 can force the play to reach target, or to stay forever in the vertices
+    of a node of the Zielonka tree and win. The region of a node won by player 0 is the greatest fixpoint
+    nu X. /\\_c region(c, target \\/ (vertices \\ vertices(c)) /\\ cpre(X)) over its children c, where player 0 must
+    leave the vertices of each child infinitely often. The region of a node won by player 1 is the least fixpoint
+    mu Z. region(c, target \\/ vertices /\\ cpre(Z)) for its child c, where player 0 must eventually stay in the
+    vertices of c. Without children, player 0 wins by staying in the vertices of the node, or loses unless target is
+    reached.
+
+    The region is monotone in target. As in the algorithm of Emerson and Lei, the iteration of a fixpoint is warm
+    started: a least fixpoint starts from the regions computed for smaller targets, and a greatest fixpoint from the
+    regions computed for larger targets, instead of starting from the empty set or the whole set. The last regions of
+    each node are kept: when the target of an inner node grows with the iterations of an outer least fixpoint, its
+    region for the target it had at the end of the previous iteration of the enclosing greatest fixpoint is still an
+    upper bound.
+    :param arena: a game arena
+    :type arena: Arena
+    :param bounds: the tightened bounds of the node
+    :type bounds: tuple of int
+    :param vertices: the vertices within the bounds
+    :type vertices: dd.cudd.Function
+    :param target: the vertices already won by player 0
+    :type target: dd.cudd.Function
+    :param tree: the children of the nodes of the tree met so far, by their bounds
+    :type tree: dict
+    :param memory: the last targets and regions of the nodes, by their bounds, most recent first
+    :type memory: dict
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the region of the node for target
+    :rtype: dd.cudd.Function
+    """
+
+    if bounds not in tree:
+        tree[bounds] = children(arena, bounds, vertices, manager)
+        memory[bounds] = []
+    node_children = tree[bounds]
+    node_memory = memory[bounds]
+
+    won_by_player0 = not any(bound % 2 for bound in bounds)
+
+    # the regions kept for a smaller target are below the least fixpoint and their union too, the regions kept for a
+    # larger target are above the greatest fixpoint and their intersection too
+    region = vertices | target if won_by_player0 else target
+    for last_target, last_region in node_memory:
+        if last_target == target:
+            return last_region
+        if won_by_player0 and target & ~last_target == manager.false:
+            region &= last_region
+        elif not won_by_player0 and last_target & ~target == manager.false:
+            region |= last_region
+
+    while True:
+        predecessors = vertices & arena.cpre(region, 0, manager)
+        if won_by_player0 and node_children:
+            new_region = vertices | target
+            for child_bounds, child_vertices in node_children:
+                new_region &= node_region(arena, child_bounds, child_vertices, target | (predecessors & ~child_vertices),
+                                          tree, memory, manager)
+        else:
+            new_region = target | predecessors
+            for child_bounds, child_vertices in node_children:
+                new_region |= node_region(arena, child_bounds, child_vertices, new_region, tree, memory, manager)
+
+        if new_region == region:
+            break
+        region = new_region
+
+    node_memory.insert(0, (target, region))
+    del node_memory[MEMORY_SIZE:]
+    return region
+
+
+def nested_fixpoint(arena, manager):
+    """
+    Solve the generalized parity game provided in arena by evaluating the fixpoint formula of its winning condition
+    with controllable predecessors, instead of building subgames. Player 0 wins the plays in which the greatest
+    priority seen infinitely often is even for every function. The formula follows the Zielonka tree of this condition
+    (see node_region): for a single priority function, the tree is a chain and the formula is the usual alternation of
+    least and greatest fixpoints on the priorities, from the greatest one.
+    :param arena: a game arena
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :rtype: (dd.cudd.Function, dd.cudd.Function)
+    """
+
+    all_vertices = arena.player0_vertices | arena.player1_vertices
+    if all_vertices == manager.false:
+        return manager.false, manager.false
+
+    bounds, vertices = tighten_bounds(arena, tuple(max(function) for function in arena.priorities), manager)
+
+    winning_region_player0 = node_region(arena, bounds, vertices, manager.false, {}, {}, manager)
+
+    return winning_region_player0, all_vertices & ~winning_region_player0
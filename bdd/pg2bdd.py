@@ -17,10 +17,11 @@
 
 from collections import defaultdict
 import bdd.arena as ar
+from bdd.bdd_util import declare_state_vars, rename
 import bdd.misc
 
 
-def pg2bdd(pg_path, manager, is_gpg=True):
+def pg2bdd(pg_path, manager, is_gpg=True, interleaved=True, prune_unreachable=False):
     """
     Loads a parity game from file and represent it as a Binary Decision Diagram (BDD).
     :param pg_path: path to the .pg file containing a parity game in PGSolver format
@@ -29,6 +30,10 @@ def pg2bdd(pg_path, manager, is_gpg=True):
     :type manager: dd.cudd.BDD
     :param is_gpg: whether the file is in generalized parity extended PGSolver format
     :type is_gpg: bool
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
+    :param prune_unreachable: whether the arena is restricted to the vertices reachable from vertex 0
+    :type prune_unreachable: bool
     :return: an arena object for the arena provided in the file and a list of its vertices represented by BDDs
     :rtype: Arena, list of dd.cudd.Function
     """
@@ -54,7 +59,7 @@ def pg2bdd(pg_path, manager, is_gpg=True):
         vars = ['x{i}'.format(i=j) for j in range(nbr_digits_vertices)]  # variables to encode the vertices
         vars_bis = ['xb{i}'.format(i=j) for j in range(nbr_digits_vertices)]
         all_vars = vars + vars_bis
-        manager.declare(*all_vars)
+        declare_state_vars(vars, vars_bis, manager, interleaved=interleaved)
         mapping_bis = dict(zip(vars, vars_bis))
         inv_mapping_bis = dict(zip(vars_bis, vars))
 
@@ -101,7 +106,7 @@ def pg2bdd(pg_path, manager, is_gpg=True):
 
             for succ in infos[3].split(","):
                 successor = int(succ)
-                edges = edges | (all_vertices[index] & manager.let(mapping_bis, all_vertices[successor]))
+                edges = edges | (all_vertices[index] & rename(mapping_bis, all_vertices[successor], manager))
 
         # create an Arena object and fill it in
         arena = ar.Arena()
@@ -120,10 +125,15 @@ def pg2bdd(pg_path, manager, is_gpg=True):
         arena.edges = edges
         arena.priorities = priorities
 
+        # only the winner of vertex 0 is reported, the vertices it cannot reach do not matter
+        if prune_unreachable:
+            arena.restrict_to_reachable_states(all_vertices[0], manager, restrict_reach_edges=True,
+                                               mapping_bis=mapping_bis)
+
         return arena, all_vertices
 
 
-def pg2bdd_direct_encoding(pg_path, manager):
+def pg2bdd_direct_encoding(pg_path, manager, interleaved=True):
     """
     Loads a parity game from file and represent it as a Binary Decision Diagram (BDD). The encoding of vertices from the
     game arena is done using a direct encoding. That is, a vertex v is represented by its binary encoding expressed as
@@ -135,6 +145,8 @@ def pg2bdd_direct_encoding(pg_path, manager):
     :type pg_path: str
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
+    :param interleaved: whether each variable x{i} is declared next to its copy xb{i}, default to True
+    :type interleaved: bool
     :return: an arena object for the arena provided in the file and a list of its vertices represented by BDDs
     :rtype: Arena, list of dd.cudd.Function
     """
@@ -153,7 +165,7 @@ def pg2bdd_direct_encoding(pg_path, manager):
         vars = ['x{i}'.format(i=j) for j in range(nbr_digits_vertices)]  # variables to encode the vertices
         vars_bis = ['xb{i}'.format(i=j) for j in range(nbr_digits_vertices)]
         all_vars = vars + vars_bis
-        manager.declare(*all_vars)
+        declare_state_vars(vars, vars_bis, manager, interleaved=interleaved)
         mapping_bis = dict(zip(vars, vars_bis))
         inv_mapping_bis = dict(zip(vars_bis, vars))
 
@@ -195,7 +207,7 @@ def pg2bdd_direct_encoding(pg_path, manager):
             for succ in infos[3].split(","):
                 successor = int(succ)
                 index_bdd = manager.cube(bdd.misc.int2dict(index, vars))
-                succ_bdd = manager.let(mapping_bis, manager.cube(bdd.misc.int2dict(successor, vars)))
+                succ_bdd = rename(mapping_bis, manager.cube(bdd.misc.int2dict(successor, vars)), manager)
 
                 edges = edges | (index_bdd & succ_bdd)
 
@@ -0,0 +1,145 @@
+from bdd.attractor import attractor
+
+
+def top_priority(arena, bound, manager):
+    """
+    Computes the priority of the top level of a call of the quasi-polynomial algorithm for a bound on the priorities. It
+    is the greatest priority occurring in the arena that is at most bound if it has the parity of bound, and this
+    priority plus one otherwise, in which case the top level has no vertex. The levels between it and bound are empty
+    and skipped.
+    :param arena: a game arena with at least one vertex
+    :type arena: Arena
+    :param bound: the bound on the priorities
+    :type bound: int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the priority of the top level
+    :rtype: int
+    """
+
+    max_occurring_priority = max(priority for priority, bdd in arena.priorities[0].items()
+                                 if priority <= bound and bdd != manager.false)
+    return max_occurring_priority + (bound - max_occurring_priority) % 2
+
+
+def opponent_region(arena, max_priority, precisions, manager):
+    """
+    Computes vertices won by the opponent of the player j of the parity of max_priority, the greatest priority of the
+    arena, with the recursive algorithm of Parys as improved by Lehtinen, Schewe and Wojtczak. As in the recursive
+    algorithm, the dominions of the opponent are found in the subgames without the attractor of the vertices of
+    priority max_priority for j, and removed with their attractor for the opponent. The precision of a player bounds
+    the size of the dominions of this player that must be found: the dominion of the opponent of size at most its
+    precision is made of disjoint dominions of the subgames, and at most one of them is larger than half the
+    precision. The subgames are therefore solved with half the precision until no dominion is found, then once with the
+    full precision, and again with half the precision if a dominion was found. The precision of j is kept for the
+    subgames, whose calls look for dominions of j. The result contains every dominion of the opponent of size at most
+    its precision and no dominion of j of size at most its precision, and is the winning region of the opponent when
+    both precisions are at least the number of vertices.
+    :param arena: a game arena with a single priority function
+    :type arena: Arena
+    :param max_priority: the greatest priority of the arena, or this priority plus one
+    :type max_priority: int
+    :param precisions: the precision of each player
+    :type precisions: list of int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices won by the opponent of j
+    :rtype: dd.cudd.Function
+    """
+
+    all_vertices = arena.player0_vertices | arena.player1_vertices
+    if all_vertices == manager.false:
+        return manager.false
+
+    max_priority = top_priority(arena, max_priority, manager)
+    j = max_priority % 2
+    opponent = 1 - j
+
+    # a dominion is never larger than the arena
+    precision = min(precisions[opponent], arena.count_vertices(all_vertices, manager))
+
+    region = manager.false
+    for phase_precision in [precision // 2, precision, precision // 2]:
+        while True:
+            dominion = subgame_dominion(arena, max_priority, precisions, phase_precision, manager)
+            if dominion == manager.false:
+                break
+
+            opponent_attractor = attractor(arena, dominion, opponent, manager)
+            region = region | opponent_attractor
+            arena = arena.subarena(~opponent_attractor, manager)
+
+            # the call with the full precision is not repeated
+            if phase_precision == precision:
+                break
+
+        # if the full precision finds no dominion, the remaining vertices are won by j up to the precision
+        if phase_precision == precision and dominion == manager.false:
+            break
+
+    return region
+
+
+def subgame_dominion(arena, max_priority, precisions, precision, manager):
+    """
+    Computes a dominion of the opponent of the player j of the parity of max_priority in the subgame without the
+    attractor of the vertices of priority max_priority for j, with the given precision for the opponent.
+    :param arena: a game arena with a single priority function
+    :type arena: Arena
+    :param max_priority: the priority of the top level of the arena (see top_priority)
+    :type max_priority: int
+    :param precisions: the precision of each player
+    :type precisions: list of int
+    :param precision: the precision of the opponent of j in the subgame
+    :type precision: int
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: a dominion of the opponent of j in the arena, the vertices of the subgame not won by j
+    :rtype: dd.cudd.Function
+    """
+
+    if precision == 0:
+        return manager.false
+
+    j = max_priority % 2
+    top_attractor = attractor(arena, arena.priorities[0].get(max_priority, manager.false), j, manager)
+    subgame = arena.subarena(~top_attractor, manager)
+    subgame_vertices = subgame.player0_vertices | subgame.player1_vertices
+    if subgame_vertices == manager.false:
+        return manager.false
+
+    subgame_precisions = list(precisions)
+    subgame_precisions[1 - j] = precision
+
+    # the calls on the subgame look for the dominions of j, the rest of the subgame is won by the opponent
+    return subgame_vertices & ~opponent_region(subgame, max_priority - 1, subgame_precisions, manager)
+
+
+def quasi_polynomial(arena, manager):
+    """
+    Solve the parity game provided in arena using the quasi-polynomial variant of the recursive algorithm of Parys, as
+    improved by Lehtinen, Schewe and Wojtczak, implemented with bdds (see opponent_region). Each call of the recursive
+    algorithm is replaced by calls with smaller precisions, and only a logarithmic number of the nested calls use the
+    full precision, so that the number of calls is quasi-polynomial instead of exponential in the number of
+    priorities. The game is solved with the number of its vertices as precision for both players.
+    :param arena: a game arena with a single priority function
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :rtype: (dd.cudd.Function, dd.cudd.Function)
+    """
+
+    all_vertices = arena.player0_vertices | arena.player1_vertices
+    if all_vertices == manager.false:
+        return manager.false, manager.false
+
+    max_priority = top_priority(arena, max(arena.priorities[0].keys()), manager)
+    size = arena.count_vertices(all_vertices, manager)
+
+    region = opponent_region(arena, max_priority, [size, size], manager)
+
+    # region is won by the opponent of the player of the parity of the greatest priority
+    if max_priority % 2:
+        return region, all_vertices & ~region
+    return all_vertices & ~region, region
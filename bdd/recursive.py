@@ -17,16 +17,23 @@
 
 from bdd.attractor import attractor
 from bdd.buchiSolver import buchi_partial_solver
+from bdd.localSolver import restrict_to_init
 
 
-def recursive(arena, manager):
+def recursive(arena, manager, init=None):
     """
-    Solve the parity game provided in arena using the recursive algorithm implemented with bdds.
+    Solve the parity game provided in arena using the recursive algorithm implemented with bdds. With init, only the
+    winner of the vertex init is decided: the attractor B of the winning region of the opponent in G\A is won by the
+    opponent in the arena, so the call returns as soon as B contains init, and otherwise solves G\B restricted to the
+    vertices reachable from init. The call on G\A solves it entirely, since its winning regions decide B.
     :param arena: a game arena
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: dd.cudd.Function
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
@@ -82,11 +89,17 @@ def recursive(arena, manager):
             # compute attractor B
             B = attractor(arena, winning_region_opponent, opponent, manager)
 
-            # The subgame G\B is composed of the vertices not in the attractor
+            # B is won by the opponent in the arena, the rest of the arena is not needed if B contains init
+            if init is not None and init & ~B == manager.false:
+                return (B, manager.false) if j else (manager.false, B)
+
+            # The subgame G\B is composed of the vertices not in the attractor, with init only those reachable from it
             G_B = arena.subarena(~B, manager)
+            if init is not None:
+                G_B = restrict_to_init(G_B, init, manager)
 
             # recursively solve subgame G\B
-            winning_region_player0_G_B, winning_region_player1_G_B = recursive(G_B, manager)
+            winning_region_player0_G_B, winning_region_player1_G_B = recursive(G_B, manager, init)
 
             # depending on which player we are considering, assign regions to the proper variables
             # if we consider player1
@@ -113,7 +126,7 @@ def recursive(arena, manager):
     return winning_region_player0, winning_region_player1
 
 
-def recursive_single_call(arena, manager):
+def recursive_single_call(arena, manager, init=None):
     """
     Solve the parity game provided in arena by performing a single call to the partial solver called buchi solver and
     solving the remaining arena using the recursive algorithm.
@@ -121,7 +134,10 @@ def recursive_single_call(arena, manager):
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param init: if provided, only the winner of this vertex of arena is decided (see recursive)
+    :type init: dd.cudd.Function
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
@@ -137,13 +153,18 @@ def recursive_single_call(arena, manager):
     if remaining_arena.player0_vertices == manager.false and remaining_arena.player1_vertices == manager.false:
         return partial_winning_region_player0, partial_winning_region_player1
 
-    winning_region_player0_remaining, winning_region_player1_remaining = recursive(remaining_arena, manager)
+    if init is not None:
+        if init & ~(partial_winning_region_player0 | partial_winning_region_player1) == manager.false:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = restrict_to_init(remaining_arena, init, manager)
+
+    winning_region_player0_remaining, winning_region_player1_remaining = recursive(remaining_arena, manager, init)
 
     return partial_winning_region_player0 | winning_region_player0_remaining, \
            partial_winning_region_player1 | winning_region_player1_remaining
 
 
-def recursive_with_buchi(arena, manager):
+def recursive_with_buchi(arena, manager, schedule=None, depth=0, init=None):
     """
     Solve the parity game provided in arena using a combinations of the recursive algorithm and the partial solver
     implemented using bdds.
@@ -151,7 +172,16 @@ def recursive_with_buchi(arena, manager):
     :type arena: Arena
     :param manager: the BDD manager
     :type manager: dd.cudd.BDD
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param depth: the level of recursion of this call
+    :type depth: int
+    :param init: if provided, only the winner of this vertex of arena is decided (see recursive), the regions of the
+                 partial solver are also won in the arena
+    :type init: dd.cudd.Function
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: (dd.cudd.Function, dd.cudd.Function)
     """
 
@@ -161,10 +191,21 @@ def recursive_with_buchi(arena, manager):
     winning_region_player0 = manager.false  # winning region of player 0
     winning_region_player1 = manager.false  # winning region of player 1
 
-    remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = buchi_partial_solver(arena,
-                                                                                                           manager.false,
-                                                                                                           manager.false,
-                                                                                                           manager)
+    if schedule is None or schedule.should_call(depth):
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = \
+            buchi_partial_solver(arena, manager.false, manager.false, manager)
+
+        if schedule is not None:
+            schedule.record(depth, arena.count_vertices(partial_winning_region_player0 |
+                                                        partial_winning_region_player1, manager))
+    else:
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = \
+            arena, manager.false, manager.false
+
+    if init is not None:
+        if init & ~(partial_winning_region_player0 | partial_winning_region_player1) == manager.false:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = restrict_to_init(remaining_arena, init, manager)
 
     # if the game is empty, return the empty regions
     if remaining_arena.player0_vertices == manager.false and remaining_arena.player1_vertices == manager.false:
@@ -188,7 +229,8 @@ def recursive_with_buchi(arena, manager):
         G_A = remaining_arena.subarena(~A, manager)
 
         # Recursively solving the subgame G\A
-        winning_region_player0_G_A, winning_region_player1_G_A = recursive_with_buchi(G_A, manager)
+        winning_region_player0_G_A, winning_region_player1_G_A = \
+            recursive_with_buchi(G_A, manager, schedule, depth + 1)
 
         # depending on which player we are considering, assign regions to the proper variables
         # if we consider player1
@@ -215,11 +257,20 @@ def recursive_with_buchi(arena, manager):
             # compute attractor B
             B = attractor(remaining_arena, winning_region_opponent, opponent, manager)
 
-            # The subgame G\B is composed of the vertices not in the attractor
+            # B is won by the opponent in the arena, the rest of the arena is not needed if B contains init
+            if init is not None and init & ~B == manager.false:
+                if j:
+                    return B | partial_winning_region_player0, partial_winning_region_player1
+                return partial_winning_region_player0, B | partial_winning_region_player1
+
+            # The subgame G\B is composed of the vertices not in the attractor, with init only those reachable from it
             G_B = remaining_arena.subarena(~B, manager)
+            if init is not None:
+                G_B = restrict_to_init(G_B, init, manager)
 
             # recursively solve subgame G\B
-            winning_region_player0_G_B, winning_region_player1_G_B = recursive_with_buchi(G_B, manager)
+            winning_region_player0_G_B, winning_region_player1_G_B = \
+                recursive_with_buchi(G_B, manager, schedule, depth + 1, init)
 
             # depending on which player we are considering, assign regions to the proper variables
             # if we consider player1
@@ -255,10 +306,7 @@ def inf_prio_expr(bdd, max_prio, g):
     """
     This is Charly's implementation of finding smaller priorities.
     """
-    expr_res = bdd.false
-    for curr_prio in range(0, max_prio + 1):
-        expr_res = expr_res | g.priorities[0][curr_prio]
-    return expr_res
+    return g.priorities_at_most(0, max_prio, bdd)
 
 
 def monotone_attractor_cha(bdd, g, i, f, d):
@@ -268,35 +316,10 @@ def monotone_attractor_cha(bdd, g, i, f, d):
 
     inf_col_expr = inf_prio_expr(bdd, d, g)
 
-    f_1 = g.edges & bdd.let(g.mapping_bis, f)
-    f_1 = bdd.exist(g.vars_bis, f_1) & inf_col_expr
-
-    f_2 = g.edges & bdd.let(g.mapping_bis, ~f)
-    f_2 = ~ bdd.exist(g.vars_bis, f_2) & inf_col_expr
-
-    if i == 0:
-        f_1 = g.player0_vertices & f_1
-        f_2 = g.player1_vertices & f_2
-    else:
-        f_1 = g.player1_vertices & f_1
-        f_2 = g.player0_vertices & f_2
-
-    attr_old = f_1 | f_2
+    # the controllable predecessors are computed by the arena, see Arena.cpre
+    attr_old = g.cpre(f, i, bdd) & inf_col_expr
     while True:
-        f_1 = g.edges & bdd.let(g.mapping_bis, attr_old)
-        f_1 = bdd.exist(g.vars_bis, f_1) & inf_col_expr
-
-        f_2 = g.edges & bdd.let(g.mapping_bis, ~ (attr_old | f))
-        f_2 = ~ bdd.exist(g.vars_bis, f_2) & inf_col_expr
-
-        if i == 0:
-            f_1 = g.player0_vertices & f_1
-            f_2 = g.player1_vertices & f_2
-        else:
-            f_1 = g.player1_vertices & f_1
-            f_2 = g.player0_vertices & f_2
-
-        attr_new = attr_old | f_1 | f_2
+        attr_new = attr_old | (g.cpre(attr_old | f, i, bdd) & inf_col_expr)
         if attr_new == attr_old:
             break
         attr_old = attr_new
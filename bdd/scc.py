@@ -0,0 +1,124 @@
+from bdd.attractor import attractor
+
+
+def forward(arena, s, manager):
+    """
+    Computes the vertices reachable from a set of vertices.
+    :param arena: a game arena
+    :type arena: Arena
+    :param s: the set of vertices
+    :type s: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices reachable from s, including s
+    :rtype: dd.cudd.Function
+    """
+
+    reached = manager.false
+    new_reached = s
+    while new_reached != reached:
+        reached = new_reached
+        new_reached = reached | arena.post(reached, manager)
+
+    return reached
+
+
+def backward(arena, s, within, manager):
+    """
+    Computes the vertices of a set from which a set of vertices is reachable without leaving the first set.
+    :param arena: a game arena
+    :type arena: Arena
+    :param s: the set of vertices to reach
+    :type s: dd.cudd.Function
+    :param within: the set of vertices that are not left
+    :type within: dd.cudd.Function
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices of within from which s is reachable, including s
+    :rtype: dd.cudd.Function
+    """
+
+    reached = manager.false
+    new_reached = s
+    while new_reached != reached:
+        reached = new_reached
+        new_reached = reached | (within & arena.pre(reached, manager))
+
+    return reached
+
+
+def bottom_scc(arena, manager):
+    """
+    Computes a bottom strongly connected component of the arena, that is a strongly connected component that no edge
+    leaves. The vertices reachable from a vertex v contain a bottom component, which is this set if v is reachable from
+    all of them. Otherwise, the search continues from a vertex that cannot reach v, in a smaller set of reachable
+    vertices. A vertex without successors is a bottom component on its own.
+    :param arena: a game arena with at least one vertex
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :return: the vertices of a bottom strongly connected component
+    :rtype: dd.cudd.Function
+    """
+
+    candidates = arena.player0_vertices | arena.player1_vertices
+    while True:
+        vertex = arena.pick_vertex(candidates, manager)
+        reachable = forward(arena, vertex, manager)
+        candidates = reachable & ~backward(arena, vertex, reachable, manager)
+        if candidates == manager.false:
+            return reachable
+
+
+def scc_solver(arena, manager, solver):
+    """
+    Solve the game bottom-up along its strongly connected components. A bottom component is a sub-game that no player
+    can leave, so the winning regions of its solution by solver are winning in the arena. The attractor of the region
+    of each player is won by this player and removed, and the next bottom component is solved in the remaining arena,
+    until every vertex is decided. Each component is solved separately, which is faster when the game has many small
+    components, as games built from automata often have. The vertices without successors are lost by the player who
+    controls them, as in Arena.cpre, and are removed first.
+    :param arena: a game arena
+    :type arena: Arena
+    :param manager: the BDD manager
+    :type manager: dd.cudd.BDD
+    :param solver: the solver of the components, which takes an arena and the manager
+    :type solver: function
+    :return: the solution of the game, that is the set of vertices won by each player
+    :rtype: (dd.cudd.Function, dd.cudd.Function)
+    """
+
+    winning_region_player0 = manager.false
+    winning_region_player1 = manager.false
+
+    remaining = arena.player0_vertices | arena.player1_vertices
+    dead_ends = remaining & ~arena.pre(remaining, manager)
+    component_player0, component_player1 = dead_ends & arena.player1_vertices, dead_ends & arena.player0_vertices
+
+    while True:
+        attractor_player0 = attractor(arena, component_player0, 0, manager)
+        winning_region_player0 |= attractor_player0
+        arena = arena.subarena(remaining & ~attractor_player0, manager)
+
+        attractor_player1 = attractor(arena, component_player1, 1, manager)
+        winning_region_player1 |= attractor_player1
+        remaining &= ~(attractor_player0 | attractor_player1)
+        arena = arena.subarena(remaining, manager)
+
+        if remaining == manager.false:
+            return winning_region_player0, winning_region_player1
+
+        component = bottom_scc(arena, manager)
+        component_player0, component_player1 = solver(arena.subarena(component, manager), manager)
+
+
+def scc_decomposition(solver):
+    """
+    Create a solver that solves the strongly connected components of the game with a given solver (see scc_solver).
+    :param solver: the solver of the components, which takes an arena and the manager
+    :type solver: function
+    :return: the solver with the decomposition, which takes an arena and the manager
+    :rtype: function
+    """
+
+    return lambda arena, manager: scc_solver(arena, manager, solver)
@@ -20,6 +20,7 @@ import dd.cudd as _bdd
 from collections import defaultdict
 
 from bdd import gpg2bdd
+from bdd.bdd_util import rename
 from bdd.misc import bdd2int
 from bdd.pg2bdd import pg2bdd
 
@@ -238,6 +239,60 @@ class TestArena(unittest.TestCase):
 
                 self.assertEqual(expected_successors, actual_successors)
 
+    def test_variable_orders(self):
+        """
+        Check that the arenas are the same whether variables are interleaved with their copies or not.
+        """
+
+        for file in self.pg_test_files:
+
+            file_path = self.pg_test_files_path + file
+
+            expected_arena = retrieve_expected_pg_arena(file_path)
+
+            for interleaved in [True, False]:
+
+                manager = _bdd.BDD()
+                manager.configure(reordering=False)
+
+                arena, vertices_bdd = pg2bdd(file_path, manager, is_gpg=False, interleaved=interleaved)
+
+                for var, var_bis in arena.mapping_bis.items():
+                    adjacent = manager.level_of_var(var_bis) == manager.level_of_var(var) + 1
+                    self.assertEqual(interleaved, adjacent)
+
+                for index in range(len(vertices_bdd)):
+                    edges_vertex = manager.exist(arena.vars, vertices_bdd[index] & arena.edges)
+                    edges_vertex = manager.let(arena.inv_mapping_bis, edges_vertex)
+
+                    actual_successors = set(bdd2int(edges_vertex, arena.vars, manager, mapping=vertices_bdd))
+
+                    self.assertEqual(set(expected_arena[3][index]), actual_successors)
+
+    def test_rename(self):
+        """
+        Check that renaming the vertices to their copies gives the composition of the function, both with the swap of
+        CUDD and with a manager that does not provide it.
+        """
+
+        class ManagerWithoutSwap:
+            def __init__(self, manager):
+                self.manager = manager
+
+            def __getattr__(self, name):
+                if name == "_swap":
+                    raise AttributeError(name)
+                return getattr(self.manager, name)
+
+        for file in self.pg_test_files:
+            manager = _bdd.BDD()
+            arena, vertices_bdd = pg2bdd(self.pg_test_files_path + file, manager, is_gpg=False)
+
+            for vertex_bdd in vertices_bdd:
+                expected = manager.let(arena.mapping_bis, vertex_bdd)
+                self.assertEqual(rename(arena.mapping_bis, vertex_bdd, manager), expected)
+                self.assertEqual(rename(arena.mapping_bis, vertex_bdd, ManagerWithoutSwap(manager)), expected)
+
 
 if __name__ == '__main__':
     unittest.main()
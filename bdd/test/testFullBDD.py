@@ -1,12 +1,25 @@
+import os
+import random
+import shutil
+import tempfile
 import unittest
 
 import dd.cudd as bdd
 
-from bdd.bdd_util import decomp_data_file
-from bdd.dpa2bdd import get_product_automaton
-from bdd.dpa2gpg import symb_dpa2gpg
-from bdd.generalizedRecursive import generalized_recursive
+from bdd.bdd_cache import BDDCache, content_key
+from bdd.bdd_util import decomp_data_file, create_manager, manager_config, memory_size
+from bdd.dpa2bdd import explicit2symbolic_path, get_product_automaton, PRODUCT_ORDERS
+from bdd.hoa_reader import HOAReader
+from bdd.dpa2gpg import copies, declare_signals, symb_dpa2gpg, symb_dpa2onestep
+from bdd.generalizedRecursive import generalized_recursive, generalized_recursive_with_psolver, \
+    generalized_recursive_with_psolver_multiple_calls
+from bdd.early import UnrealizabilityCheck, lost_by_system
+from bdd.label2bdd import label2bdd
 from bdd.misc import bdd2int
+from bdd.nestedFixpoint import nested_fixpoint
+from bdd.quasiPolynomial import quasi_polynomial
+from bdd.recursive import recursive, recursive_with_buchi
+from bdd.scc import bottom_scc, backward, forward, scc_solver
 
 
 def get_winning_regions(file):
@@ -28,6 +41,34 @@ def get_winning_regions(file):
     return computed_winning_0, computed_winning_1
 
 
+def random_hoa(rng, aps, max_states=5, missing=0.1, weak=None):
+    """
+    Generate a random parity automaton in HOA format with an edge for each valuation of the atomic propositions in
+    each state, some of them missing so that the automaton may not be complete. If weak is "safety" (resp.
+    "co-safety"), the last states are closed under successors and have odd (resp. even) priorities while the other
+    states have even (resp. odd) priorities.
+    """
+
+    nbr_states = rng.randint(2, max_states)
+    closed = rng.randint(1, nbr_states - 1) if weak is not None else nbr_states
+    lines = ["HOA: v1", "States: " + str(nbr_states), "Start: 0",
+             "AP: " + str(len(aps)) + " " + " ".join('"' + ap + '"' for ap in aps),
+             "acc-name: parity max even 4", "Acceptance: 4 Inf(3) | (Fin(2) & (Inf(1) | Fin(0)))", "--BODY--"]
+    for state in range(nbr_states):
+        priority = rng.randint(0, 3)
+        if weak is not None:
+            priority = priority - priority % 2 + ((state >= closed) == (weak == "safety"))
+        lines.append("State: " + str(state) + " {" + str(priority) + "}")
+        for valuation in range(2 ** len(aps)):
+            if rng.random() >= missing:
+                label = "&".join(str(i) if (valuation >> i) & 1 else "!" + str(i) for i in range(len(aps)))
+                dst = rng.randrange(closed, nbr_states) if state >= closed else rng.randrange(nbr_states)
+                lines.append("[" + label + "] " + str(dst))
+    lines.append("--END--")
+
+    return "\n".join(lines) + "\n"
+
+
 class TestFullBDD(unittest.TestCase):
 
     def setUp(self):
@@ -67,6 +108,630 @@ class TestFullBDD(unittest.TestCase):
 
         self.assertTrue(0 not in computed_winning_0)
 
+    def test_grouped_reordering(self):
+        """
+        Checks that dynamic reordering keeps variables of registered groups together.
+        """
+
+        for example in ["example_1", "example_3", "example_5"]:
+            manager = bdd.BDD()
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+
+            signals = declare_signals(input_signals, output_signals, manager, grouped=True)
+            product = get_product_automaton(automata_paths, manager, arbitrary_reordering=True, aps=signals,
+                                            grouped=True, reordering_phases=["load", "product"])
+            arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager, grouped=True)
+            manager.reorder()
+
+            # a state variable and its copy are adjacent, as well as an input atomic proposition and its copy, the
+            # order inside a group can change
+            for var, var_bis in arena.mapping_bis.items():
+                self.assertEqual(abs(manager.level_of_var(var_bis) - manager.level_of_var(var)), 1)
+
+            # input atomic propositions with their copies, and output atomic propositions, stay contiguous
+            for block in [input_signals + copies(input_signals), output_signals]:
+                levels = sorted(manager.level_of_var(var) for var in block)
+                self.assertEqual(levels, list(range(levels[0], levels[0] + len(block))))
+
+            winning_region_player0, _ = generalized_recursive(arena, manager)
+            self.assertEqual(example == "example_3", manager.let(next(manager.pick_iter(init)),
+                                                                 winning_region_player0) == manager.true)
+
+    def test_manager_configuration(self):
+        """
+        Checks that the parameters of the manager are applied and that the sift-converge method gives the same result.
+        """
+
+        self.assertEqual(memory_size("4096"), 4096)
+        self.assertEqual(memory_size("48G"), 48 * 2 ** 30)
+        self.assertEqual(memory_size("1.5k"), 1536)
+
+        manager = create_manager(initial_cache_size=4096, garbage_collection=False, max_growth=1.5, max_swaps=None)
+        config = manager.configure()
+        self.assertFalse(config["garbage_collection"])
+        self.assertEqual(config["max_growth"], 1.5)
+        self.assertEqual(config["max_swaps"], bdd.BDD().configure()["max_swaps"])
+        self.assertIn("cache_size=4096;", manager_config(manager, "sift-converge"))
+        self.assertIn("reordering_method=sift-converge", manager_config(manager, "sift-converge"))
+
+        for example in ["example_1", "example_3"]:
+            manager = create_manager(memory_estimate=memory_size("64M"), max_cache_hard=2 ** 20)
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+
+            signals = declare_signals(input_signals, output_signals, manager, grouped=True)
+            product = get_product_automaton(automata_paths, manager, aps=signals, grouped=True,
+                                            reordering_phases=["load", "product"], reordering_method="sift-converge")
+            arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager, grouped=True)
+
+            winning_region_player0, _ = generalized_recursive(arena, manager)
+            self.assertEqual(example == "example_3", manager.let(next(manager.pick_iter(init)),
+                                                                 winning_region_player0) == manager.true)
+
+    def test_label2bdd(self):
+        """
+        Checks that HOA labels are compiled into the same BDDs as with manager.add_expr, and that long labels do not
+        need a deep recursion.
+        """
+
+        manager = bdd.BDD()
+        aps = ["a", "b", "c"]
+        manager.declare(*aps)
+
+        cache = {}
+        for label, expr in [("t", "True"), ("f", "False"), ("0", "a"), ("!0&1", "!a & b"),
+                            ("!0&!1 | 0&1 | 0&!1", "(!a & !b) | (a & b) | (a & !b)"),
+                            ("!(0 | 2)&1", "!(a | c) & b"), ("!!1 | 2&0", "b | (c & a)"),
+                            ("(0|1)&(2|!0)", "(a | b) & (c | !a)"), ("2&1 | 1&2", "b & c")]:
+            self.assertEqual(label2bdd(label, aps, manager, cache=cache), manager.add_expr(expr))
+
+        # identical sub-expressions are compiled once
+        nbr_cached = len(cache)
+        label2bdd("(0|1)&(2|!0)", aps, manager, cache=cache)
+        self.assertEqual(len(cache), nbr_cached)
+
+        self.assertEqual(label2bdd("@x & !2", aps, manager, aliases={"@x": "0 | 1"}), manager.add_expr("(a | b) & !c"))
+        self.assertRaises(ValueError, label2bdd, "0 &", aps, manager)
+
+        long_label = " | ".join("(" + "&".join(["!0", "1", "!2"] * 10) + ")" for _ in range(5000))
+        self.assertEqual(label2bdd(long_label, aps, manager), manager.add_expr("!a & b & !c"))
+
+    def test_hoa_reader(self):
+        """
+        Checks that the HOA reader accepts any order of the header, comments, several properties lines, aliases,
+        implicit labels, acceptance sets on edges and other parity conditions.
+        """
+
+        # the same automaton as example_1/1.hoaf with parity max odd
+        hoa = """HOA: v1 /* the header items can appear in any order */
+        AP: 2 "a" "b" controllable-AP: 1
+        acc-name: parity max odd 3
+        Acceptance: 3 Fin(2) & (Inf(1) | Fin(0))
+        Start: 0 States: 2 name: "example1_1 /* not a comment */"
+        properties: trans-labels explicit-labels
+        properties: implicit-labels deterministic
+        Alias: @na !0
+        --BODY--
+        State: 0 "first state" /* acceptance sets on edges */
+        [@na&1] 0 {0}
+        [!0&!1 | 0&1 |
+        0&!1] 1 {0}
+        State: 1 {1}
+        1 1 1 1
+        --END--
+        """
+
+        fd, path = tempfile.mkstemp(suffix=".hoaf")
+        with os.fdopen(fd, "w") as f:
+            f.write(hoa)
+
+        try:
+            with HOAReader(path) as reader:
+                self.assertEqual(reader.name, "example1_1 /* not a comment */")
+                self.assertEqual((reader.nbr_states, reader.start, reader.aps), (2, [0], ["a", "b"]))
+                self.assertEqual(reader.controllable_aps, ["b"])
+                self.assertEqual(len(reader.properties), 4)
+                states = [(state.number, state.priorities, state.edges) for state in reader.states()]
+                self.assertEqual(states, [(0, [1], [("@na&1", 0), ("!0&!1 | 0&1 |\n        0&!1", 1)]),
+                                          (1, [2], [("!0&!1", 1), ("0&!1", 1), ("!0&1", 1), ("0&1", 1)])])
+
+            manager = bdd.BDD()
+            manager.declare("a", "b")
+            expected = explicit2symbolic_path(self.arena_path + "example_1/1.hoaf", manager)
+            automaton = explicit2symbolic_path(path, manager)
+            self.assertEqual(automaton.transitions, expected.transitions)
+            self.assertEqual(automaton.init, expected.init)
+            self.assertEqual(dict(automaton.priorities[0]), dict(expected.priorities[0]))
+
+            # min even parity, the priorities are reversed and state 1 without acceptance set is rejecting
+            with open(path, "w") as f:
+                f.write(hoa.replace("max odd", "min even").replace(" {1}", ""))
+            with HOAReader(path) as reader:
+                self.assertEqual([state.priorities for state in reader.states()], [[4], None])
+                self.assertEqual(reader.uncolored_priority, 1)
+
+            # states without acceptance set are less important than every priority with max parity
+            with open(path, "w") as f:
+                f.write(hoa.replace("max odd", "max even").replace(" {1}", ""))
+            automaton = explicit2symbolic_path(path, manager)
+            self.assertEqual(automaton.priorities[0][2], expected.init)
+            self.assertEqual(automaton.priorities[0][1] | automaton.priorities[0][2], manager.true)
+            self.assertEqual(automaton.priorities[0][1] & automaton.priorities[0][2], manager.false)
+
+            # acceptance sets that differ between edges of a state, the states are split by their incoming edges
+            with open(path, "w") as f:
+                f.write(hoa.replace("1] 0 {0}", "1] 0 {1}"))
+            with HOAReader(path) as reader:
+                self.assertEqual((reader.nbr_states, reader.start), (4, [0]))
+                self.assertEqual([(state.number, state.priorities, [destination for _, destination in state.edges])
+                                  for state in reader.states()],
+                                 [(0, None, [1, 2]), (1, [2], [1, 2]), (2, [1], [3] * 4), (3, [2], [3] * 4)])
+
+            # unless the automaton claims state-based acceptance
+            with open(path, "w") as f:
+                f.write(hoa.replace("1] 0 {0}", "1] 0 {1}").replace("deterministic", "deterministic state-acc"))
+            self.assertRaises(ValueError, lambda: explicit2symbolic_path(path, manager))
+
+            # a file that ends in the middle of a state
+            with open(path, "w") as f:
+                f.write(hoa[:hoa.index("State: 1")] + "State:")
+            self.assertRaises(ValueError, lambda: explicit2symbolic_path(path, manager))
+            with open(path, "w") as f:
+                f.write(hoa[:hoa.index("State: 1")] + "State: [0]")
+            self.assertRaises(ValueError, lambda: explicit2symbolic_path(path, manager))
+
+        finally:
+            os.remove(path)
+
+    def test_transition_based_acceptance(self):
+        """
+        Checks that a transition-based parity automaton, as generated by ltl2tgba without --state-based-acceptance,
+        gives the same symbolic automaton as the state-based automaton of its states split by their incoming edges, and
+        the same winner.
+        """
+
+        # example_6/1.hoaf split by hand: state 0 is initial, states 1, 2 and 3 are entered by the edges of priority 0,
+        # 1 and 2
+        hoa = """HOA: v1
+        States: 4
+        Start: 0
+        AP: 2 "a" "b"
+        acc-name: parity max even 3
+        Acceptance: 3 Inf(2) | (Fin(1) & Inf(0))
+        --BODY--
+        """ + "".join("""State: {0}{1}
+        [1] 3
+        [0&!1] 2
+        [!0&!1] 1
+        """.format(state, "" if state == 0 else " {" + str(state - 1) + "}") for state in range(4)) + "--END--\n"
+
+        fd, path = tempfile.mkstemp(suffix=".hoaf")
+        with os.fdopen(fd, "w") as f:
+            f.write(hoa)
+
+        try:
+            manager = bdd.BDD()
+            manager.declare("a", "b")
+            expected = explicit2symbolic_path(path, manager)
+            automaton = explicit2symbolic_path(self.arena_path + "example_6/1.hoaf", manager)
+            self.assertEqual(automaton.nbr_vertices, 4)
+            self.assertEqual(automaton.transitions, expected.transitions)
+            self.assertEqual(automaton.init, expected.init)
+            self.assertEqual(dict(automaton.priorities[0]), dict(expected.priorities[0]))
+        finally:
+            os.remove(path)
+
+        # the system wins by setting b, and loses if b is an input (a and b true infinitely often gives the priority 2)
+        for input_signals, output_signals, realizable in [(["a"], ["b"], True), (["a", "b"], [], False)]:
+            manager = bdd.BDD()
+            manager.declare(*input_signals, *output_signals)
+            product = get_product_automaton([self.arena_path + "example_6/1.hoaf"], manager)
+            arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+            winning_region_player0, _ = generalized_recursive(arena, manager)
+            self.assertEqual(realizable, manager.let(next(manager.pick_iter(init)), winning_region_player0) ==
+                             manager.true)
+
+    def test_product_orders(self):
+        """
+        Checks that every order of the product, with or without the restriction to reachable states, gives the same
+        winner and records the size of each product.
+        """
+
+        for example in ["example_1", "example_2", "example_3"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+            # the automata are repeated to get a product of several automata
+            automata_paths = automata_paths * 3
+
+            for product_order in PRODUCT_ORDERS:
+                for remap, prune_reachable in [(True, False), (False, False), (True, True)]:
+                    manager = bdd.BDD()
+                    manager.declare(*input_signals, *output_signals)
+
+                    stats = []
+                    product = get_product_automaton(automata_paths, manager, remap=remap, product_order=product_order,
+                                                    prune_reachable=prune_reachable, stats=stats)
+                    self.assertEqual(len(stats), len(automata_paths) - 1)
+                    self.assertEqual(stats[-1][0], len(automata_paths))
+                    self.assertEqual(stats[-1][2], product.transitions.dag_size)
+                    if not prune_reachable:
+                        self.assertEqual(stats[-1][1], stats[-1][2])
+                    self.assertEqual(product.dimension, len(automata_paths))
+                    self.assertEqual(len(set(product.vars)), len(product.vars))
+
+                    arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+                    winning_region_player0, _ = generalized_recursive(arena, manager)
+                    self.assertEqual(example != "example_1", manager.let(next(manager.pick_iter(init)),
+                                                                         winning_region_player0) == manager.true)
+
+    def test_reencode(self):
+        """
+        Checks that the re-encoding of reachable product states, explicit or symbolic, removes state variables without
+        changing the winner.
+        """
+
+        for example in ["example_1", "example_2", "example_3", "example_5"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+
+            for max_explicit_states in [0, 4096]:
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+
+                product = get_product_automaton(automata_paths * 2, manager)
+                reencoded = product.reencode(input_signals + output_signals, manager,
+                                             max_explicit_states=max_explicit_states)
+                self.assertLess(len(reencoded.vars), len(product.vars))
+                self.assertEqual(manager.count(reencoded.init, nvars=len(reencoded.vars)), 1)
+                self.assertTrue(manager.support(reencoded.transitions) <=
+                                set(reencoded.all_vars + input_signals + output_signals))
+
+                for automaton in [product, reencoded]:
+                    arena, init = symb_dpa2gpg(automaton, input_signals, output_signals, manager)
+                    winning_region_player0, _ = generalized_recursive(arena, manager)
+                    self.assertEqual(example != "example_1" and example != "example_5",
+                                     manager.let(next(manager.pick_iter(init)), winning_region_player0) == manager.true)
+
+    def test_minimize(self):
+        """
+        Checks that bisimilar states of an automaton are merged, and that the minimization of every automaton and
+        intermediate product does not change the winner.
+        """
+
+        # the automaton of example_1/1.hoaf where state 1 is split into two bisimilar states 1 and 2
+        hoa = """HOA: v1
+        States: 3
+        Start: 0
+        AP: 2 "a" "b"
+        acc-name: parity max even 3
+        Acceptance: 3 Inf(2) | (Fin(1) & Inf(0))
+        --BODY--
+        State: 0 {1}
+        [!0&1] 0
+        [!0&!1 | 0&1] 1
+        [0&!1] 2
+        State: 1 {2}
+        [0] 2
+        [!0] 1
+        State: 2 {2}
+        [t] 1
+        --END--
+        """
+
+        fd, path = tempfile.mkstemp(suffix=".hoaf")
+        with os.fdopen(fd, "w") as f:
+            f.write(hoa)
+
+        try:
+            manager = bdd.BDD()
+            manager.declare("a", "b")
+            automaton = explicit2symbolic_path(path, manager)
+            minimized = automaton.minimize(["a", "b"], manager)
+            expected = explicit2symbolic_path(self.arena_path + "example_1/1.hoaf", manager)
+
+            # states 1 and 2 are represented by 1, whose encoding is smaller, the automaton is then the same as the
+            # automaton of example_1/1.hoaf with x1 false
+            not_x1 = ~manager.var("x1")
+            self.assertEqual(minimized.nbr_vertices, 2)
+            self.assertEqual(minimized.init, expected.init & not_x1)
+            self.assertEqual(minimized.transitions, expected.transitions & not_x1 & ~manager.var("xb1"))
+            self.assertEqual(dict(minimized.priorities[0]), {1: expected.priorities[0][1] & not_x1,
+                                                             2: expected.priorities[0][2] & not_x1})
+        finally:
+            os.remove(path)
+
+        # the temporary variables of the minimization of each intermediate product follow the options of the product
+        for example in ["example_1", "example_2", "example_3", "example_5"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+            for product_order, interleaved, grouped in [("sequential", True, False), ("sequential", True, True),
+                                                        ("balanced", False, False), ("balanced", True, True)]:
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+
+                product = get_product_automaton(automata_paths * 2, manager, minimize=True, product_order=product_order,
+                                                interleaved=interleaved, grouped=grouped)
+                arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+                winning_region_player0, _ = generalized_recursive(arena, manager)
+                self.assertEqual(example != "example_1" and example != "example_5",
+                                 manager.let(next(manager.pick_iter(init)), winning_region_player0) == manager.true)
+
+    def test_one_step_arena(self):
+        """
+        Checks that every solver gives the same winning states on the game built by symb_dpa2onestep and on the game
+        built by symb_dpa2gpg, for random automata that may not be complete.
+        """
+
+        rng = random.Random(0)
+        input_signals, output_signals = ["i0", "i1"], ["o0"]
+
+        for _ in range(20):
+            paths = []
+            for _ in range(rng.choice([1, 2])):
+                fd, path = tempfile.mkstemp(suffix=".hoaf")
+                with os.fdopen(fd, "w") as f:
+                    f.write(random_hoa(rng, input_signals + output_signals))
+                paths.append(path)
+
+            solvers = [generalized_recursive, generalized_recursive_with_psolver,
+                       generalized_recursive_with_psolver_multiple_calls]
+            if len(paths) == 1:
+                solvers += [recursive, recursive_with_buchi]
+
+            try:
+                for solver in solvers:
+                    manager = bdd.BDD()
+                    manager.declare(*input_signals, *output_signals)
+                    product = get_product_automaton(paths, manager)
+
+                    arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+                    winning_region_player0, _ = solver(arena, manager)
+                    one_step_arena, one_step_init = symb_dpa2onestep(product, input_signals, output_signals, manager)
+                    one_step_winning_region_player0, _ = solver(one_step_arena, manager)
+
+                    self.assertEqual(one_step_init, init)
+                    self.assertFalse(set(one_step_arena.vars_bis) & set(input_signals + ["i"]))
+
+                    # vertices of the environment have every input set to false in the arena of symb_dpa2gpg
+                    states = manager.exist(input_signals + ["i"], winning_region_player0 & ~manager.var("i") &
+                                           ~manager.var("i0") & ~manager.var("i1"))
+                    one_step_states = manager.let({"i": False}, one_step_winning_region_player0)
+                    self.assertEqual(manager.exist(input_signals, one_step_states), one_step_states)
+                    self.assertEqual(states, one_step_states & manager.let({"i": False},
+                                                                           one_step_arena.player1_vertices))
+            finally:
+                for path in paths:
+                    os.remove(path)
+
+    def test_bdd_cache(self):
+        """
+        Checks that automata and arenas stored in the cache are loaded in a fresh manager with the same variable order
+        and give the same winner, and that keys depend on the content of the files.
+        """
+
+        directory = tempfile.mkdtemp()
+        try:
+            for example in ["example_1", "example_3", "example_5"]:
+                data_path = self.arena_path + example + "/data.txt"
+                input_signals, output_signals, automata_paths = decomp_data_file(data_path)
+
+                for one_step in [False, True]:
+                    results = []
+                    for run in range(2):
+                        cache = BDDCache(directory)
+                        manager = bdd.BDD()
+                        declare_signals(input_signals, output_signals, manager, grouped=True)
+
+                        key = content_key([data_path] + automata_paths, "arena", one_step)
+                        loaded = cache.load_arena(key, manager, grouped=True)
+                        self.assertEqual(loaded is not None, run == 1)
+
+                        if loaded is None:
+                            product = get_product_automaton(automata_paths, manager, grouped=True, cache=cache)
+                            if one_step:
+                                arena, init = symb_dpa2onestep(product, input_signals, output_signals, manager)
+                            else:
+                                arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager,
+                                                           grouped=True)
+                            cache.dump_arena(key, arena, init, manager)
+                        else:
+                            arena, init = loaded
+
+                        order = [manager.var_at_level(level) for level in range(len(manager.vars))]
+                        winning_region_player0, _ = generalized_recursive(arena, manager)
+                        won = manager.let(next(manager.pick_iter(init)), winning_region_player0) == manager.true
+                        results.append((type(arena), order, won, bdd2int(winning_region_player0, arena.vars, manager)))
+
+                    self.assertEqual(results[0], results[1])
+                    self.assertEqual(results[0][2], example == "example_3")
+
+                # automata are loaded from the cache by the product
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+                cache = BDDCache(directory)
+                product = get_product_automaton(automata_paths, manager, cache=cache)
+                self.assertEqual(cache.hits, len(automata_paths))
+                self.assertEqual(cache.misses, 0)
+                expected = get_product_automaton(automata_paths, manager)
+                self.assertEqual(product.transitions, expected.transitions)
+                self.assertEqual(product.init, expected.init)
+                self.assertEqual(product.priorities, expected.priorities)
+
+            # the key of a file depends on its content, not on its path
+            path = os.path.join(directory, "copy.hoaf")
+            shutil.copy(self.arena_path + "example_1/1.hoaf", path)
+            self.assertEqual(content_key([path], "automaton", 0),
+                             content_key([self.arena_path + "example_1/1.hoaf"], "automaton", 0))
+            self.assertNotEqual(content_key([path], "automaton", 0), content_key([path], "automaton", 2))
+            with open(path, "a") as f:
+                f.write("\n")
+            self.assertNotEqual(content_key([path], "automaton", 0),
+                                content_key([self.arena_path + "example_1/1.hoaf"], "automaton", 0))
+
+        finally:
+            shutil.rmtree(directory)
+
+    def test_early_unrealizability(self):
+        """
+        Checks that the construction of the product stops at the first automaton or intermediate product whose game is
+        lost by the system, and that the product is complete for realizable specifications.
+        """
+
+        for example in ["example_1", "example_2", "example_3", "example_4", "example_5"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+            # the automata are repeated to get a product of several automata
+            automata_paths = automata_paths * 3
+            unrealizable = example in ["example_1", "example_5"]
+
+            for product_order in ["sequential", "balanced"]:
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+
+                check = UnrealizabilityCheck(input_signals, output_signals, manager)
+                product = get_product_automaton(automata_paths, manager, product_order=product_order,
+                                                step_callback=check)
+
+                self.assertEqual(check.unrealizable, unrealizable)
+                self.assertEqual(product.dimension < len(automata_paths), unrealizable)
+                self.assertGreater(check.nbr_games, 0)
+                self.assertLessEqual(check.nbr_partial, check.nbr_games)
+
+                # the game of the last automaton given to the callback is lost, with or without the partial solver
+                for use_partial_solver in [True, False]:
+                    lost, partial = lost_by_system(product, input_signals, output_signals, manager,
+                                                   use_partial_solver=use_partial_solver)
+                    self.assertEqual(lost, unrealizable)
+                    if not use_partial_solver:
+                        self.assertFalse(partial)
+
+            # example_1 is decided by its second automaton alone, example_5 by the product of its two automata
+            manager = bdd.BDD()
+            manager.declare(*input_signals, *output_signals)
+            check = UnrealizabilityCheck(input_signals, output_signals, manager)
+            get_product_automaton(automata_paths, manager, step_callback=check)
+            if example == "example_1":
+                self.assertEqual(check.nbr_games, 2)
+            elif example == "example_5":
+                self.assertEqual(check.nbr_games, len(automata_paths) + 1)
+
+    def test_fold_weak_dimensions(self):
+        """
+        Checks that the safety and co-safety dimensions of a product are detected, and that the game of the product
+        without them has fewer priority functions and the same winning regions.
+        """
+
+        rng = random.Random(1)
+        input_signals, output_signals = ["i0", "i1"], ["o0"]
+
+        for _ in range(15):
+            kinds = [rng.choice([None, "safety", "co-safety"]) for _ in range(rng.randint(2, 3))]
+            paths = []
+            for kind in kinds:
+                fd, path = tempfile.mkstemp(suffix=".hoaf")
+                with os.fdopen(fd, "w") as f:
+                    f.write(random_hoa(rng, input_signals + output_signals, missing=0, weak=kind))
+                paths.append(path)
+
+            try:
+                # the solvers complement the priorities of the arena, which are those of the automaton
+                for solver in [generalized_recursive, generalized_recursive_with_psolver]:
+                    manager = bdd.BDD()
+                    manager.declare(*input_signals, *output_signals)
+                    product = get_product_automaton(paths, manager)
+                    folded = get_product_automaton(paths, manager, fold_weak=True)
+
+                    weak = product.weak_dimensions(input_signals + output_signals, manager)
+                    self.assertTrue(set(index for index, kind in enumerate(kinds) if kind is not None) <= set(weak))
+                    self.assertEqual(folded.dimension, max(1, product.dimension - len(weak)))
+                    self.assertEqual(folded.transitions, product.transitions)
+
+                    arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+                    folded_arena, folded_init = symb_dpa2gpg(folded, input_signals, output_signals, manager)
+                    self.assertEqual(folded_arena.nbr_functions, folded.dimension)
+                    self.assertEqual(folded_init, init)
+                    self.assertEqual(solver(folded_arena, manager), solver(arena, manager))
+            finally:
+                for path in paths:
+                    os.remove(path)
+
+    def test_scc_solver(self):
+        """
+        Checks that the bottom components are closed and strongly connected, and that solving the game bottom-up along
+        its components gives the winning regions of the solver, for both kinds of arenas and random complete automata
+        (the solvers do not agree on the vertices without successors).
+        """
+
+        rng = random.Random(0)
+        input_signals, output_signals = ["i0", "i1"], ["o0"]
+
+        for _ in range(15):
+            paths = []
+            for _ in range(rng.choice([1, 2])):
+                fd, path = tempfile.mkstemp(suffix=".hoaf")
+                with os.fdopen(fd, "w") as f:
+                    f.write(random_hoa(rng, input_signals + output_signals, missing=0))
+                paths.append(path)
+
+            try:
+                # the solvers complement the priorities of the arena, which are those of the automaton
+                for build in [symb_dpa2gpg, symb_dpa2onestep]:
+                    for solver in [generalized_recursive, generalized_recursive_with_psolver_multiple_calls]:
+                        manager = bdd.BDD()
+                        manager.declare(*input_signals, *output_signals)
+                        product = get_product_automaton(paths, manager)
+                        arena, init = build(product, input_signals, output_signals, manager)
+
+                        component = bottom_scc(arena, manager)
+                        vertex = arena.pick_vertex(component, manager)
+                        self.assertEqual(arena.post(component, manager) & ~component, manager.false)
+                        self.assertEqual(forward(arena, vertex, manager), component)
+                        self.assertEqual(backward(arena, vertex, component, manager), component)
+
+                        solution = scc_solver(arena, manager, solver)
+                        self.assertEqual(solution, solver(arena, manager))
+            finally:
+                for path in paths:
+                    os.remove(path)
+
+    def test_nested_fixpoint(self):
+        """
+        Checks that the nested fixpoint solver finds the winner of the initial vertex of the examples, for both kinds of
+        arenas.
+        """
+
+        for example in ["example_1", "example_2", "example_3", "example_4", "example_5", "example_6"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+            realizable = example not in ["example_1", "example_5"]
+
+            for build in [symb_dpa2gpg, symb_dpa2onestep]:
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+                product = get_product_automaton(automata_paths, manager)
+                arena, init = build(product, input_signals, output_signals, manager)
+
+                winning_region_player0, winning_region_player1 = nested_fixpoint(arena, manager)
+                init = next(manager.pick_iter(init))
+                self.assertEqual(manager.let(init, winning_region_player0) == manager.true, realizable)
+                self.assertEqual(manager.let(init, winning_region_player1) == manager.true, not realizable)
+
+    def test_quasi_polynomial(self):
+        """
+        Checks that the quasi-polynomial solver finds the winner of the initial vertex of the examples with a single
+        automaton, whose games have a single priority function, for both kinds of arenas.
+        """
+
+        # the specifications of these examples are realizable
+        for example in ["example_3", "example_4", "example_6"]:
+            input_signals, output_signals, automata_paths = decomp_data_file(self.arena_path + example + "/data.txt")
+
+            for build in [symb_dpa2gpg, symb_dpa2onestep]:
+                manager = bdd.BDD()
+                manager.declare(*input_signals, *output_signals)
+                product = get_product_automaton(automata_paths, manager)
+                arena, init = build(product, input_signals, output_signals, manager)
+
+                self.assertEqual(arena.nbr_functions, 1)
+                winning_region_player0, winning_region_player1 = quasi_polynomial(arena, manager)
+                init = next(manager.pick_iter(init))
+                self.assertEqual(manager.let(init, winning_region_player0), manager.true)
+                self.assertEqual(manager.let(init, winning_region_player1), manager.false)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -15,12 +15,25 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import glob
+import random
 import unittest
 import dd.cudd as bdd
 
-from bdd.generalizedRecursive import generalized_recursive
+from bdd.buchiGames import buchi_fast_path
+from bdd.generalizedBuchiSolver import buchi_solver_gen
+from bdd.generalizedRecursive import complement_priorities, generalized_recursive, generalized_recursive_with_psolver, \
+    generalized_recursive_with_psolver_multiple_calls
 from bdd.gpg2bdd import gpg2bdd
+from bdd.localSolver import local_prepass
 from bdd.misc import bdd2int
+from bdd.nestedFixpoint import children, nested_fixpoint, tighten_bounds
+from bdd.quasiPolynomial import opponent_region, quasi_polynomial, top_priority
+from bdd.recursive import recursive, recursive_single_call, recursive_with_buchi
+from bdd.scc import bottom_scc, scc_solver
+from common.schedule import AdaptiveSchedule
+from common.subgame_cache import SubgameCache
+from common.test.random_games import NoCallSchedule, add_redundant_functions, random_gpg
 
 
 class testGeneralizedRecursive(unittest.TestCase):
@@ -117,6 +130,489 @@ class testGeneralizedRecursive(unittest.TestCase):
         self.assertEqual(set(computed_winning_0), {0, 1, 2, 4, 5})
         self.assertEqual(set(computed_winning_1), {3})
 
+    def test_reduce_dimensions(self):
+        """
+        Checks that the arena with reduced priority functions has the same winning regions, on the examples with two
+        redundant functions.
+        """
+
+        for path in sorted(glob.glob(self.arena_path + "arenas/gpg/*.gpg")):
+            with add_redundant_functions(path) as new_path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                nbr_functions = arena.nbr_functions
+                winning_0, winning_1 = generalized_recursive(arena, manager)
+                winning_0 = set(bdd2int(winning_0, arena.vars, manager, mapping=vertices_bdd))
+                winning_1 = set(bdd2int(winning_1, arena.vars, manager, mapping=vertices_bdd))
+
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(new_path, manager)
+                arena = arena.reduce_dimensions(manager)
+                self.assertLessEqual(arena.nbr_functions, nbr_functions)
+                reduced_winning_0, reduced_winning_1 = generalized_recursive(arena, manager)
+
+                self.assertEqual(set(bdd2int(reduced_winning_0, arena.vars, manager, mapping=vertices_bdd)), winning_0)
+                self.assertEqual(set(bdd2int(reduced_winning_1, arena.vars, manager, mapping=vertices_bdd)), winning_1)
+
+    def test_buchi_fast_path(self):
+        """
+        Checks the solution of the nested fixpoints for Buchi and co-Buchi games on an example solved by hand, then
+        checks that they give the solution of the recursive algorithm on random games.
+        """
+
+        # two co-Buchi functions whose sets of odd priority overlap, player 0 wins vertex 0 by staying on it
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_7.gpg", manager)
+        winning_0, winning_1 = buchi_fast_path(arena, manager)
+        self.assertEqual(set(bdd2int(winning_0, arena.vars, manager, mapping=vertices_bdd)), {0})
+        self.assertEqual(set(bdd2int(winning_1, arena.vars, manager, mapping=vertices_bdd)), {1, 2})
+
+        rng = random.Random(0)
+        # priorities of the functions: generalized Buchi, co-Buchi, always won and Buchi, always lost and Buchi
+        # objectives, and a game which is neither a Buchi nor a co-Buchi game
+        shapes = [[[1, 2], [1, 2]], [[0, 1], [2, 3], [0, 3]], [[0, 2], [1, 2]], [[1, 3], [1, 2]], [[1, 2], [0, 1]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities) as path:
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    solution = buchi_fast_path(arena, manager)
+                    self.assertEqual(solution is None, functions_priorities == shapes[-1])
+                    if solution is not None:
+                        self.assertEqual(solution, generalized_recursive(arena, manager))
+
+    def test_local_prepass(self):
+        """
+        Checks the pre-pass of the -onlyinit mode on an example solved by hand, then checks that the winner of vertex 0
+        found by the pre-pass, or by the recursive algorithm on the arena it leaves, is the winner of vertex 0 in the
+        whole game, on random games.
+        """
+
+        # vertices 3 and 4 are not reachable from vertex 0, which player 0 wins by going to the even self-loop of 1
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_8.gpg", manager)
+        arena, solution = local_prepass(arena, vertices_bdd[0], manager)
+        self.assertEqual(set(bdd2int(arena.player0_vertices | arena.player1_vertices, arena.vars, manager,
+                                     mapping=vertices_bdd)), {0, 1, 2})
+        self.assertEqual(set(bdd2int(solution[0], arena.vars, manager, mapping=vertices_bdd)), {0, 1})
+        self.assertEqual(solution[1], manager.false)
+
+        rng = random.Random(0)
+        shapes = [[[0, 1, 2, 3]], [[1, 2], [0, 1, 2]], [[0, 1, 2, 3], [1, 2, 3, 4]], [[2, 3, 4], [0, 1], [1, 2, 3]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities) as path:
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    winning_region_player0, _ = generalized_recursive(arena, manager)
+                    expected = vertices_bdd[0] & ~winning_region_player0 == manager.false
+
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    arena, solution = local_prepass(arena, vertices_bdd[0], manager)
+                    if solution is None:
+                        solution = generalized_recursive(arena, manager)
+                    self.assertEqual(vertices_bdd[0] & ~solution[0] == manager.false, expected)
+
+    def test_solvers_with_init(self):
+        """
+        Checks that the recursive algorithms that only decide the winner of vertex 0 return partial winning regions of
+        the whole game, one of them containing vertex 0, on an example solved by hand and on random games.
+        """
+
+        solvers = [generalized_recursive, generalized_recursive_with_psolver,
+                   generalized_recursive_with_psolver_multiple_calls]
+
+        # player 0 wins 0, 1 and 4 and player 1 wins 2 and 3, the recursive algorithms stop once vertex 0 is won and
+        # leave vertex 4, which is not reachable from vertex 0, undecided
+        for solver in solvers + [recursive, recursive_single_call, recursive_with_buchi]:
+            manager = bdd.BDD()
+            arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_8.gpg", manager)
+            partial_region_player0, partial_region_player1 = solver(arena, manager, init=vertices_bdd[0])
+            partial_region_player0 = set(bdd2int(partial_region_player0, arena.vars, manager, mapping=vertices_bdd))
+            partial_region_player1 = set(bdd2int(partial_region_player1, arena.vars, manager, mapping=vertices_bdd))
+            self.assertTrue({0, 1} <= partial_region_player0 <= {0, 1, 4})
+            self.assertTrue(partial_region_player1 <= {2, 3})
+            if solver in [generalized_recursive, recursive]:
+                self.assertEqual((partial_region_player0, partial_region_player1), ({0, 1}, {2, 3}))
+
+        rng = random.Random(0)
+        shapes = [[[0, 1, 2, 3]], [[1, 2, 3, 4, 5]], [[1, 2], [0, 1, 2]], [[0, 1, 2, 3], [1, 2, 3, 4]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(5, 30)) as path:
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    init = vertices_bdd[0]
+                    winning_region_player0, winning_region_player1 = generalized_recursive(arena, manager)
+
+                    single = [recursive, recursive_single_call, recursive_with_buchi] \
+                        if len(functions_priorities) == 1 else []
+                    for solver in solvers + single:
+                        # the generalized algorithms change the priorities of the arena
+                        arena, _ = gpg2bdd(path, manager)
+                        partial_region_player0, partial_region_player1 = solver(arena, manager, init=init)
+                        self.assertEqual(partial_region_player0 & ~winning_region_player0, manager.false)
+                        self.assertEqual(partial_region_player1 & ~winning_region_player1, manager.false)
+                        self.assertEqual(init & ~(partial_region_player0 | partial_region_player1), manager.false)
+
+    def test_prune_unreachable(self):
+        """
+        Checks that restricting the loaded game to the vertices reachable from vertex 0 keeps the winner of vertex 0,
+        on an example solved by hand and on random games.
+        """
+
+        # vertices 3 and 4 are not reachable from vertex 0, player 0 wins 0 and 1 and player 1 wins 2
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_8.gpg", manager, prune_unreachable=True)
+        self.assertEqual(set(bdd2int(arena.player0_vertices | arena.player1_vertices, arena.vars, manager,
+                                     mapping=vertices_bdd)), {0, 1, 2})
+        winning_region_player0, winning_region_player1 = generalized_recursive(arena, manager)
+        self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)), {0, 1})
+        self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)), {2})
+
+        rng = random.Random(0)
+
+        for _ in range(20):
+            with random_gpg(rng, [[0, 1, 2, 3], [1, 2, 3, 4]], nbr_vertices=rng.randint(4, 20)) as path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                winning_region_player0, _ = generalized_recursive(arena, manager)
+                expected = vertices_bdd[0] & ~winning_region_player0 == manager.false
+                nbr_vertices = manager.count(arena.player0_vertices | arena.player1_vertices, len(arena.vars))
+
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager, prune_unreachable=True)
+                self.assertLessEqual(manager.count(arena.player0_vertices | arena.player1_vertices, len(arena.vars)),
+                                     nbr_vertices)
+                winning_region_player0, _ = generalized_recursive(arena, manager)
+                self.assertEqual(vertices_bdd[0] & ~winning_region_player0 == manager.false, expected)
+
+    def test_scc_solver(self):
+        """
+        Checks that solving the game bottom-up along its strongly connected components gives the winning regions of an
+        example solved by hand.
+        """
+
+        # the bottom component {2, 3} is won by player 1, the bottom component {4} is won by player 0, and player 0 wins
+        # 0 and 1 by looping between them
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_9.gpg", manager)
+        self.assertIn(set(bdd2int(bottom_scc(arena, manager), arena.vars, manager, mapping=vertices_bdd)),
+                      [{2, 3}, {4}])
+        winning_region_player0, winning_region_player1 = scc_solver(arena, manager, generalized_recursive)
+        self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)), {0, 1, 4})
+        self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)), {2, 3})
+
+    def test_priority_ranges(self):
+        """
+        Checks that the unions of priorities computed once by the arena give the vertices of the priorities in a range,
+        in sub-arenas and after the priorities are complemented, on an example and on random games.
+        """
+
+        # the priorities of example 3 are 5, 4, 3, 2, 1 for the first function and 4, 2, 5, 4, 1 for the second one
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_3.gpg", manager)
+        subarena = arena.subarena(vertices_bdd[1] | vertices_bdd[2] | vertices_bdd[3], manager)
+        self.assertEqual(set(bdd2int(arena.priorities_at_most(0, 3, manager), arena.vars, manager,
+                                     mapping=vertices_bdd)), {2, 3, 4})
+        self.assertEqual(set(bdd2int(arena.priorities_at_least(1, 2, manager, 0), arena.vars, manager,
+                                     mapping=vertices_bdd)), {0, 1, 3})
+        self.assertEqual(set(bdd2int(arena.priorities_at_least(0, 2, manager, 1), arena.vars, manager,
+                                     mapping=vertices_bdd)), {0, 2})
+        self.assertEqual(set(bdd2int(subarena.priorities_at_most(0, 3, manager), arena.vars, manager,
+                                     mapping=vertices_bdd)), {2, 3})
+        complement_priorities(arena, manager)
+        self.assertEqual(set(bdd2int(arena.priorities_at_most(0, 3, manager), arena.vars, manager,
+                                     mapping=vertices_bdd)), {3, 4})
+        self.assertEqual(set(bdd2int(arena.priorities_at_least(1, 4, manager), arena.vars, manager,
+                                     mapping=vertices_bdd)), {0, 2, 3})
+
+        rng = random.Random(0)
+
+        for _ in range(10):
+            with random_gpg(rng, [[0, 1, 2, 3, 4], [1, 3, 4, 5]], nbr_vertices=rng.randint(4, 20)) as path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                kept = manager.false
+                for vertex in vertices_bdd:
+                    if rng.random() < 0.7:
+                        kept |= vertex
+
+                # the unions are computed by the arena before its sub-arena uses them, then the priorities of the
+                # arena are complemented
+                arena.priorities_at_most(0, 2, manager)
+                subarena = arena.subarena(kept, manager)
+                for current in [arena, subarena, None]:
+                    if current is None:
+                        complement_priorities(arena, manager)
+                        current = arena
+                    vertices = current.player0_vertices | current.player1_vertices
+                    for function_index in range(current.nbr_functions):
+                        function = current.priorities[function_index]
+                        for priority in range(-1, 8):
+                            expected = manager.false
+                            for p, bdd_p in function.items():
+                                if p <= priority:
+                                    expected |= bdd_p
+                            self.assertEqual(current.priorities_at_most(function_index, priority, manager),
+                                             expected & vertices)
+                            for parity in [None, 0, 1]:
+                                expected = manager.false
+                                for p, bdd_p in function.items():
+                                    if p >= priority and (parity is None or p % 2 == parity):
+                                        expected |= bdd_p
+                                self.assertEqual(current.priorities_at_least(function_index, priority, manager, parity),
+                                                 expected & vertices)
+
+    def test_buchi_solver_gen(self):
+        """
+        Checks the partial solver, which skips some vectors of priorities, on an example solved by hand, then checks
+        that its regions are included in the winning regions of the recursive algorithm, on random games with several
+        priority functions.
+        """
+
+        # player 1 wins 0 by its self-loop of odd priority 1. In the rest, the vector (2, 2) misses the vertex 3 of
+        # priority 2 for the second function, since 3 is also the vertex of odd priority 3 for the first one, so the
+        # vector (0, 2) is skipped. The vector (0, 0) gives 1 to player 0, then the vector (2, 0) gives 2 and 3 in the
+        # remaining arena, where player 1 is not searched for a region again
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_10.gpg", manager)
+        partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen(arena, manager)
+        self.assertEqual(set(bdd2int(partial_winning_region_player0, arena.vars, manager, mapping=vertices_bdd)),
+                         {1, 2, 3})
+        self.assertEqual(set(bdd2int(partial_winning_region_player1, arena.vars, manager, mapping=vertices_bdd)),
+                         {0})
+
+        rng = random.Random(0)
+
+        for _ in range(20):
+            functions_priorities = [list(range(rng.randint(2, 6))) for _ in range(rng.randint(2, 4))]
+            with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(10, 30)) as path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                partial_winning_region_player0, partial_winning_region_player1 = buchi_solver_gen(arena, manager)
+                winning_region_player0, winning_region_player1 = generalized_recursive(arena, manager)
+                self.assertEqual(partial_winning_region_player0 & ~winning_region_player0, manager.false)
+                self.assertEqual(partial_winning_region_player1 & ~winning_region_player1, manager.false)
+
+    def test_adaptive_schedule(self):
+        """
+        Checks the decisions of the adaptive schedule of the partial solver with a fake clock, then checks that the
+        algorithms whose calls to the partial solver follow a schedule give the winning regions of examples solved by
+        hand and of the recursive algorithm on random games.
+        """
+
+        now = [0.0]
+        schedule = AdaptiveSchedule(share=0.5, clock=lambda: now[0])
+
+        now[0] = 10.0
+        self.assertTrue(schedule.should_call(0))
+        now[0] = 11.0
+        schedule.record(0, 5)
+        self.assertTrue(schedule.should_call(0))
+        now[0] = 12.0
+        schedule.record(0, 0)
+        # the calls at level 0 are skipped once, then twice, the other levels are not affected
+        self.assertEqual([schedule.should_call(0) for _ in range(2)], [False, True])
+        now[0] = 13.0
+        schedule.record(0, 0)
+        self.assertEqual([schedule.should_call(0) for _ in range(4)], [False, False, False, True])
+        schedule.record(0, 5)
+        self.assertTrue(schedule.should_call(0))
+        schedule.record(0, 5)
+        self.assertTrue(schedule.should_call(1))
+        schedule.record(1, 5)
+
+        # 3 seconds out of 13 were spent in the partial solver, more than a share of 0.2
+        schedule.share = 0.2
+        self.assertFalse(schedule.should_call(1))
+        now[0] = 15.0
+        self.assertTrue(schedule.should_call(1))
+
+        # examples solved by hand, with one or two priority functions, where the partial solver is called at every
+        # time or only once
+        examples = [("example_4_pg.gpg", {0, 1, 2, 3}, {4, 5, 6}), ("example_3.gpg", {0, 1}, {2, 3, 4}),
+                    ("example_4.gpg", {0, 1, 2, 4, 5}, {3})]
+        for share in [1.0, 1e-9]:
+            for name, expected_player0, expected_player1 in examples:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/" + name, manager)
+                solvers = [generalized_recursive_with_psolver_multiple_calls]
+                if arena.nbr_functions == 1:
+                    solvers.append(recursive_with_buchi)
+                for solver in solvers:
+                    arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/" + name, manager)
+                    winning_region_player0, winning_region_player1 = solver(arena, manager,
+                                                                            schedule=AdaptiveSchedule(share))
+                    self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)),
+                                     expected_player0)
+                    self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)),
+                                     expected_player1)
+
+        rng = random.Random(0)
+
+        for share in [1.0, 1e-9]:
+            for _ in range(10):
+                functions_priorities = [list(range(rng.randint(2, 6))) for _ in range(rng.randint(1, 3))]
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(10, 30)) as path:
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    expected = generalized_recursive(arena, manager)
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    self.assertEqual(generalized_recursive_with_psolver_multiple_calls(
+                        arena, manager, schedule=AdaptiveSchedule(share)), expected)
+                    if len(functions_priorities) == 1:
+                        arena, vertices_bdd = gpg2bdd(path, manager)
+                        self.assertEqual(recursive_with_buchi(arena, manager, schedule=AdaptiveSchedule(share)),
+                                         recursive(arena, manager))
+
+    def test_subgame_cache(self):
+        """
+        Checks the least recently used eviction of the cache of subgames, then checks that the recursive algorithm
+        and its combination with the partial solver in each recursive call, with a cache, give the winning regions of
+        an example solved by hand, and that they give the winning regions of the recursive algorithm with a cache large
+        or reduced to a single solution, on random games.
+        """
+
+        cache = SubgameCache(2)
+        cache.put("a", (1, 0))
+        cache.put("b", (2, 0))
+        self.assertEqual(cache.get("a"), (1, 0))
+        cache.put("c", (3, 0))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), (3, 0))
+        self.assertEqual((cache.hits, cache.misses, cache.evictions), (2, 1, 1))
+        self.assertAlmostEqual(cache.hit_rate(), 2 / 3)
+
+        # the recursive algorithm meets one subgame of example 4 twice, which is solved by hand
+        for use_psolver in [False, True]:
+            manager = bdd.BDD()
+            arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_4.gpg", manager)
+            cache = SubgameCache(1000)
+            if use_psolver:
+                winning_region_player0, winning_region_player1 = generalized_recursive_with_psolver_multiple_calls(
+                    arena, manager, schedule=NoCallSchedule(), cache=cache)
+            else:
+                winning_region_player0, winning_region_player1 = generalized_recursive(arena, manager, cache)
+            self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)),
+                             {0, 1, 2, 4, 5})
+            self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)), {3})
+            self.assertEqual(cache.hits, 1)
+
+        rng = random.Random(0)
+        hits, multiple_calls_hits = 0, 0
+
+        for size in [1000, 1]:
+            for _ in range(10):
+                functions_priorities = [list(range(rng.randint(2, 6))) for _ in range(rng.randint(2, 3))]
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(10, 30)) as path:
+                    manager = bdd.BDD()
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    expected = generalized_recursive(arena, manager)
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    cache = SubgameCache(size)
+                    self.assertEqual(generalized_recursive(arena, manager, cache), expected)
+                    self.assertLessEqual(len(cache.solutions), size)
+                    hits += cache.hits
+                    arena, vertices_bdd = gpg2bdd(path, manager)
+                    cache = SubgameCache(size)
+                    # without the partial solver, the subgames met again are those of the recursive algorithm
+                    self.assertEqual(generalized_recursive_with_psolver_multiple_calls(
+                        arena, manager, schedule=NoCallSchedule(), cache=cache), expected)
+                    self.assertLessEqual(len(cache.solutions), size)
+                    multiple_calls_hits += cache.hits
+
+        self.assertGreater(hits, 0)
+        self.assertGreater(multiple_calls_hits, 0)
+
+    def test_nested_fixpoint(self):
+        """
+        Checks the Zielonka tree of the winning condition on an example, then checks that the nested fixpoint solver
+        gives the winning regions of examples solved by hand, and those of the recursive algorithm on random games with
+        one or several priority functions.
+        """
+
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_3.gpg", manager)
+        bounds, vertices = tighten_bounds(arena, (5, 5), manager)
+        self.assertEqual(bounds, (5, 5))
+        self.assertEqual(vertices, arena.player0_vertices | arena.player1_vertices)
+
+        # player 1 wins at the root, its child keeps the vertices 1, 3 and 4 whose priorities are at most 4
+        [(child_bounds, child_vertices)] = children(arena, bounds, vertices, manager)
+        self.assertEqual(child_bounds, (4, 4))
+        self.assertEqual(set(bdd2int(child_vertices, arena.vars, manager, mapping=vertices_bdd)), {1, 3, 4})
+
+        # both functions lead to the vertex 4, which is a single child, and player 1 wins with it
+        self.assertEqual([bounds for bounds, _ in children(arena, child_bounds, child_vertices, manager)], [(1, 1)])
+        self.assertEqual(children(arena, (1, 1), tighten_bounds(arena, (1, 1), manager)[1], manager), [])
+
+        # in example 11, player 0 wins each function alone by staying in 1 or in 2, but not both functions at once
+        for name, expected_player0, expected_player1 in [("example_3.gpg", {0, 1}, {2, 3, 4}),
+                                                         ("example_11.gpg", set(), {0, 1, 2})]:
+            manager = bdd.BDD()
+            arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/" + name, manager)
+            winning_region_player0, winning_region_player1 = nested_fixpoint(arena, manager)
+            self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)),
+                             expected_player0)
+            self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)),
+                             expected_player1)
+
+        rng = random.Random(0)
+
+        for _ in range(40):
+            functions_priorities = [list(range(rng.randint(1, 6))) for _ in range(rng.randint(1, 3))]
+            with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(3, 30)) as path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                solution = nested_fixpoint(arena, manager)
+                self.assertEqual(solution, generalized_recursive(arena, manager))
+
+    def test_quasi_polynomial(self):
+        """
+        Checks the levels of the quasi-polynomial solver on an example, then checks that it gives the winning regions of
+        the examples with a single priority function, solved by hand, and those of the recursive algorithm on random
+        games whose priorities have gaps.
+        """
+
+        manager = bdd.BDD()
+        arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/example_3_pg.gpg", manager)
+
+        # the priorities are 1, 2 and 4, the empty levels of the parity of the bound are skipped, the other ones are not
+        self.assertEqual(top_priority(arena, 6, manager), 4)
+        self.assertEqual(top_priority(arena, 5, manager), 5)
+        self.assertEqual(top_priority(arena, 3, manager), 3)
+        self.assertEqual(top_priority(arena, 2, manager), 2)
+
+        # with a precision 0, no dominion of the opponent is looked for
+        self.assertEqual(opponent_region(arena, max(arena.priorities[0].keys()), [0, 0], manager), manager.false)
+
+        # the examples with a single priority function, solved by hand, whose priorities have gaps
+        examples = [("example_1_pg.gpg", {0, 1, 3, 5}, {2, 4}), ("example_2_pg.gpg", {0, 1, 2}, set()),
+                    ("example_3_pg.gpg", {0, 1, 2, 3}, set()), ("example_4_pg.gpg", {0, 1, 2, 3}, {4, 5, 6}),
+                    ("example_5_pg.gpg", {0, 1, 4}, {2, 3, 5}), ("example_6_pg.gpg", {0, 3, 5}, {1, 2, 4, 6, 7})]
+        for name, expected_player0, expected_player1 in examples:
+            manager = bdd.BDD()
+            arena, vertices_bdd = gpg2bdd(self.arena_path + "arenas/gpg/" + name, manager)
+            winning_region_player0, winning_region_player1 = quasi_polynomial(arena, manager)
+            self.assertEqual(set(bdd2int(winning_region_player0, arena.vars, manager, mapping=vertices_bdd)),
+                             expected_player0)
+            self.assertEqual(set(bdd2int(winning_region_player1, arena.vars, manager, mapping=vertices_bdd)),
+                             expected_player1)
+
+        rng = random.Random(0)
+
+        for _ in range(60):
+            functions_priorities = [rng.sample(range(12), rng.randint(1, 8))]
+            with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(3, 40)) as path:
+                manager = bdd.BDD()
+                arena, vertices_bdd = gpg2bdd(path, manager)
+                self.assertEqual(quasi_polynomial(arena, manager), recursive(arena, manager))
+
 
 if __name__ == '__main__':
     unittest.main()
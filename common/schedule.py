@@ -0,0 +1,72 @@
+import time
+
+
+class AdaptiveSchedule:
+    """
+    Class used to decide, at each call of a recursive algorithm, whether the partial solver is called before the
+    recursive steps. The schedule records, for each level of recursion, the number of vertices removed by the partial
+    solver and the time it took. A call is fruitful if it removed vertices at least at half the mean rate of all the
+    calls so far. After k consecutive calls at a level that were not fruitful, the partial solver is only called once
+    every 2^k times at this level, and a fruitful call restores the calls at every time. Moreover, the partial solver
+    is not called while the time it took exceeds a share of the time elapsed since the schedule was created. The
+    schedule is shared by the engines, the number of removed vertices is counted by the caller.
+
+    :param share: the maximal share of the time spent in the partial solver, between 0 and 1, default to 0.5
+    :type share: float
+    :param clock: the clock used to measure the time, in seconds, default to time.perf_counter
+    :type clock: function
+    """
+
+    def __init__(self, share=0.5, clock=time.perf_counter):
+        self.share = share
+        self.clock = clock
+        self.start = clock()
+        self.call_start = None
+
+        self.time = 0.0  # total time spent in the partial solver
+        self.removed = 0  # total number of vertices removed by the partial solver
+
+        # for each level of recursion, the number of consecutive calls that were not fruitful and the number of times
+        # the partial solver was not called since the last call
+        self.misses = {}
+        self.skipped = {}
+
+    def should_call(self, depth):
+        """
+        Decides whether the partial solver is called at a level of recursion. If so, the call must be followed by
+        record, which measures its time.
+        :param depth: the level of recursion
+        :type depth: int
+        :return: True if the partial solver must be called
+        :rtype: bool
+        """
+
+        now = self.clock()
+        misses = self.misses.get(depth, 0)
+        skipped = self.skipped.get(depth, 0)
+
+        over_budget = self.time > self.share * (now - self.start)
+        if over_budget or skipped < 2 ** misses - 1:
+            self.skipped[depth] = skipped + 1
+            return False
+
+        self.skipped[depth] = 0
+        self.call_start = now
+        return True
+
+    def record(self, depth, removed):
+        """
+        Record the result of a call to the partial solver at a level of recursion.
+        :param depth: the level of recursion
+        :type depth: int
+        :param removed: the number of vertices removed by the partial solver
+        :type removed: int
+        """
+
+        elapsed = self.clock() - self.call_start
+        self.time += elapsed
+        self.removed += removed
+
+        # the mean rate includes this call, the first call is fruitful if it removed a vertex
+        fruitful = removed > 0 and removed * self.time >= 0.5 * self.removed * elapsed
+        self.misses[depth] = 0 if fruitful else self.misses.get(depth, 0) + 1
@@ -0,0 +1,74 @@
+from collections import OrderedDict
+
+
+class SubgameCache:
+    """
+    In-memory cache of the solutions of the subgames met by the generalized recursive algorithm. A subgame is a
+    sub-arena of the arena given to the algorithm, identified by its set of vertices (the BDD of the set with the
+    symbolic implementation, whose node is canonical, or a frozenset with the explicit one) and by the vector of the
+    maximal priorities of the call. The cache keeps at most size solutions and evicts the least recently used one. A
+    cache must only be shared by the calls made on sub-arenas of the same arena.
+
+    :param size: the maximal number of solutions in the cache
+    :type size: int
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.solutions = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Looks up the solution of a subgame and marks it as the most recently used one.
+        :param key: the key of the subgame
+        :type key: tuple
+        :return: the solution of the subgame, or None if it is not in the cache
+        :rtype: tuple | None
+        """
+
+        solution = self.solutions.get(key)
+        if solution is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.solutions.move_to_end(key)
+        return solution
+
+    def put(self, key, solution):
+        """
+        Stores the solution of a subgame, the least recently used solution is evicted if the cache is full.
+        :param key: the key of the subgame
+        :type key: tuple
+        :param solution: the solution of the subgame
+        :type solution: tuple
+        """
+
+        self.solutions[key] = solution
+        self.solutions.move_to_end(key)
+        if len(self.solutions) > self.size:
+            self.solutions.popitem(last=False)
+            self.evictions += 1
+
+    def hit_rate(self):
+        """
+        Computes the hit rate of the cache.
+        :return: the share of the lookups that found their solution in the cache, 0 if there was no lookup
+        :rtype: float
+        """
+
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Summarizes the use of the cache.
+        :return: a summary of the lookups and of the evictions of the cache
+        :rtype: str
+        """
+
+        return "subgame cache: {} hits, {} misses ({:.1%} hit rate), {} evictions, {} of {} entries used" \
+            .format(self.hits, self.misses, self.hit_rate(), self.evictions, len(self.solutions), self.size)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def temporary_gpg(lines):
+    """
+    Write a generalized parity game to a temporary file, removed when the context is left.
+    :param lines: the lines of the game in the gpg format
+    :type lines: list[str]
+    :return: the path to the file
+    :rtype: str
+    """
+
+    fd, path = tempfile.mkstemp(suffix=".gpg")
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        yield path
+    finally:
+        os.remove(path)
+
+
+def add_redundant_functions(path):
+    """
+    Write a copy of a generalized parity game to a temporary file, with two more priority functions: the first one
+    shifted by 2, which it dominates, and a function with even priorities only.
+    :param path: the path to the game
+    :type path: str
+    :return: a context manager that gives the path to the copy, removed when the context is left
+    :rtype: contextlib.AbstractContextManager[str]
+    """
+
+    with open(path) as gpg_file:
+        lines = gpg_file.read().splitlines()
+
+    header = lines[0].rstrip(";").split(" ")
+    new_lines = [" ".join(header[:2] + [str(int(header[2]) + 2)]) + ";"]
+    for line in lines[1:]:
+        infos = line.split(" ")
+        prios = infos[1].split(",")
+        infos[1] = ",".join(prios + [str(int(prios[0]) + 2), str(2 * (int(infos[0]) % 3))])
+        new_lines.append(" ".join(infos))
+
+    return temporary_gpg(new_lines)
+
+
+def random_gpg(rng, functions_priorities, nbr_vertices=12):
+    """
+    Write a random generalized parity game to a temporary file, the priorities of the i-th function are taken from
+    functions_priorities[i] and every vertex has one to three successors.
+    :param rng: the random generator, e.g. random.Random(0) so that the tests are reproducible
+    :type rng: random.Random
+    :param functions_priorities: for each priority function, the priorities it can take
+    :type functions_priorities: list[list[int]]
+    :param nbr_vertices: the number of vertices, default to 12
+    :type nbr_vertices: int
+    :return: a context manager that gives the path to the game, removed when the context is left
+    :rtype: contextlib.AbstractContextManager[str]
+    """
+
+    lines = ["generalized-parity " + str(nbr_vertices - 1) + " " + str(len(functions_priorities)) + ";"]
+    for vertex in range(nbr_vertices):
+        prios = [str(rng.choice(priorities)) for priorities in functions_priorities]
+        successors = rng.sample(range(nbr_vertices), rng.randint(1, 3))
+        lines.append(str(vertex) + " " + ",".join(prios) + " " + str(rng.randint(0, 1)) + " " +
+                     ",".join(str(successor) for successor in successors) + ' "' + str(vertex) + '";')
+
+    return temporary_gpg(lines)
+
+
+class NoCallSchedule:
+    """
+    Schedule of the partial solver that never calls it, so that the algorithms with a call to the partial solver in
+    each recursive call meet the subgames of the recursive algorithm.
+    """
+
+    def should_call(self, depth):
+        """
+        Decides whether the partial solver is called at a level of recursion, which is never the case.
+        :param depth: the level of recursion
+        :type depth: int
+        :return: False
+        :rtype: bool
+        """
+
+        return False
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from collections import defaultdict
+from collections import defaultdict, deque
 
 
 class Arena:
@@ -94,3 +94,100 @@ class Arena:
         subarena.predecessors = predecessors
 
         return subarena
+
+    def reachable_vertices(self, init):
+        """
+        Computes the vertices reachable from a vertex with a breadth-first search, the winner of this vertex only
+        depends on them.
+        :param init: the vertex
+        :type init: int
+        :return: the reachable vertices, including init
+        :rtype: set of int
+        """
+
+        reached = {init}
+        queue = deque([init])
+        while queue:
+            for successor in self.successors[queue.popleft()]:
+                if successor not in reached:
+                    reached.add(successor)
+                    queue.append(successor)
+
+        return reached
+
+    def restrict_to_reachable_vertices(self, init):
+        """
+        Creates a sub-arena of the current arena restricted to the vertices reachable from a vertex (see subarena).
+        :param init: the vertex
+        :type init: int
+        :return: a new arena corresponding to the sub-arena
+        :rtype: Arena
+        """
+
+        return self.subarena(set(self.vertices) - self.reachable_vertices(init))
+
+    def reduce_dimensions(self):
+        """
+        Creates an arena with the same winning regions and fewer or simpler priority functions (the original arena
+        remains unchanged). The priorities of each function are compressed: they are renumbered from 0 or 1, keeping
+        their order and parity, consecutive priorities of the same parity being merged. Then, since player 0 must win
+        every function, functions with even priorities only are removed, a function with odd priorities only is kept
+        alone, and a function B is removed if another function A dominates it: the priority of each vertex for B is
+        given by a non-decreasing map g of its priority for A, with g(a) even for every even a, so that every play won
+        for A is also won for B. Identical functions dominate each other and only one of them is kept.
+        :return: a new arena with the reduced priority functions
+        :rtype: Arena
+        """
+
+        # priorities of each vertex for each compressed function
+        compressed = []
+        for func in range(self.nbr_functions):
+            mapping = {}
+            new_priority = -1
+            for priority in sorted(set(self.vertex_priorities[vertex][func] for vertex in self.vertices)):
+                if new_priority == -1 or (new_priority - priority) % 2:
+                    new_priority = priority % 2 if new_priority == -1 else new_priority + 1
+                mapping[priority] = new_priority
+            compressed.append({vertex: mapping[self.vertex_priorities[vertex][func]] for vertex in self.vertices})
+
+        def dominates(a, b):
+            # whether function b is a non-decreasing and even-preserving map of function a
+            g = {}
+            for vertex in self.vertices:
+                if g.setdefault(compressed[a][vertex], compressed[b][vertex]) != compressed[b][vertex]:
+                    return False
+            values = sorted(g)
+            return all(g[x] <= g[y] for x, y in zip(values, values[1:])) and \
+                all(g[x] % 2 == 0 for x in values if x % 2 == 0)
+
+        kept = [func for func in range(self.nbr_functions) if any(p % 2 for p in compressed[func].values())]
+        odd_only = [func for func in kept if all(p % 2 for p in compressed[func].values())]
+        if odd_only:
+            kept = odd_only[:1]
+        for func in list(kept):
+            if any(dominates(other, func) for other in kept if other != func):
+                kept.remove(func)
+
+        vertex_priorities = defaultdict(lambda: [])
+        for vertex in self.vertices:
+            vertex_priorities[vertex] = [compressed[func][vertex] for func in kept] if kept else [0]
+
+        nbr_functions = max(len(kept), 1)
+        priorities = [defaultdict(lambda: []) for _ in range(nbr_functions)]
+        for vertex in self.vertices:
+            for func in range(nbr_functions):
+                priorities[func][vertex_priorities[vertex][func]].append(vertex)
+
+        reduced = Arena()
+
+        reduced.nbr_vertices = self.nbr_vertices
+        reduced.nbr_functions = nbr_functions
+
+        reduced.vertices = self.vertices
+        reduced.player = self.player
+        reduced.priorities = priorities
+        reduced.vertex_priorities = vertex_priorities
+        reduced.successors = self.successors
+        reduced.predecessors = self.predecessors
+
+        return reduced
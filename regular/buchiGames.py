@@ -0,0 +1,101 @@
+from regular.attractor import attractor
+
+
+def acceptance_shape(arena):
+    """
+    Recognize the games whose priority functions have at most two priorities, up to a compression of the priorities
+    (see Arena.reduce_dimensions). Player 0 must win every function. A function with even priorities only is always
+    won, a function with odd priorities only is always lost. A function whose greatest priority is even and whose other
+    priorities are odd is a Buchi objective: visit its vertices of even priority infinitely often. A function whose
+    greatest priority is odd and whose other priorities are even is a co-Buchi objective: visit its vertices of odd
+    priority finitely often. The conjunction of co-Buchi objectives is the co-Buchi objective of the union of their
+    sets, in which a vertex of odd priority for several functions appears once.
+    :param arena: a game arena
+    :type arena: Arena
+    :return: ("lost", None) if a function is always lost, ("buchi", sets) if every other function is a Buchi objective
+             (with its set of vertices of even priority), ("co-buchi", set) if every other function is a co-Buchi
+             objective (with the union of their vertices of odd priority), None otherwise
+    :rtype: (str, list of (list of int) | list of int) | None
+    """
+
+    buchi_sets = []
+    co_buchi_set = set()
+    for function in arena.priorities:
+        priorities = sorted(priority for priority, vertices in function.items() if vertices)
+        parity_changes = sum(1 for p, q in zip(priorities, priorities[1:]) if (p - q) % 2)
+
+        if parity_changes == 0:
+            if priorities and priorities[0] % 2:
+                return "lost", None
+        elif parity_changes == 1 and priorities[-1] % 2 == 0:
+            buchi_sets.append([vertex for priority in priorities if priority % 2 == 0 for vertex in function[priority]])
+        elif parity_changes == 1:
+            co_buchi_set.update(vertex for priority in priorities if priority % 2 for vertex in function[priority])
+        else:
+            return None
+
+    if buchi_sets and co_buchi_set:
+        return None
+    if co_buchi_set:
+        return "co-buchi", sorted(co_buchi_set)
+    return "buchi", buchi_sets
+
+
+def generalized_buchi(arena, sets, player):
+    """
+    Solve the game in which player must visit each set of sets infinitely often. While some set is not attracted by
+    player from every vertex, the opponent wins from the vertices outside this attractor and from their attractor,
+    which are removed. The remaining vertices are won by player, who attracts the play to each set in turn.
+    :param arena: a game arena
+    :type arena: Arena
+    :param sets: the sets of vertices to visit infinitely often
+    :type sets: list of (list of int)
+    :param player: the player with the generalized Buchi objective
+    :type player: int
+    :return: the solution of the game, that is the set of vertices won by each player
+    :rtype: list of int, list of int
+    """
+
+    opponent = 0 if player else 1
+
+    won_by_opponent = []
+    while True:
+        remaining = set(arena.vertices)
+        for target in sets:
+            reached = set(attractor(arena, [vertex for vertex in target if vertex in remaining], player))
+            escape = [vertex for vertex in arena.vertices if vertex not in reached]
+            if escape:
+                break
+        else:
+            break
+
+        removed = attractor(arena, escape, opponent)
+        won_by_opponent.extend(removed)
+        arena = arena.subarena(set(removed))
+
+    if player:
+        return won_by_opponent, arena.vertices
+    return arena.vertices, won_by_opponent
+
+
+def buchi_fast_path(arena):
+    """
+    Solve the game with a nested fixpoint if it is a (generalized) Buchi or a co-Buchi game (see acceptance_shape). A
+    co-Buchi objective of player 0 is solved as the Buchi objective of player 1 on the same set.
+    :param arena: a game arena
+    :type arena: Arena
+    :return: the solution of the game, that is the set of vertices won by each player, or None if the game is not a
+             Buchi or co-Buchi game
+    :rtype: (list of int, list of int) | None
+    """
+
+    shape = acceptance_shape(arena)
+    if shape is None:
+        return None
+
+    kind, sets = shape
+    if kind == "lost":
+        return [], list(arena.vertices)
+    if kind == "buchi":
+        return generalized_buchi(arena, sets, 0)
+    return generalized_buchi(arena, [sets], 1)
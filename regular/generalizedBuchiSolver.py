@@ -90,7 +90,8 @@ def tuples_iterator(depth, priorities, sizes, li, k, t):
             li[i] -= 1
 
 
-def generalized_buchi_partial_solver(arena, partial_winning_region_player0, partial_winning_region_player1):
+def generalized_buchi_partial_solver(arena, partial_winning_region_player0, partial_winning_region_player1,
+                                     init=None):
     """
     Partial solver for generalized parity games using fatal attractors. Implementation using inline version of
     generalized buchi inter safety games.
@@ -100,6 +101,8 @@ def generalized_buchi_partial_solver(arena, partial_winning_region_player0, part
     :type partial_winning_region_player0: []
     :param partial_winning_region_player1: should be empty list when called
     :type partial_winning_region_player1: []
+    :param init: if not None, a vertex, the solver stops as soon as a region that contains it is found
+    :type init: int
     :return: a partial solution sub-arena, partial_player0, partial_player1 in which sub-arena remains unsolved and
     partial_player0 (resp. partial_player1) is included in the winning region of player 0 (resp. player 1) in arena.
     :rtype: Arena, list of int, list of int
@@ -168,9 +171,13 @@ def generalized_buchi_partial_solver(arena, partial_winning_region_player0, part
 
                         partial_winning_region_player1.extend(regular_att)
 
+                        if init is not None and init in regular_att:
+                            return arena.subarena(regular_att), partial_winning_region_player0, \
+                                partial_winning_region_player1
+
                         return generalized_buchi_partial_solver(arena.subarena(regular_att),
                                                                 partial_winning_region_player0,
-                                                                partial_winning_region_player1)
+                                                                partial_winning_region_player1, init)
 
                     else:
                         target_set = target_set.intersection(monotone_att)
@@ -225,9 +232,13 @@ def generalized_buchi_partial_solver(arena, partial_winning_region_player0, part
             if len(win) != 0:
                 att2 = attractor(arena, win, 0)
                 partial_winning_region_player0.extend(att2)
+
+                if init is not None and init in att2:
+                    return arena.subarena(att2), partial_winning_region_player0, partial_winning_region_player1
+
                 return generalized_buchi_partial_solver(arena.subarena(att2),
                                                 partial_winning_region_player0,
-                                                partial_winning_region_player1)
+                                                partial_winning_region_player1, init)
 
         depth += 1
 
@@ -59,28 +59,46 @@ def transform_game(arena):
     return max_priorities
 
 
-def generalized_recursive(arena):
+def generalized_recursive(arena, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using the recursive algorithm.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames, only used for sub-arenas of arena
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_parity_win)
+    :type init: int
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
     max_priorities = transform_game(arena)
 
-    return disj_parity_win(arena, max_priorities)
+    return disj_parity_win(arena, max_priorities, cache, init)
 
 
-def disj_parity_win(arena, max_priorities):
+def disj_parity_win(arena, max_priorities, cache=None, init=None):
     """
-    Procedure to solve the generalized parity game provided in arena using the recursive algorithm.
+    Procedure to solve the generalized parity game provided in arena using the recursive algorithm. With a cache, the
+    solution of a subgame is looked up by the set of its vertices and the maximal priorities before it is computed.
+    The cache holds copies of the regions, which the callers extend.
+
+    With init, only the winner of the vertex init is decided. The attractor B of G1 for player 1 is won by player 1 in
+    the arena, so the call returns as soon as B contains init, and otherwise solves the rest of the arena restricted to
+    the vertices reachable from init, which keeps the winner of init. The calls on the subgames H1 solve them entirely:
+    their winning regions are attracted in G1 and decide whether the loop stops, so H1 cannot be restricted. The
+    partial solutions are not stored in the cache.
     :param arena: a game arena
     :type arena: Arena
     :param max_priorities: the maximal priorities occurring in the arena
     :type max_priorities: list of int
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: int
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -92,6 +110,12 @@ def disj_parity_win(arena, max_priorities):
     if all(value == 1 for value in max_priorities) or arena.nbr_vertices == 0:
         return arena.vertices, []
 
+    if cache is not None:
+        key = (frozenset(arena.vertices), tuple(max_priorities))
+        solution = cache.get(key)
+        if solution is not None:
+            return list(solution[0]), list(solution[1])
+
     for func_index in range(arena.nbr_functions):
 
         # We only consider priority functions according to which every value is not 1
@@ -113,7 +137,7 @@ def disj_parity_win(arena, max_priorities):
                 # assert(copy_max_priorities[func_index] >= 0)
                 # assert(copy_max_priorities[func_index] == max_priorities[func_index] - 2)
                 # end of sanity check
-                W1, W2 = disj_parity_win(H1, copy_max_priorities)
+                W1, W2 = disj_parity_win(H1, copy_max_priorities, cache)
                 # sanity check: if all priorities were odd, then W1 union G1.V should be g.V
                 # print(set(G1.vertices).union(set(W1)))
                 # print(set(arena.vertices))
@@ -140,20 +164,36 @@ def disj_parity_win(arena, max_priorities):
                 # and so necessarily B is non-empty
                 assert (len(B) > 0)
                 # end of sanity check
-                W1, W2 = disj_parity_win(arena.subarena(B), max_priorities)
+                if init is not None and init in B:
+                    return [], B
+
+                remaining = arena.subarena(B)
+                if init is not None:
+                    remaining = remaining.restrict_to_reachable_vertices(init)
+                W1, W2 = disj_parity_win(remaining, max_priorities, cache, init)
                 B.extend(W2)
+                if cache is not None and init is None:
+                    cache.put(key, (tuple(W1), tuple(B)))
                 return W1, B
 
+    if cache is not None:
+        cache.put(key, (tuple(arena.vertices), ()))
     return arena.vertices, []
 
 
-def generalized_recursive_with_buchi(arena):
+def generalized_recursive_with_buchi(arena, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using a combination of the recursive algorithm and the partial
     solver called buchi solver.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param cache: if provided, the cache of the solutions of the subgames, only used for sub-arenas of arena
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_parity_win), the regions of
+                 the partial solver are also won in the arena
+    :type init: int
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -163,9 +203,14 @@ def generalized_recursive_with_buchi(arena):
     if remaining_arena.nbr_vertices == 0:
         return partial_winning_region_player0, partial_winning_region_player1
 
+    if init is not None:
+        if init in partial_winning_region_player0 or init in partial_winning_region_player1:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = remaining_arena.restrict_to_reachable_vertices(init)
+
     max_priorities = transform_game(remaining_arena)
 
-    winning_region_player0, winning_region_player1 = disj_parity_win(remaining_arena, max_priorities)
+    winning_region_player0, winning_region_player1 = disj_parity_win(remaining_arena, max_priorities, cache, init)
 
     winning_region_player0.extend(partial_winning_region_player0)
     winning_region_player1.extend(partial_winning_region_player1)
@@ -173,33 +218,55 @@ def generalized_recursive_with_buchi(arena):
     return winning_region_player0, winning_region_player1
 
 
-def generalized_recursive_with_buchi_multiple_calls(arena):
+def generalized_recursive_with_buchi_multiple_calls(arena, schedule=None, cache=None, init=None):
     """
     Solve the generalized parity game provided in arena using a combination of the recursive algorithm and the partial
     solver called buchi solver. This version uses a call to the partial solver in each recursive call to the algorithm.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, only the winner of this vertex of arena is decided (see disj_parity_win_multiple_calls)
+    :type init: int
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
     max_priorities = transform_game(arena)
 
-    winning_region_player0, winning_region_player1 = disj_parity_win_multiple_calls(arena, max_priorities)
+    winning_region_player0, winning_region_player1 = disj_parity_win_multiple_calls(arena, max_priorities, schedule,
+                                                                                    cache=cache, init=init)
 
     return winning_region_player0, winning_region_player1
 
 
-def disj_parity_win_multiple_calls(arena, max_priorities):
+def disj_parity_win_multiple_calls(arena, max_priorities, schedule=None, depth=0, cache=None, init=None):
     """
     Procedure to solve the generalized parity game provided in arena using the recursive algorithm. This version
     performs a call to the partial solver in each recursive call. The input is a complemented arena and the partial
-    solver is adapted to this
+    solver is adapted to this. With a cache, the solution of a subgame is looked up as in disj_parity_win, before the
+    partial solver is called on it. With init, only the winner of the vertex init is decided as in disj_parity_win,
+    the regions of the partial solver are also won in the arena and the call returns if they contain init. The rest
+    of the arena is then restricted in this call, so none of its solutions is stored in the cache.
     :param arena: a game arena
     :type arena: Arena
     :param max_priorities: the maximal priorities occurring in the arena
     :type max_priorities: list of int
-    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param depth: the level of recursion of this call
+    :type depth: int
+    :param cache: if provided, the cache of the solutions of the subgames
+    :type cache: SubgameCache
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: int
+    :return: the solution of the provided generalized parity game, that is the set of vertices won by each player,
+             with init partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -211,10 +278,29 @@ def disj_parity_win_multiple_calls(arena, max_priorities):
     if all(value == 1 for value in max_priorities) or arena.nbr_vertices == 0:
         return arena.vertices, []
 
-    remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = \
-        generalized_buchi_partial_solver_inverted_players(arena, [], [])  # call to the partial solver
+    if cache is not None:
+        key = (frozenset(arena.vertices), tuple(max_priorities))
+        solution = cache.get(key)
+        if solution is not None:
+            return list(solution[0]), list(solution[1])
+
+    if schedule is None or schedule.should_call(depth):
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = \
+            generalized_buchi_partial_solver_inverted_players(arena, [], [])  # call to the partial solver
+
+        if schedule is not None:
+            schedule.record(depth, len(partial_winning_region_player0) + len(partial_winning_region_player1))
+    else:
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = arena, [], []
+
+    if init is not None:
+        if init in partial_winning_region_player0 or init in partial_winning_region_player1:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = remaining_arena.restrict_to_reachable_vertices(init)
 
     if remaining_arena.nbr_vertices == 0:
+        if cache is not None and init is None:
+            cache.put(key, (tuple(partial_winning_region_player0), tuple(partial_winning_region_player1)))
         return partial_winning_region_player0, partial_winning_region_player1
 
     # update the max priorities in the remaining following the removal of vertices TODO check correctness
@@ -245,7 +331,7 @@ def disj_parity_win_multiple_calls(arena, max_priorities):
                 # assert(copy_max_priorities[func_index] >= 0)
                 # assert(copy_max_priorities[func_index] == max_priorities[func_index] - 2)
                 # end of sanity check
-                W1, W2 = disj_parity_win_multiple_calls(H1, copy_max_priorities)
+                W1, W2 = disj_parity_win_multiple_calls(H1, copy_max_priorities, schedule, depth + 1, cache)
                 # sanity check: if all priorities were odd, then W1 union G1.V should be g.V
                 # print(set(G1.vertices).union(set(W1)))
                 # print(set(arena.vertices))
@@ -272,13 +358,25 @@ def disj_parity_win_multiple_calls(arena, max_priorities):
                 # and so necessarily B is non-empty
                 assert (len(B) > 0)
                 # end of sanity check
-                W1, W2 = disj_parity_win_multiple_calls(remaining_arena.subarena(B), max_priorities_remaining)
+                if init is not None and init in B:
+                    B.extend(partial_winning_region_player1)
+                    return partial_winning_region_player0, B
+
+                remaining = remaining_arena.subarena(B)
+                if init is not None:
+                    remaining = remaining.restrict_to_reachable_vertices(init)
+                W1, W2 = disj_parity_win_multiple_calls(remaining, max_priorities_remaining, schedule, depth + 1,
+                                                        cache, init)
                 B.extend(W2)
 
                 W1.extend(partial_winning_region_player0)
                 B.extend((partial_winning_region_player1))
+                if cache is not None and init is None:
+                    cache.put(key, (tuple(W1), tuple(B)))
                 return W1, B
 
     partial_winning_region_player0.extend(remaining_arena.vertices)
 
+    if cache is not None and init is None:
+        cache.put(key, (tuple(partial_winning_region_player0), tuple(partial_winning_region_player1)))
     return partial_winning_region_player0, partial_winning_region_player1
@@ -19,11 +19,13 @@ from collections import defaultdict
 from regular.arena import Arena
 
 
-def gpg2arena(gpg_path):
+def gpg2arena(gpg_path, prune_unreachable=False):
     """
     Loads a generalized parity game from file and represent it as an Arena object.
     :param gpg_path: path to the .gpg file containing a generalized parity game in extended PGSolver format
     :type gpg_path: str
+    :param prune_unreachable: whether the arena is restricted to the vertices reachable from vertex 0
+    :type prune_unreachable: bool
     :return: an arena object for the arena provided in the file
     :rtype: Arena
     """
@@ -80,6 +82,10 @@ def gpg2arena(gpg_path):
         arena.successors = successors
         arena.predecessors = predecessors
 
+        # only the winner of vertex 0 is reported, the vertices it cannot reach do not matter
+        if prune_unreachable:
+            arena = arena.restrict_to_reachable_vertices(0)
+
         return arena
 
 
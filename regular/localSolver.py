@@ -0,0 +1,59 @@
+from regular.attractor import attractor
+from regular.generalizedBuchiSolver import generalized_buchi_partial_solver
+
+
+def self_loop_regions(arena):
+    """
+    Computes the vertices with a self-loop that are won by the player who controls them by taking the loop forever:
+    vertices of player 0 whose priorities are all even and vertices of player 1 with an odd priority.
+    :param arena: a game arena
+    :type arena: Arena
+    :return: the vertices won by player 0 and the vertices won by player 1 with their self-loop
+    :rtype: list of int, list of int
+    """
+
+    won_player0 = []
+    won_player1 = []
+    for vertex in arena.vertices:
+        if vertex in arena.successors[vertex]:
+            all_even = all(priority % 2 == 0 for priority in arena.vertex_priorities[vertex])
+            if arena.player[vertex] == 0 and all_even:
+                won_player0.append(vertex)
+            elif arena.player[vertex] == 1 and not all_even:
+                won_player1.append(vertex)
+
+    return won_player0, won_player1
+
+
+def local_prepass(arena, init):
+    """
+    Prepare the game for a solver when only the winner of the initial vertex is needed. The arena is restricted to the
+    vertices reachable from init, then the attractors of the vertices won with a self-loop and the regions of the
+    partial solver are removed, and the remaining arena is restricted again to the vertices reachable from init. The
+    partial solver stops as soon as it finds a region that contains init.
+    :param arena: a game arena
+    :type arena: Arena
+    :param init: the initial vertex
+    :type init: int
+    :return: the remaining arena and, if the winner of init is known, partial winning regions of each player, one of
+             them containing init, otherwise None
+    :rtype: Arena, (list of int, list of int) | None
+    """
+
+    arena = arena.restrict_to_reachable_vertices(init)
+
+    won_player0, won_player1 = self_loop_regions(arena)
+    attractor_player0 = attractor(arena, won_player0, 0)
+    if init in attractor_player0:
+        return arena, (attractor_player0, [])
+    attractor_player1 = attractor(arena, won_player1, 1)
+    if init in attractor_player1:
+        return arena, ([], attractor_player1)
+    arena = arena.subarena(set(attractor_player0) | set(attractor_player1))
+
+    arena, partial_winning_region_player0, partial_winning_region_player1 = \
+        generalized_buchi_partial_solver(arena, [], [], init=init)
+    if init in partial_winning_region_player0 or init in partial_winning_region_player1:
+        return arena, (partial_winning_region_player0, partial_winning_region_player1)
+
+    return arena.restrict_to_reachable_vertices(init), None
@@ -19,13 +19,15 @@ from collections import defaultdict
 from regular.arena import Arena
 
 
-def pg2arena(pg_path, is_gpg=True):
+def pg2arena(pg_path, is_gpg=True, prune_unreachable=False):
     """
     Loads a parity game from file and represent it as an Arena object.
     :param pg_path: path to the .pg file containing a parity game in PGSolver format
     :type pg_path: str
     :param is_gpg: whether the file is in generalized parity extended PGSolver format
     :type is_gpg: bool
+    :param prune_unreachable: whether the arena is restricted to the vertices reachable from vertex 0
+    :type prune_unreachable: bool
     :return: an arena object for the arena provided in the file
     :rtype: Arena
     """
@@ -84,4 +86,8 @@ def pg2arena(pg_path, is_gpg=True):
         arena.successors = successors
         arena.predecessors = predecessors
 
+        # only the winner of vertex 0 is reported, the vertices it cannot reach do not matter
+        if prune_unreachable:
+            arena = arena.restrict_to_reachable_vertices(0)
+
         return arena
@@ -0,0 +1,97 @@
+from regular.attractor import attractor
+
+
+def is_open(subgame, quasi_dominion, player):
+    """
+    Checks whether a set of vertices of a subgame is open for player, that is whether the opponent can leave it to
+    another vertex of the subgame, or player cannot stay in it from one of its vertices.
+    :param subgame: the subgame
+    :type subgame: Arena
+    :param quasi_dominion: the set of vertices
+    :type quasi_dominion: set of int
+    :param player: the player
+    :type player: int
+    :return: True if the set is open for player in the subgame
+    :rtype: bool
+    """
+
+    for vertex in quasi_dominion:
+        if subgame.player[vertex] == player:
+            if not any(successor in quasi_dominion for successor in subgame.successors[vertex]):
+                return True
+        elif any(successor not in quasi_dominion for successor in subgame.successors[vertex]):
+            return True
+
+    return False
+
+
+def search_dominion(arena):
+    """
+    Computes a dominion of the parity game provided in arena with the priority promotion algorithm of Benerecetti,
+    Dell'Erba and Mogavero. Each vertex has a region priority, initially its priority. From the greatest priority p,
+    the region of p is the attractor, for the player of the parity of p, of the vertices of region priority p, in the
+    subgame of the vertices whose region priority is at most p. The vertices of the region take the region priority p.
+    If the opponent can leave the region in the subgame, or the player cannot stay in it, the search goes on with the
+    next region priority of the rest of the subgame. Otherwise, the region is a dominion of the player if the opponent
+    cannot leave it in the arena either. If they can, they leave to regions of the player with greater priorities, and
+    the region is promoted to the smallest of them: its vertices take this region priority, the vertices of smaller
+    region priorities get their priority back, and the search goes on from this region priority.
+    :param arena: a game arena with a single priority function and at least one vertex
+    :type arena: Arena
+    :return: a dominion of the game and the player who wins it
+    :rtype: (list of int, int)
+    """
+
+    region = {vertex: arena.vertex_priorities[vertex][0] for vertex in arena.vertices}
+    priority = max(region.values())
+    subgame = arena
+
+    while True:
+        player = priority % 2
+
+        quasi_dominion = attractor(subgame, [vertex for vertex in subgame.vertices if region[vertex] == priority],
+                                   player)
+        members = set(quasi_dominion)
+        for vertex in quasi_dominion:
+            region[vertex] = priority
+
+        if is_open(subgame, members, player):
+            subgame = subgame.subarena(members)
+            priority = max(region[vertex] for vertex in subgame.vertices)
+            continue
+
+        escapes = [region[successor] for vertex in quasi_dominion if arena.player[vertex] != player
+                   for successor in arena.successors[vertex] if successor not in members]
+        if not escapes:
+            return quasi_dominion, player
+
+        # promotion to the smallest region priority the opponent can escape to, the smaller regions are reset
+        priority = min(escapes)
+        for vertex in arena.vertices:
+            if vertex in members:
+                region[vertex] = priority
+            elif region[vertex] < priority:
+                region[vertex] = arena.vertex_priorities[vertex][0]
+        subgame = arena.subarena({vertex for vertex in arena.vertices if region[vertex] > priority})
+
+
+def priority_promotion(arena):
+    """
+    Solve the parity game provided in arena using the priority promotion algorithm. A dominion is found by
+    search_dominion, its attractor for the player who wins it is won by this player and removed, and the search starts
+    again in the remaining arena until it is empty.
+    :param arena: a game arena with a single priority function
+    :type arena: Arena
+    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :rtype: list of int, list of int
+    """
+
+    winning_regions = ([], [])  # winning region of each player
+
+    while arena.nbr_vertices != 0:
+        dominion, player = search_dominion(arena)
+        dominion_attractor = attractor(arena, dominion, player)
+        winning_regions[player].extend(dominion_attractor)
+        arena = arena.subarena(set(dominion_attractor))
+
+    return winning_regions
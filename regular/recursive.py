@@ -19,12 +19,18 @@ from regular.attractor import attractor
 from regular.buchiSolver import buchi_partial_solver
 
 
-def recursive(arena):
+def recursive(arena, init=None):
     """
-    Solve the parity game provided in arena using the recursive algorithm.
+    Solve the parity game provided in arena using the recursive algorithm. With init, only the winner of the vertex
+    init is decided: the attractor B of the winning region of the opponent in G\A is won by the opponent in the arena,
+    so the call returns as soon as B contains init, and otherwise solves G\B restricted to the vertices reachable from
+    init. The call on G\A solves it entirely, since its winning regions decide B.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param init: if provided, the vertex whose winner is decided, it must be a vertex of arena
+    :type init: int
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -80,11 +86,17 @@ def recursive(arena):
             # compute attractor B
             B = attractor(arena, winning_region_opponent, opponent)
 
-            # The subgame G\B is composed of the vertices not in the attractor
+            # B is won by the opponent in the arena, the rest of the arena is not needed if B contains init
+            if init is not None and init in B:
+                return (B, []) if j else ([], B)
+
+            # The subgame G\B is composed of the vertices not in the attractor, with init only those reachable from it
             G_B = arena.subarena(B)
+            if init is not None:
+                G_B = G_B.restrict_to_reachable_vertices(init)
 
             # recursively solve subgame G\B
-            winning_region_player0_G_B, winning_region_player1_G_B = recursive(G_B)
+            winning_region_player0_G_B, winning_region_player1_G_B = recursive(G_B, init)
 
             # depending on which player we are considering, assign regions to the proper variables
             # if we consider player1
@@ -111,13 +123,16 @@ def recursive(arena):
     return winning_region_player0, winning_region_player1
 
 
-def recursive_single_call(arena):
+def recursive_single_call(arena, init=None):
     """
     Solve the parity game provided in arena by performing a single call to the partial solver called buchi solver and
     solving the remaining arena using the recursive algorithm.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param init: if provided, only the winner of this vertex of arena is decided (see recursive)
+    :type init: int
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -136,7 +151,12 @@ def recursive_single_call(arena):
     if remaining_arena.nbr_vertices == 0:
         return partial_winning_region_player0, partial_winning_region_player1
 
-    winning_region_player0_remaining, winning_region_player1_remaining = recursive(remaining_arena)
+    if init is not None:
+        if init in partial_winning_region_player0 or init in partial_winning_region_player1:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = remaining_arena.restrict_to_reachable_vertices(init)
+
+    winning_region_player0_remaining, winning_region_player1_remaining = recursive(remaining_arena, init)
 
     winning_region_player0.extend(partial_winning_region_player0)
     winning_region_player0.extend(winning_region_player0_remaining)
@@ -147,13 +167,22 @@ def recursive_single_call(arena):
     return winning_region_player0, winning_region_player1
 
 
-def recursive_with_buchi(arena):
+def recursive_with_buchi(arena, schedule=None, depth=0, init=None):
     """
     Solve the parity game provided in arena using a combinations of the recursive algorithm and the partial solver
     called buchi solver.
     :param arena: a game arena
     :type arena: Arena
-    :return: the solution of the provided parity game, that is the set of vertices won by each player
+    :param schedule: if provided, decides whether the partial solver is called in each recursive call, otherwise it is
+                     always called
+    :type schedule: AdaptiveSchedule
+    :param depth: the level of recursion of this call
+    :type depth: int
+    :param init: if provided, only the winner of this vertex of arena is decided (see recursive), the regions of the
+                 partial solver are also won in the arena
+    :type init: int
+    :return: the solution of the provided parity game, that is the set of vertices won by each player, with init
+             partial winning regions, one of them containing init
     :rtype: list of int, list of int
     """
 
@@ -164,9 +193,20 @@ def recursive_with_buchi(arena):
     if arena.nbr_vertices == 0:
         return winning_region_player0, winning_region_player1
 
-    remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = buchi_partial_solver(arena,
-                                                                                                           [],
-                                                                                                           [])
+    if schedule is None or schedule.should_call(depth):
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = buchi_partial_solver(arena,
+                                                                                                               [],
+                                                                                                               [])
+
+        if schedule is not None:
+            schedule.record(depth, len(partial_winning_region_player0) + len(partial_winning_region_player1))
+    else:
+        remaining_arena, partial_winning_region_player0, partial_winning_region_player1 = arena, [], []
+
+    if init is not None:
+        if init in partial_winning_region_player0 or init in partial_winning_region_player1:
+            return partial_winning_region_player0, partial_winning_region_player1
+        remaining_arena = remaining_arena.restrict_to_reachable_vertices(init)
 
     # if the remaining game is empty, return the partial regions
     if remaining_arena.nbr_vertices == 0:
@@ -190,7 +230,7 @@ def recursive_with_buchi(arena):
         G_A = remaining_arena.subarena(A)
 
         # Recursively solving the subgame G\A
-        winning_region_player0_G_A, winning_region_player1_G_A = recursive_with_buchi(G_A)
+        winning_region_player0_G_A, winning_region_player1_G_A = recursive_with_buchi(G_A, schedule, depth + 1)
 
         # depending on which player we are considering, assign regions to the proper variables
         # if we consider player1
@@ -217,11 +257,20 @@ def recursive_with_buchi(arena):
             # compute attractor B
             B = attractor(remaining_arena, winning_region_opponent, opponent)
 
-            # The subgame G\B is composed of the vertices not in the attractor
+            # B is won by the opponent in the arena, the rest of the arena is not needed if B contains init
+            if init is not None and init in B:
+                if j:
+                    return B + partial_winning_region_player0, partial_winning_region_player1
+                return partial_winning_region_player0, B + partial_winning_region_player1
+
+            # The subgame G\B is composed of the vertices not in the attractor, with init only those reachable from it
             G_B = remaining_arena.subarena(B)
+            if init is not None:
+                G_B = G_B.restrict_to_reachable_vertices(init)
 
             # recursively solve subgame G\B
-            winning_region_player0_G_B, winning_region_player1_G_B = recursive_with_buchi(G_B)
+            winning_region_player0_G_B, winning_region_player1_G_B = recursive_with_buchi(G_B, schedule, depth + 1,
+                                                                                           init)
 
             # depending on which player we are considering, assign regions to the proper variables
             # if we consider player1
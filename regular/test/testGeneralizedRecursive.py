@@ -15,10 +15,20 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import glob
+import random
 import unittest
 
-from regular.generalizedRecursive import generalized_recursive
+from common.schedule import AdaptiveSchedule
+from common.subgame_cache import SubgameCache
+from common.test.random_games import NoCallSchedule, add_redundant_functions, random_gpg
+from regular.buchiGames import acceptance_shape, buchi_fast_path
+from regular.generalizedRecursive import generalized_recursive, generalized_recursive_with_buchi, \
+    generalized_recursive_with_buchi_multiple_calls
 from regular.gpg2arena import gpg2arena
+from regular.localSolver import local_prepass
+from regular.priorityPromotion import is_open, priority_promotion, search_dominion
+from regular.recursive import recursive, recursive_single_call, recursive_with_buchi
 
 
 class testGeneralizedRecursive(unittest.TestCase):
@@ -88,6 +98,259 @@ class testGeneralizedRecursive(unittest.TestCase):
         self.assertEqual(set(computed_winning_0), {0, 1, 2, 4, 5})
         self.assertEqual(set(computed_winning_1), {3})
 
+    def test_reduce_dimensions(self):
+        """
+        Checks that the arena with reduced priority functions has the same winning regions, on the examples with two
+        redundant functions.
+        """
+
+        for path in sorted(glob.glob(self.arena_path + "arenas/gpg/*.gpg")):
+            with add_redundant_functions(path) as new_path:
+                arena = gpg2arena(path)
+                nbr_functions = arena.nbr_functions
+                winning_0, winning_1 = generalized_recursive(arena)
+
+                arena = gpg2arena(new_path).reduce_dimensions()
+                self.assertLessEqual(arena.nbr_functions, nbr_functions)
+                reduced_winning_0, reduced_winning_1 = generalized_recursive(arena)
+
+                self.assertEqual(set(reduced_winning_0), set(winning_0))
+                self.assertEqual(set(reduced_winning_1), set(winning_1))
+
+    def test_buchi_fast_path(self):
+        """
+        Checks the solution of the nested fixpoints for Buchi and co-Buchi games on an example solved by hand, then
+        checks that they give the solution of the recursive algorithm on random games.
+        """
+
+        # two co-Buchi functions whose sets of odd priority overlap: vertex 2 is odd for both and appears once in
+        # their union, player 0 wins vertex 0 by staying on it
+        arena = gpg2arena(self.arena_path + "arenas/gpg/example_7.gpg")
+        self.assertEqual(acceptance_shape(arena), ("co-buchi", [1, 2]))
+        winning_0, winning_1 = buchi_fast_path(arena)
+        self.assertEqual(set(winning_0), {0})
+        self.assertEqual(set(winning_1), {1, 2})
+
+        rng = random.Random(0)
+        # priorities of the functions: generalized Buchi, co-Buchi, always won and Buchi, always lost and Buchi
+        # objectives, and a game which is neither a Buchi nor a co-Buchi game
+        shapes = [[[1, 2], [1, 2]], [[0, 1], [2, 3], [0, 3]], [[0, 2], [1, 2]], [[1, 3], [1, 2]], [[1, 2], [0, 1]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities) as path:
+                    solution = buchi_fast_path(gpg2arena(path))
+                    self.assertEqual(solution is None, functions_priorities == shapes[-1])
+                    if solution is not None:
+                        winning_0, winning_1 = generalized_recursive(gpg2arena(path))
+                        self.assertEqual(set(solution[0]), set(winning_0))
+                        self.assertEqual(set(solution[1]), set(winning_1))
+
+    def test_local_prepass(self):
+        """
+        Checks the pre-pass of the -onlyinit mode on an example solved by hand, then checks that the winner of vertex 0
+        found by the pre-pass, or by the recursive algorithm on the arena it leaves, is the winner of vertex 0 in the
+        whole game, on random games.
+        """
+
+        # vertices 3 and 4 are not reachable from vertex 0, which player 0 wins by going to the even self-loop of 1
+        arena, solution = local_prepass(gpg2arena(self.arena_path + "arenas/gpg/example_8.gpg"), 0)
+        self.assertEqual(set(arena.vertices), {0, 1, 2})
+        self.assertEqual((set(solution[0]), set(solution[1])), ({0, 1}, set()))
+
+        rng = random.Random(0)
+        shapes = [[[0, 1, 2, 3]], [[1, 2], [0, 1, 2]], [[0, 1, 2, 3], [1, 2, 3, 4]], [[2, 3, 4], [0, 1], [1, 2, 3]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities) as path:
+                    winning_region_player0, _ = generalized_recursive(gpg2arena(path))
+                    arena, solution = local_prepass(gpg2arena(path), 0)
+                    if solution is None:
+                        solution = generalized_recursive(arena)
+                    self.assertEqual(0 in solution[0], 0 in winning_region_player0)
+
+    def test_solvers_with_init(self):
+        """
+        Checks that the recursive algorithms that only decide the winner of vertex 0 return partial winning regions of
+        the whole game, one of them containing vertex 0, on an example solved by hand and on random games.
+        """
+
+        solvers = [generalized_recursive, generalized_recursive_with_buchi,
+                   generalized_recursive_with_buchi_multiple_calls]
+
+        # player 0 wins 0, 1 and 4 and player 1 wins 2 and 3, the recursive algorithms stop once vertex 0 is won and
+        # leave vertex 4, which is not reachable from vertex 0, undecided
+        path = self.arena_path + "arenas/gpg/example_8.gpg"
+        for solver in solvers + [recursive, recursive_single_call, recursive_with_buchi]:
+            partial_region_player0, partial_region_player1 = solver(gpg2arena(path), init=0)
+            partial_region_player0, partial_region_player1 = set(partial_region_player0), set(partial_region_player1)
+            self.assertTrue({0, 1} <= partial_region_player0 <= {0, 1, 4})
+            self.assertTrue(partial_region_player1 <= {2, 3})
+            if solver in [generalized_recursive, recursive]:
+                self.assertEqual((partial_region_player0, partial_region_player1), ({0, 1}, {2, 3}))
+
+        rng = random.Random(0)
+        shapes = [[[0, 1, 2, 3]], [[1, 2, 3, 4, 5]], [[1, 2], [0, 1, 2]], [[0, 1, 2, 3], [1, 2, 3, 4]]]
+
+        for _ in range(10):
+            for functions_priorities in shapes:
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(5, 30)) as path:
+                    winning_region_player0, winning_region_player1 = generalized_recursive(gpg2arena(path))
+
+                    single = [recursive, recursive_single_call, recursive_with_buchi] \
+                        if len(functions_priorities) == 1 else []
+                    for solver in solvers + single:
+                        partial_region_player0, partial_region_player1 = solver(gpg2arena(path), init=0)
+                        self.assertTrue(set(partial_region_player0) <= set(winning_region_player0))
+                        self.assertTrue(set(partial_region_player1) <= set(winning_region_player1))
+                        self.assertTrue(0 in partial_region_player0 or 0 in partial_region_player1)
+
+    def test_prune_unreachable(self):
+        """
+        Checks that restricting the loaded game to the vertices reachable from vertex 0 keeps the winner of vertex 0,
+        on an example solved by hand and on random games.
+        """
+
+        # vertices 3 and 4 are not reachable from vertex 0, player 0 wins 0 and 1 and player 1 wins 2
+        arena = gpg2arena(self.arena_path + "arenas/gpg/example_8.gpg", prune_unreachable=True)
+        self.assertEqual(set(arena.vertices), {0, 1, 2})
+        winning_region_player0, winning_region_player1 = generalized_recursive(arena)
+        self.assertEqual((set(winning_region_player0), set(winning_region_player1)), ({0, 1}, {2}))
+
+        rng = random.Random(0)
+
+        for _ in range(20):
+            with random_gpg(rng, [[0, 1, 2, 3], [1, 2, 3, 4]], nbr_vertices=rng.randint(4, 20)) as path:
+                arena = gpg2arena(path)
+                pruned_arena = gpg2arena(path, prune_unreachable=True)
+                self.assertTrue(set(pruned_arena.vertices) <= set(arena.vertices))
+                self.assertTrue(all(set(pruned_arena.successors[vertex]) == set(arena.successors[vertex])
+                                    for vertex in pruned_arena.vertices))
+                winning_region_player0, _ = generalized_recursive(arena)
+                pruned_winning_region_player0, _ = generalized_recursive(pruned_arena)
+                self.assertEqual(0 in pruned_winning_region_player0, 0 in winning_region_player0)
+
+    def test_adaptive_schedule(self):
+        """
+        Checks that the algorithm whose calls to the partial solver follow an adaptive schedule gives the winning
+        regions of examples solved by hand and of the recursive algorithm on random games.
+        """
+
+        # examples solved by hand, with one or two priority functions, where the partial solver is called at every
+        # time or only once
+        examples = [("example_4_pg.gpg", {0, 1, 2, 3}, {4, 5, 6}), ("example_3.gpg", {0, 1}, {2, 3, 4}),
+                    ("example_4.gpg", {0, 1, 2, 4, 5}, {3})]
+        for share in [1.0, 1e-9]:
+            for name, expected_player0, expected_player1 in examples:
+                winning_region_player0, winning_region_player1 = generalized_recursive_with_buchi_multiple_calls(
+                    gpg2arena(self.arena_path + "arenas/gpg/" + name), schedule=AdaptiveSchedule(share))
+                self.assertEqual(set(winning_region_player0), expected_player0)
+                self.assertEqual(set(winning_region_player1), expected_player1)
+
+        rng = random.Random(0)
+
+        for share in [1.0, 1e-9]:
+            for _ in range(10):
+                functions_priorities = [list(range(rng.randint(2, 6))) for _ in range(rng.randint(1, 3))]
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(10, 30)) as path:
+                    winning_region_player0, winning_region_player1 = generalized_recursive(gpg2arena(path))
+                    scheduled_region_player0, scheduled_region_player1 = \
+                        generalized_recursive_with_buchi_multiple_calls(gpg2arena(path),
+                                                                        schedule=AdaptiveSchedule(share))
+                    self.assertEqual(set(scheduled_region_player0), set(winning_region_player0))
+                    self.assertEqual(set(scheduled_region_player1), set(winning_region_player1))
+
+    def test_subgame_cache(self):
+        """
+        Checks that the recursive algorithm and its combination with the partial solver in each recursive call, with a
+        cache of subgames, give the winning regions of an example solved by hand, and that they give the winning
+        regions of the recursive algorithm with a cache large or reduced to a single solution, on random games.
+        """
+
+        # the recursive algorithm meets one subgame of example 4 twice, which is solved by hand
+        path = self.arena_path + "arenas/gpg/example_4.gpg"
+        cache = SubgameCache(1000)
+        winning_region_player0, winning_region_player1 = generalized_recursive(gpg2arena(path), cache)
+        self.assertEqual((set(winning_region_player0), set(winning_region_player1)), ({0, 1, 2, 4, 5}, {3}))
+        self.assertEqual(cache.hits, 1)
+        cache = SubgameCache(1000)
+        winning_region_player0, winning_region_player1 = generalized_recursive_with_buchi_multiple_calls(
+            gpg2arena(path), schedule=NoCallSchedule(), cache=cache)
+        self.assertEqual((set(winning_region_player0), set(winning_region_player1)), ({0, 1, 2, 4, 5}, {3}))
+        self.assertEqual(cache.hits, 1)
+
+        rng = random.Random(0)
+        hits, multiple_calls_hits = 0, 0
+
+        for size in [1000, 1]:
+            for _ in range(10):
+                functions_priorities = [list(range(rng.randint(2, 6))) for _ in range(rng.randint(2, 3))]
+                with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(10, 30)) as path:
+                    winning_region_player0, winning_region_player1 = generalized_recursive(gpg2arena(path))
+                    cache = SubgameCache(size)
+                    cached_region_player0, cached_region_player1 = generalized_recursive(gpg2arena(path), cache)
+                    self.assertEqual(set(cached_region_player0), set(winning_region_player0))
+                    self.assertEqual(set(cached_region_player1), set(winning_region_player1))
+                    self.assertEqual(len(cached_region_player0) + len(cached_region_player1),
+                                     len(winning_region_player0) + len(winning_region_player1))
+                    hits += cache.hits
+                    cache = SubgameCache(size)
+                    # without the partial solver, the subgames met again are those of the recursive algorithm
+                    cached_region_player0, cached_region_player1 = generalized_recursive_with_buchi_multiple_calls(
+                        gpg2arena(path), schedule=NoCallSchedule(), cache=cache)
+                    self.assertEqual(set(cached_region_player0), set(winning_region_player0))
+                    self.assertEqual(set(cached_region_player1), set(winning_region_player1))
+                    self.assertEqual(len(cached_region_player0) + len(cached_region_player1),
+                                     len(winning_region_player0) + len(winning_region_player1))
+                    multiple_calls_hits += cache.hits
+
+        self.assertGreater(hits, 0)
+        self.assertGreater(multiple_calls_hits, 0)
+
+    def test_priority_promotion(self):
+        """
+        Checks the dominions found by the priority promotion algorithm on examples, one of them found after a
+        promotion, then checks that it gives the winning regions of the examples with a single priority function,
+        solved by hand, and those of the recursive algorithm on random games whose priorities have gaps.
+        """
+
+        file_path = self.arena_path + "arenas/gpg/example_3_pg.gpg"
+        arena = gpg2arena(file_path)
+
+        # a dominion is closed: the opponent cannot leave it and its winner can stay in it
+        dominion, player = search_dominion(arena)
+        self.assertFalse(is_open(arena, set(dominion), player))
+        self.assertTrue(all(successor in dominion for vertex in dominion if arena.player[vertex] != player
+                            for successor in arena.successors[vertex]))
+        self.assertTrue(set(dominion) <= set(recursive(gpg2arena(file_path))[player]))
+
+        # the region of priority 4 is open, the region {0} of priority 2 is closed in the rest of the game but player 1
+        # can escape from it to 1, so it is promoted to the priority 4 and {0, 1} is a dominion of player 0
+        arena = gpg2arena(self.arena_path + "arenas/gpg/example_7_pg.gpg")
+        dominion, player = search_dominion(arena)
+        self.assertEqual((set(dominion), player), ({0, 1}, 0))
+
+        examples = [("example_1_pg.gpg", {0, 1, 3, 5}, {2, 4}), ("example_2_pg.gpg", {0, 1, 2}, set()),
+                    ("example_3_pg.gpg", {0, 1, 2, 3}, set()), ("example_4_pg.gpg", {0, 1, 2, 3}, {4, 5, 6}),
+                    ("example_5_pg.gpg", {0, 1, 4}, {2, 3, 5}), ("example_6_pg.gpg", {0, 3, 5}, {1, 2, 4, 6, 7}),
+                    ("example_7_pg.gpg", {0, 1}, {2})]
+        for name, expected_player0, expected_player1 in examples:
+            promoted_region_player0, promoted_region_player1 = priority_promotion(
+                gpg2arena(self.arena_path + "arenas/gpg/" + name))
+            self.assertEqual((set(promoted_region_player0), set(promoted_region_player1)),
+                             (expected_player0, expected_player1))
+
+        rng = random.Random(0)
+
+        for _ in range(100):
+            functions_priorities = [rng.sample(range(12), rng.randint(1, 8))]
+            with random_gpg(rng, functions_priorities, nbr_vertices=rng.randint(3, 50)) as path:
+                winning_region_player0, winning_region_player1 = recursive(gpg2arena(path))
+                promoted_region_player0, promoted_region_player1 = priority_promotion(gpg2arena(path))
+                self.assertEqual(sorted(promoted_region_player0), sorted(winning_region_player0))
+                self.assertEqual(sorted(promoted_region_player1), sorted(winning_region_player1))
+
 
 if __name__ == '__main__':
     unittest.main()
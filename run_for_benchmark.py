@@ -1,24 +1,31 @@
+import random
 import sys
-
-import dd.cudd as _bdd
+import time
 
 import regular.gpg2arena as reg_gpg_loader
 import regular.generalizedRecursive as reg_gpg_recursive
-
+import regular.pg2arena as reg_pg_loader
+import regular.recursive as reg_pg_recursive
+import regular.priorityPromotion as reg_priority_promotion
+
+import bdd.pg2bdd as bdd_pg_loader
+import bdd.recursive as bdd_pg_recursive
+import bdd.nestedFixpoint as bdd_nested_fixpoint
+import bdd.quasiPolynomial as bdd_quasi_polynomial
 import bdd.gpg2bdd as bdd_gpg_loader
 import bdd.generalizedRecursive as bdd_gpg_recursive
 
-from bdd.dpa2bdd import get_product_automaton
-from bdd.dpa2gpg import symb_dpa2gpg
-from bdd.bdd_util import decomp_data_file
+from bdd.dpa2bdd import get_product_automaton, PRODUCT_ORDERS
+from bdd.dpa2gpg import declare_signals, symb_dpa2gpg
+from bdd.bdd_util import decomp_data_file, set_reordering_phase, create_manager, manager_config, memory_size
 
 
-# Increase the recursion limit to avoid error when we read a long label with explicit2symbolic_path
+# Increase the recursion limit for the recursive algorithms, whose depth grows with the number of priorities
 sys.setrecursionlimit(50000)
 
 
-def get_gpg_sizes_and_number_of_functions(gpg_path):
-    manager = _bdd.BDD()
+def get_gpg_sizes_and_number_of_functions(gpg_path, cudd_options=None):
+    manager = create_manager(**(cudd_options or {}))
     arena, _ = bdd_gpg_loader.gpg2bdd(gpg_path, manager)
     return len(manager), arena.nbr_vertices, arena.nbr_functions
 
@@ -75,7 +82,25 @@ def solve_gpg_regular_partial_multiple_calls(gpg_path):
     return player0_won, winning_0, winning_1
 
 
-def solve_gpg_bdd(gpg_path):
+def solve_gpg_regular_priority_promotion(gpg_path):
+    """
+    Load and solve the generalized parity game whose path is provided in parameter using the regular implementation of
+    the priority promotion algorithm. The priority functions are reduced first, the games that keep several functions
+    are not solved and the program exits with status 3, which benchmarks.sh reports as N/A.
+    """
+
+    arena = reg_gpg_loader.gpg2arena(gpg_path).reduce_dimensions()
+    if arena.nbr_functions > 1:
+        print("Priority promotion requires a single priority function", file=sys.stderr)
+        sys.exit(3)
+
+    winning_0, winning_1 = reg_priority_promotion.priority_promotion(arena)
+    player0_won = 0 in winning_0
+
+    return player0_won, winning_0, winning_1
+
+
+def solve_gpg_bdd(gpg_path, cudd_options=None):
     """
     Load and solve the generalized parity game whose path is provided in parameter using the bdd implementation of the
     recursive algorithm.
@@ -85,7 +110,7 @@ def solve_gpg_bdd(gpg_path):
 
     winning_0, winning_1 = None, None
 
-    manager = _bdd.BDD()
+    manager = create_manager(**(cudd_options or {}))
     arena, all_vertices = bdd_gpg_loader.gpg2bdd(gpg_path, manager)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(all_vertices[0]))
@@ -94,13 +119,13 @@ def solve_gpg_bdd(gpg_path):
     return player0_won, winning_0, winning_1
 
 
-def solve_gpg_bdd_partial(gpg_path):
+def solve_gpg_bdd_partial(gpg_path, cudd_options=None):
     """
     Load and solve the generalized parity game whose path is provided in parameter using the bdd implementation of the
     combination of the recursive algorithm and a partial solver. This implementation performs a single call to the
     partial solver before running the recursive algorithm.
     """
-    manager = _bdd.BDD()
+    manager = create_manager(**(cudd_options or {}))
     arena, all_vertices = bdd_gpg_loader.gpg2bdd(gpg_path, manager)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive_with_psolver(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(all_vertices[0]))
@@ -109,13 +134,13 @@ def solve_gpg_bdd_partial(gpg_path):
     return player0_won, winning_0, winning_1
 
 
-def solve_gpg_bdd_partial_multiple_calls(gpg_path):
+def solve_gpg_bdd_partial_multiple_calls(gpg_path, cudd_options=None):
     """
     Load and solve the generalized parity game whose path is provided in parameter using the bdd implementation of the
     combination of the recursive algorithm and a partial solver. This implementation performs a call to the partial
     sover in each recursive call.
     """
-    manager = _bdd.BDD()
+    manager = create_manager(**(cudd_options or {}))
     arena, all_vertices = bdd_gpg_loader.gpg2bdd(gpg_path, manager)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive_with_psolver_multiple_calls(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(all_vertices[0]))
@@ -124,29 +149,42 @@ def solve_gpg_bdd_partial_multiple_calls(gpg_path):
     return player0_won, winning_0, winning_1
 
 
-def construct_full_bdd_arena(data_path, dynamic_reordering=True, arbitrary_reordering=True):
+def construct_full_bdd_arena(data_path, dynamic_reordering=True, arbitrary_reordering=True, cudd_options=None,
+                             reordering_method="sift"):
     input_signals, output_signals, automata_paths = decomp_data_file(data_path)
 
-    manager = _bdd.BDD()
-    manager.declare(*input_signals, *output_signals)
+    manager = create_manager(**(cudd_options or {}))
+    signals = declare_signals(input_signals, output_signals, manager, grouped=True)
     manager.configure(reordering=dynamic_reordering)
 
+    # dynamic reordering is disabled while the game is solved
+    reordering_phases = ["load", "product", "arena"] if dynamic_reordering else None
+
     product = get_product_automaton(automata_paths, manager, arbitrary_reordering=arbitrary_reordering,
-                                    aps=input_signals + output_signals)
+                                    aps=signals, grouped=True, reordering_phases=reordering_phases,
+                                    reordering_method=reordering_method)
 
-    arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager)
+    set_reordering_phase("arena", manager, reordering_phases, reordering_method)
+
+    arena, init = symb_dpa2gpg(product, input_signals, output_signals, manager, grouped=True)
+
+    set_reordering_phase("solve", manager, reordering_phases, reordering_method)
 
     return manager, arena, init
 
 
-def get_gpg_full_bdd_sizes(data_path, dynamic_reordering=True, arbitrary_reordering=True):
-    manager, arena, _ = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering)
+def get_gpg_full_bdd_sizes(data_path, dynamic_reordering=True, arbitrary_reordering=True, cudd_options=None,
+                           reordering_method="sift"):
+    manager, arena, _ = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering,
+                                                 cudd_options, reordering_method)
 
     return len(manager), len(list(manager.pick_iter(arena.player0_vertices | arena.player1_vertices))), arena.nbr_functions
 
 
-def solve_gpg_full_bdd(data_path, dynamic_reordering=True, arbitrary_reordering=True):
-    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering)
+def solve_gpg_full_bdd(data_path, dynamic_reordering=True, arbitrary_reordering=True, cudd_options=None,
+                       reordering_method="sift"):
+    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering,
+                                                    cudd_options, reordering_method)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(init))
     player0_won = manager.let(vertex_0_dict_rep, winning_0) == manager.true
@@ -154,8 +192,10 @@ def solve_gpg_full_bdd(data_path, dynamic_reordering=True, arbitrary_reordering=
     return player0_won, winning_0, winning_1
 
 
-def solve_gpg_full_bdd_partial(data_path, dynamic_reordering=True, arbitrary_reordering=True):
-    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering)
+def solve_gpg_full_bdd_partial(data_path, dynamic_reordering=True, arbitrary_reordering=True, cudd_options=None,
+                               reordering_method="sift"):
+    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering,
+                                                    cudd_options, reordering_method)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive_with_psolver(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(init))
     player0_won = manager.let(vertex_0_dict_rep, winning_0) == manager.true
@@ -163,8 +203,10 @@ def solve_gpg_full_bdd_partial(data_path, dynamic_reordering=True, arbitrary_reo
     return player0_won, winning_0, winning_1
 
 
-def solve_gpg_full_bdd_partial_multiple_calls(data_path, dynamic_reordering=True, arbitrary_reordering=True):
-    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering)
+def solve_gpg_full_bdd_partial_multiple_calls(data_path, dynamic_reordering=True, arbitrary_reordering=True, cudd_options=None,
+                                              reordering_method="sift"):
+    manager, arena, init = construct_full_bdd_arena(data_path, dynamic_reordering, arbitrary_reordering,
+                                                    cudd_options, reordering_method)
     winning_0, winning_1 = bdd_gpg_recursive.generalized_recursive_with_psolver_multiple_calls(arena, manager)
     vertex_0_dict_rep = next(manager.pick_iter(init))
     player0_won = manager.let(vertex_0_dict_rep, winning_0) == manager.true
@@ -172,37 +214,229 @@ def solve_gpg_full_bdd_partial_multiple_calls(data_path, dynamic_reordering=True
     return player0_won, winning_0, winning_1
 
 
+def compare_variable_orders(path, cudd_options=None):
+    """
+    Build and solve the game whose path is provided in parameter with the BDD variables of each vertex interleaved with
+    their copies (x0, xb0, x1, xb1, ...) and with copies declared after every variable (x0, x1, ..., xb0, xb1, ...).
+    The path is either a parity game (.pg), a generalized parity game (.gpg) or a data.txt file for the full BDD
+    approach. Dynamic reordering is disabled so that both orders are kept during the whole computation. For each order,
+    the number of nodes of the edge relation, the number of nodes in the manager after the solving, the time needed to
+    build the arena and the time needed to solve it are returned.
+    """
+
+    results = []
+    for interleaved in [True, False]:
+        manager = create_manager(**(cudd_options or {}))
+        manager.configure(reordering=False)
+
+        start = time.perf_counter()
+        if path.endswith(".pg"):
+            arena, _ = bdd_pg_loader.pg2bdd(path, manager, is_gpg=False, interleaved=interleaved)
+        elif path.endswith(".gpg"):
+            arena, _ = bdd_gpg_loader.gpg2bdd(path, manager, interleaved=interleaved)
+        else:
+            input_signals, output_signals, automata_paths = decomp_data_file(path)
+            manager.declare(*input_signals, *output_signals)
+            product = get_product_automaton(automata_paths, manager, interleaved=interleaved)
+            arena, _ = symb_dpa2gpg(product, input_signals, output_signals, manager, interleaved=interleaved)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bdd_gpg_recursive.generalized_recursive(arena, manager)
+        solve_time = time.perf_counter() - start
+
+        results.append((len(arena.edges), len(manager), build_time, solve_time))
+
+    return results
+
+
+def compare_product_orders(data_path, cudd_options=None):
+    """
+    Compute the product of the automata of the full BDD approach whose data.txt path is provided in parameter with
+    every order of PRODUCT_ORDERS, without and with the restriction of intermediate products to reachable states.
+    Dynamic reordering is enabled while automata are loaded and multiplied. For each order, the largest number of nodes
+    of an intermediate transition relation (after the restriction), the number of nodes in the manager after the
+    product and the time needed to compute the product are returned.
+    """
+
+    results = []
+    for product_order in PRODUCT_ORDERS:
+        for prune_reachable in [False, True]:
+            input_signals, output_signals, automata_paths = decomp_data_file(data_path)
+            manager = create_manager(**(cudd_options or {}))
+            signals = declare_signals(input_signals, output_signals, manager, grouped=True)
+
+            stats = []
+            start = time.perf_counter()
+            product = get_product_automaton(automata_paths, manager, aps=signals, grouped=True,
+                                            product_order=product_order, prune_reachable=prune_reachable,
+                                            stats=stats)
+            product_time = time.perf_counter() - start
+
+            results.append((max([step[2] for step in stats], default=product.transitions.dag_size), len(manager),
+                            product_time))
+
+    return results
+
+
+# layer of the games written by write_layered_game: for each vertex, its priority in the layer, its player and its
+# successors as pairs (offset of the layer, vertex in the layer)
+LAYER = [(6, 0, [(-1, 2), (0, 3)]), (5, 0, [(-1, 0), (0, 3)]), (5, 0, [(1, 1), (0, 2)]), (2, 1, [(1, 0), (-1, 3)])]
+
+
+def write_layered_game(pg_path, nbr_layers):
+    """
+    Write a parity game in PGSolver format made of nbr_layers copies of LAYER, whose priorities are shifted by 8 in each
+    layer, to the path provided in parameter. The game has three priorities per layer, the successors outside the
+    layers are dropped and a vertex left without successors gets a self-loop. The number of attractors computed by the
+    recursive algorithm is about multiplied by three with each layer.
+    """
+
+    lines = ["parity " + str(len(LAYER) * nbr_layers - 1) + ";"]
+    for layer in range(nbr_layers):
+        for index, (priority, player, successors) in enumerate(LAYER):
+            vertex = len(LAYER) * layer + index
+            vertex_successors = sorted({len(LAYER) * (layer + offset) + successor for offset, successor in successors
+                                        if 0 <= layer + offset < nbr_layers}) or [vertex]
+            lines.append(str(vertex) + " " + str(8 * layer + priority) + " " + str(player) + " " +
+                         ",".join(str(successor) for successor in vertex_successors) + ' "' + str(vertex) + '";')
+
+    with open(pg_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def write_random_parity_game(pg_path, nbr_vertices, nbr_priorities, seed):
+    """
+    Write a random parity game in PGSolver format to the path provided in parameter. The priorities of the vertices are
+    taken from 0 to nbr_priorities - 1 and every vertex has one to three successors.
+    """
+
+    rng = random.Random(seed)
+    lines = ["parity " + str(nbr_vertices - 1) + ";"]
+    for vertex in range(nbr_vertices):
+        successors = rng.sample(range(nbr_vertices), rng.randint(1, min(3, nbr_vertices)))
+        lines.append(str(vertex) + " " + str(rng.randrange(nbr_priorities)) + " " + str(rng.randint(0, 1)) + " " +
+                     ",".join(str(successor) for successor in successors) + ' "' + str(vertex) + '";')
+
+    with open(pg_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def compare_parity_solvers(pg_path, cudd_options=None):
+    """
+    Solve the parity game whose path is provided in parameter with the bdd implementations of the recursive algorithm,
+    of the nested fixpoint and of the quasi-polynomial variant of the recursive algorithm, then with the regular
+    implementations of the recursive algorithm and of the priority promotion algorithm. The number of vertices and the
+    number of priorities of the game are returned, followed by the time needed by each solver.
+    """
+
+    results = []
+    for solver in [bdd_pg_recursive.recursive, bdd_nested_fixpoint.nested_fixpoint,
+                   bdd_quasi_polynomial.quasi_polynomial]:
+        manager = create_manager(**(cudd_options or {}))
+        arena, all_vertices = bdd_pg_loader.pg2bdd(pg_path, manager, is_gpg=False)
+        if not results:
+            results = [len(all_vertices), len(arena.priorities[0])]
+
+        start = time.perf_counter()
+        solver(arena, manager)
+        results.append(time.perf_counter() - start)
+
+    for solver in [reg_pg_recursive.recursive, reg_priority_promotion.priority_promotion]:
+        arena = reg_pg_loader.pg2arena(pg_path, is_gpg=False)
+
+        start = time.perf_counter()
+        solver(arena)
+        results.append(time.perf_counter() - start)
+
+    return results
+
+
+def parse_cudd_options(arguments):
+    """
+    Parse the parameters of the BDD manager given as arguments key=value, where key is memory_estimate,
+    initial_cache_size, reordering_method or a parameter of dd.cudd.BDD.configure. Memory sizes accept the suffixes K,
+    M and G. Returns the parameters given to create_manager and the reordering method.
+    """
+
+    cudd_options = {}
+    reordering_method = "sift"
+    for argument in arguments:
+        key, value = argument.split("=", 1)
+        if key == "reordering_method":
+            reordering_method = value
+        elif key in ["memory_estimate", "max_memory"]:
+            cudd_options[key] = memory_size(value)
+        elif key == "max_growth":
+            cudd_options[key] = float(value)
+        elif key in ["reordering", "garbage_collection"]:
+            cudd_options[key] = value == "True"
+        else:
+            cudd_options[key] = int(value)
+
+    return cudd_options, reordering_method
+
+
 if __name__ == "__main__":
     mode = sys.argv[1]
     path = sys.argv[2]
-    fbdd_dynamic_reordering = len(sys.argv) > 3 and sys.argv[3] == "True"
-    fbdd_arbitrary_reordering = len(sys.argv) > 4 and sys.argv[4] == "True"
+    # arguments key=value are parameters of the BDD manager, they can follow the optional reordering flags
+    flags = [argument for argument in sys.argv[3:] if "=" not in argument]
+    cudd_options, reordering_method = parse_cudd_options([argument for argument in sys.argv[3:] if "=" in argument])
+    fbdd_dynamic_reordering = len(flags) > 0 and flags[0] == "True"
+    fbdd_arbitrary_reordering = len(flags) > 1 and flags[1] == "True"
+
+    # the effective configuration of the manager is recorded with the result
+    with open("/tmp/cudd_config", "w") as f:
+        f.write(manager_config(create_manager(**cudd_options), reordering_method) + "\n")
 
     if mode == "gpgSizeFunc":
-        bdd_size, game_size, n_func = get_gpg_sizes_and_number_of_functions(path)
+        bdd_size, game_size, n_func = get_gpg_sizes_and_number_of_functions(path, cudd_options)
         with open("/tmp/out", "w") as f:
             f.write(str(bdd_size) + "\n" + str(game_size) + "\n" + str(n_func) + "\n")
     elif mode == "fbddSizes":
-        bdd_size, game_size, n_func = get_gpg_full_bdd_sizes(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering)
+        bdd_size, game_size, n_func = get_gpg_full_bdd_sizes(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering,
+                                                           cudd_options, reordering_method)
         with open("/tmp/out", "w") as f:
             f.write(str(bdd_size) + "\n" + str(game_size) + "\n" + str(n_func) + "\n")
+    elif mode == "orders":
+        with open("/tmp/out", "w") as f:
+            for edges_size, bdd_size, build_time, solve_time in compare_variable_orders(path, cudd_options):
+                f.write(str(edges_size) + "\n" + str(bdd_size) + "\n" + str(build_time) + "\n" + str(solve_time) + "\n")
+    elif mode == "products":
+        with open("/tmp/out", "w") as f:
+            for edges_size, bdd_size, product_time in compare_product_orders(path, cudd_options):
+                f.write(str(edges_size) + "\n" + str(bdd_size) + "\n" + str(product_time) + "\n")
+    elif mode == "layered":
+        write_layered_game(path, int(flags[0]))
+    elif mode == "randomParity":
+        write_random_parity_game(path, int(flags[0]), int(flags[1]), int(flags[2]))
+    elif mode == "parity":
+        with open("/tmp/out", "w") as f:
+            for result in compare_parity_solvers(path, cudd_options):
+                f.write(str(result) + "\n")
     elif mode == "reg":
         solve_gpg_regular(path)
     elif mode == "regPa":
         solve_gpg_regular_partial(path)
     elif mode == "regPaMu":
         solve_gpg_regular_partial_multiple_calls(path)
+    elif mode == "regPp":
+        solve_gpg_regular_priority_promotion(path)
     elif mode == "bdd":
-        solve_gpg_bdd(path)
+        solve_gpg_bdd(path, cudd_options)
     elif mode == "bddPa":
-        solve_gpg_bdd_partial(path)
+        solve_gpg_bdd_partial(path, cudd_options)
     elif mode == "bddPaMu":
-        solve_gpg_bdd_partial_multiple_calls(path)
+        solve_gpg_bdd_partial_multiple_calls(path, cudd_options)
     elif mode == "fbdd":
-        solve_gpg_full_bdd(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering)
+        solve_gpg_full_bdd(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering, cudd_options,
+                           reordering_method)
     elif mode == "fbddPa":
-        solve_gpg_full_bdd_partial(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering)
+        solve_gpg_full_bdd_partial(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering, cudd_options,
+                                   reordering_method)
     elif mode == "fbddPaMu":
-        solve_gpg_full_bdd_partial_multiple_calls(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering)
+        solve_gpg_full_bdd_partial_multiple_calls(path, fbdd_dynamic_reordering, fbdd_arbitrary_reordering,
+                                                  cudd_options, reordering_method)
     else:
         raise Exception("Invalid mode " + mode)
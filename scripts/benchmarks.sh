@@ -15,9 +15,13 @@ function get_time {
 
 all_example_files="tlsf2gpg/examples/*.tlsf"
 
-modes_gpg=(reg regPa regPaMu bdd bddPa bddPaMu)
+modes_gpg=(reg regPa regPaMu regPp bdd bddPa bddPaMu)
 modes_without_gpg=(fbdd fbddPa fbddPaMu)
 
+# Parameters of the BDD manager given to run_for_benchmark.py as key=value, e.g. for a 64 GB node
+# cudd_options=(memory_estimate=48G max_memory=56G initial_cache_size=16777216 reordering_method=sift-converge)
+cudd_options=()
+
 max_minutes=10
 time_limit=$((${max_minutes} * 60))
 
@@ -31,6 +35,7 @@ echo \
     "REG TIME, " \
     "REG PA TIME, " \
     "REG PA MU TIME, " \
+    "REG PP TIME, " \
     "BDD TIME, " \
     "BDD PA TIME, " \
     "BDD PA MU TIME, " \
@@ -41,6 +46,7 @@ echo \
     "FULL BDD TIME, " \
     "FULL BDD PA TIME, " \
     "FULL BDD PA MU TIME, " \
+    "CUDD CONFIG, " \
     > ${output}
 
 for example in $all_example_files; do
@@ -52,7 +58,7 @@ for example in $all_example_files; do
     if [ -s ${gpg_path} ]; then
         # The file is not empty, i.e., the game was generated in time
         # We retrieve the size of the game and the number of functions
-        timeout -k 10 ${time_limit} python3 run_for_benchmark.py "gpgSizeFunc" $gpg_path
+        timeout -k 10 ${time_limit} python3 run_for_benchmark.py "gpgSizeFunc" $gpg_path ${cudd_options[@]}
         while read -r line; do
             echo -n "${line}, " >> ${output}
         done < "/tmp/out"
@@ -60,11 +66,16 @@ for example in $all_example_files; do
         # We execute every algorithm one by one
         for mode in ${modes_gpg[@]}; do
             echo "    ${mode}"
-            { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py $mode $gpg_path ; } 2> /tmp/time
+            { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py $mode $gpg_path ${cudd_options[@]} ; } 2> /tmp/time
 
             timedout=$?
             if [ $timedout -eq 124 ]; then
                 echo -n "TIMEOUT, " >> ${output}
+            elif [ $timedout -eq 3 ]; then
+                # The algorithm does not apply to the game, e.g. priority promotion with several priority functions
+                echo -n "N/A, " >> ${output}
+            elif [ $timedout -ne 0 ]; then
+                echo -n "ERROR, " >> ${output}
             else
                 cpu_time=$(get_time)
                 echo -n "${cpu_time}, " >> ${output}
@@ -90,7 +101,7 @@ for example in $all_example_files; do
 
     else
         echo "    Constructing BDD game"
-        { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py "fbddSizes" $fbdd_example ; } 2> /tmp/time
+        { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py "fbddSizes" $fbdd_example ${cudd_options[@]} ; } 2> /tmp/time
         timedout=$?
         # 124 means timeout
         if [ ${timedout} -eq 124 ]; then
@@ -110,7 +121,7 @@ for example in $all_example_files; do
 
             for mode in ${modes_without_gpg[@]}; do
                 echo "    $mode"
-                { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py $mode $fbdd_example ; } 2> /tmp/time
+                { time timeout -k 10 ${time_limit} python3 run_for_benchmark.py $mode $fbdd_example ${cudd_options[@]} ; } 2> /tmp/time
                 timedout=$?
                 if [ $timedout -eq 124 ]; then
                     echo -n "TIMEOUT, " >> ${output}
@@ -121,5 +132,7 @@ for example in $all_example_files; do
             done
         fi
     fi
+    # The effective configuration of the BDD manager
+    echo -n "$(cat /tmp/cudd_config 2> /dev/null), " >> ${output}
     echo "" >> ${output}
 done
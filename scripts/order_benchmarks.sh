@@ -0,0 +1,31 @@
+#!/bin/bash
+
+# Compare the interleaved order of BDD variables (x0, xb0, x1, xb1, ...) with the order where copies are declared after
+# every variable (x0, x1, ..., xb0, xb1, ...) on the bundled arenas. Dynamic reordering is disabled. Times are wall
+# clock times in seconds measured by run_for_benchmark.py.
+
+all_example_files="arenas/pg/*.pg arenas/gpg/*.gpg arenas/automata/*/data.txt"
+
+output="variable-orders.csv"
+
+echo \
+    "FILE, " \
+    "INTERLEAVED EDGES SIZE, " \
+    "INTERLEAVED BDD SIZE, " \
+    "INTERLEAVED BUILD TIME, " \
+    "INTERLEAVED SOLVE TIME, " \
+    "SEPARATED EDGES SIZE, " \
+    "SEPARATED BDD SIZE, " \
+    "SEPARATED BUILD TIME, " \
+    "SEPARATED SOLVE TIME, " \
+    > ${output}
+
+for example in $all_example_files; do
+    echo $example
+    echo -n "$example, " >> ${output}
+    python3 run_for_benchmark.py "orders" $example
+    while read -r line; do
+        echo -n "${line}, " >> ${output}
+    done < "/tmp/out"
+    echo "" >> ${output}
+done
@@ -0,0 +1,55 @@
+#!/bin/bash
+
+# Compare the symbolic recursive algorithm, the nested fixpoint, the quasi-polynomial variant of the recursive algorithm
+# and the explicit recursive and priority promotion algorithms on parity games with many priorities: the layered games
+# of run_for_benchmark.py, on which the recursive algorithm is exponential in the number of layers, and random games
+# whose number of priorities grows with their number of vertices. Times are wall clock times in seconds measured by
+# run_for_benchmark.py, a game whose solvers take more than time_limit seconds in total is marked TIMEOUT, and a game
+# whose solvers fail is marked ERROR.
+
+max_layers=12
+random_sizes="50 100 200 400"
+time_limit=600
+
+game="/tmp/priority_benchmark.pg"
+output="parity-solvers.csv"
+
+echo \
+    "GAME, " \
+    "VERTICES, " \
+    "PRIORITIES, " \
+    "RECURSIVE TIME, " \
+    "FIXPOINT TIME, " \
+    "QUASI-POLYNOMIAL TIME, " \
+    "REG TIME, " \
+    "REG PP TIME, " \
+    > ${output}
+
+run() {
+    echo $1
+    echo -n "$1, " >> ${output}
+    timeout ${time_limit} python3 run_for_benchmark.py "parity" ${game}
+    status=$?
+    if [ ${status} -eq 0 ]; then
+        while read -r line; do
+            echo -n "${line}, " >> ${output}
+        done < "/tmp/out"
+    elif [ ${status} -eq 124 ]; then
+        echo -n "TIMEOUT, " >> ${output}
+    else
+        echo -n "ERROR, " >> ${output}
+    fi
+    echo "" >> ${output}
+}
+
+for layers in $(seq 1 ${max_layers}); do
+    python3 run_for_benchmark.py "layered" ${game} ${layers}
+    run "layered-${layers}"
+done
+
+for size in ${random_sizes}; do
+    for priorities in $((size / 10)) $((size / 2)) ${size}; do
+        python3 run_for_benchmark.py "randomParity" ${game} ${size} ${priorities} 0
+        run "random-${size}-${priorities}"
+    done
+done
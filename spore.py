@@ -17,14 +17,21 @@
 
 import argparse
 import sys
-
-import dd.cudd as _bdd
+from functools import partial
 
 import bdd.recursive
+import bdd.buchiGames
+import bdd.localSolver
+import bdd.nestedFixpoint
 import bdd.pg2bdd
+import bdd.quasiPolynomial
+import bdd.scc
 
 import regular.recursive
+import regular.buchiGames
+import regular.localSolver
 import regular.pg2arena
+import regular.priorityPromotion
 
 import bdd.generalizedRecursive
 import bdd.gpg2bdd as bdd_gen_loader
@@ -32,11 +39,15 @@ import bdd.gpg2bdd as bdd_gen_loader
 import regular.generalizedRecursive
 import regular.gpg2arena as reg_gen_loader
 
-from bdd.bdd_util import decomp_data_file
-from bdd.dpa2bdd import get_product_automaton
-from bdd.dpa2gpg import symb_dpa2gpg
+from bdd.bdd_cache import BDDCache, content_key
+from bdd.bdd_util import decomp_data_file, set_reordering_phase, create_manager, memory_size, REORDERING_METHODS
+from bdd.dpa2bdd import get_product_automaton, unique_automata, PRODUCT_ORDERS
+from bdd.dpa2gpg import declare_signals, symb_dpa2gpg, symb_dpa2onestep
+from bdd.early import UnrealizabilityCheck
+from common.schedule import AdaptiveSchedule
+from common.subgame_cache import SubgameCache
 
-# Increase the recursion limit to avoid error when we read a long label with explicit2symbolic_path
+# Increase the recursion limit for the recursive algorithms, whose depth grows with the number of priorities
 sys.setrecursionlimit(50000)
 
 if __name__ == '__main__':
@@ -64,10 +75,32 @@ if __name__ == '__main__':
                               help='Perform a single call to the partial solver '
                                    'and solve the remaining arena using the recursive algorithm.')
 
+    solver_group.add_argument('-adp',
+                              action='store_true',
+                              help='Use the combination of the recursive algorithm with a partial solver, but only '
+                                   'call the partial solver at the levels of recursion where it removes vertices '
+                                   'quickly enough, and within a share of the solving time (see -psshare).')
+
     solver_group.add_argument('-rec',
                               action='store_true',
                               help='Use the recursive algorithm.')
 
+    solver_group.add_argument('-pp',
+                              action='store_true',
+                              help='With -reg only, for games with a single priority function, use the priority '
+                                   'promotion algorithm.')
+
+    solver_group.add_argument('-fix',
+                              action='store_true',
+                              help='With -bdd or -fbdd only, evaluate the nested fixpoint formula of the winning '
+                                   'condition with controllable predecessors, warm starting the inner fixpoints.')
+
+    solver_group.add_argument('-qpz',
+                              action='store_true',
+                              help='With -bdd or -fbdd only, for games with a single priority function, use the '
+                                   'quasi-polynomial variant of the recursive algorithm, which solves the subgames '
+                                   'with bounds on the size of the dominions it looks for.')
+
     bdd_group = parser.add_mutually_exclusive_group(required=False)
 
     bdd_group.add_argument('-bdd',
@@ -89,6 +122,20 @@ if __name__ == '__main__':
                         action='store_true',
                         help='With -fbdd only, use the dynamic ordering available in dd with CUDD as backend.')
 
+    parser.add_argument('-ordphases',
+                        type=str,
+                        default='load,product,arena',
+                        help='With -dynord only, comma-separated list of the phases during which dynamic ordering is '
+                             'enabled: translation of automata (load), computation of the product automaton (product), '
+                             'construction of the arena (arena) and solving of the game (solve). '
+                             'Default to load,product,arena.')
+
+    parser.add_argument('-nogrp',
+                        action='store_true',
+                        help='With -fbdd only, do not register variable groups, for each state variable and its copy '
+                             'and for input and output atomic propositions, that are kept together by the dynamic '
+                             'ordering.')
+
     parser.add_argument('-arbord',
                         action='store_true',
                         help='With -fbdd only, enable an arbitrary ordering of the BDD just'
@@ -105,6 +152,152 @@ if __name__ == '__main__':
                         help='With -fbdd only, do not remap the BDD variables of automata when the product'
                              'is computed but instead, each automaton is created with new variables.')
 
+    parser.add_argument('-prodord',
+                        choices=PRODUCT_ORDERS,
+                        default='sequential',
+                        help='With -fbdd only, order in which the automata are multiplied: from left to right '
+                             '(sequential), smallest transition relations first (smallest), automata that share the '
+                             'most atomic propositions first (overlap) or in a balanced binary tree (balanced). '
+                             'Default to sequential.')
+
+    parser.add_argument('-prunereach',
+                        action='store_true',
+                        help='With -fbdd, restrict each intermediate product of automata to the states reachable '
+                             'from its initial state. With -bdd or -reg, restrict the loaded game to the vertices '
+                             'reachable from vertex 0.')
+
+    parser.add_argument('-reenc',
+                        action='store_true',
+                        help='With -fbdd only, re-encode the reachable states of the product of automata with fewer '
+                             'state variables.')
+
+    parser.add_argument('-bisim',
+                        action='store_true',
+                        help='With -fbdd only, merge the bisimilar states of each automaton and of each intermediate '
+                             'product of automata.')
+
+    parser.add_argument('-onestep',
+                        action='store_true',
+                        help='With -fbdd only, build a game in which each round is a single transition of the product '
+                             'automaton, without copies of the inputs, and compute controllable predecessors for a '
+                             'whole round.')
+
+    parser.add_argument('-cache',
+                        metavar='DIR',
+                        help='With -fbdd only, directory of a cache of the automata and of the arena, identified by '
+                             'the content of their files and by the options that change them. They are loaded from '
+                             'the cache when they are in it and stored in it otherwise.')
+
+    parser.add_argument('-early',
+                        action='store_true',
+                        help='With -fbdd only, solve the game of each automaton and of each intermediate product while '
+                             'the product is built, with the partial solver first, and stop as soon as one of them is '
+                             'lost by the system since the specification is then unrealizable.')
+
+    parser.add_argument('-safety',
+                        action='store_true',
+                        help='With -fbdd only, remove the safety and co-safety dimensions of the product of automata '
+                             'and give their rejecting states the greatest odd priority of another dimension, so that '
+                             'the game has fewer priority functions.')
+
+    parser.add_argument('-reddim',
+                        action='store_true',
+                        help='With -gpg only, compress the priorities of each priority function and remove the '
+                             'functions that are trivial or dominated by another one. With -fbdd, automata whose '
+                             'files have the same content are also used once in the product.')
+
+    parser.add_argument('-buchi',
+                        action='store_true',
+                        help='Solve the games whose priority functions are Buchi or co-Buchi objectives (at most two '
+                             'priorities up to compression) with a nested fixpoint instead of the selected algorithm.')
+
+    parser.add_argument('-onlyinit',
+                        action='store_true',
+                        help='Only decide the winner of the initial vertex: restrict the game to the vertices '
+                             'reachable from it, remove the vertices won with a self-loop and the regions of the '
+                             'partial solver, which stops as soon as the initial vertex is in one of them, and solve '
+                             'the remaining game only if the initial vertex is still undecided. The recursive '
+                             'algorithms (-rec, -snl, -adp, -par) also stop as soon as the initial vertex is in a '
+                             'region they remove, and restrict the rest of the game to the vertices reachable from '
+                             'it, except with -scc.')
+
+    parser.add_argument('-scc',
+                        action='store_true',
+                        help='With -bdd or -fbdd, solve the strongly connected components of the game bottom-up with '
+                             'the selected algorithm, and remove the attractors of their winning regions from the rest '
+                             'of the game.')
+
+    parser.add_argument('-psshare',
+                        type=float,
+                        default=0.5,
+                        metavar='SHARE',
+                        help='With -adp only, maximal share of the solving time spent in the partial solver, between 0 '
+                             'and 1. Default to 0.5.')
+
+    parser.add_argument('-memo',
+                        type=int,
+                        metavar='SIZE',
+                        help='With -gpg and -rec, -snl, -par or -adp only, cache the solutions of at most SIZE '
+                             'subgames met by the generalized recursive algorithm, evicting the least recently used '
+                             'one, and print the hit rate of the cache on the standard error.')
+
+    parser.add_argument('-sepord',
+                        action='store_true',
+                        help='With -bdd or -fbdd, declare the BDD variables of vertices before all their copies used '
+                             'for successors instead of interleaving each variable with its copy.')
+
+    cudd_group = parser.add_argument_group('CUDD options', 'Parameters of the BDD manager, with -bdd or -fbdd only. '
+                                                           'Parameters that are not given keep the default value '
+                                                           'of CUDD.')
+
+    cudd_group.add_argument('-memest',
+                            type=memory_size,
+                            help='Memory that the manager is expected to use, in bytes or with a suffix K, M or G '
+                                 '(e.g. 48G), used to size the unique table and the computed table.')
+
+    cudd_group.add_argument('-cachesize',
+                            type=int,
+                            help='Initial number of entries of the computed table (cache).')
+
+    cudd_group.add_argument('-maxcache',
+                            type=int,
+                            help='Maximal number of entries of the computed table (cache).')
+
+    cudd_group.add_argument('-maxmem',
+                            type=memory_size,
+                            help='Maximal memory used by the manager, in bytes or with a suffix K, M or G.')
+
+    cudd_group.add_argument('-looseupto',
+                            type=int,
+                            help='Size of the unique table up to which it grows without garbage collection.')
+
+    cudd_group.add_argument('-minhit',
+                            type=int,
+                            help='Hit rate (in percent) of the computed table above which it is resized.')
+
+    cudd_group.add_argument('-nogc',
+                            action='store_true',
+                            help='Disable the garbage collection of dead nodes.')
+
+    cudd_group.add_argument('-ordmethod',
+                            choices=REORDERING_METHODS,
+                            default='sift',
+                            help='With -dynord only, reordering method: group sifting (sift) or group sifting '
+                                 'repeated until convergence at the end of each reordering phase (sift-converge). '
+                                 'Default to sift.')
+
+    cudd_group.add_argument('-maxgrowth',
+                            type=float,
+                            help='Maximal growth factor of the number of nodes allowed while a variable is sifted.')
+
+    cudd_group.add_argument('-maxswaps',
+                            type=int,
+                            help='Maximal number of swaps of adjacent variables during a reordering.')
+
+    cudd_group.add_argument('-maxvars',
+                            type=int,
+                            help='Maximal number of variables sifted during a reordering.')
+
     parser.add_argument('input_path', type=str, help='The path to the file containing the game in '
                                                      '(extended) PGSolver format or the path to the file containing'
                                                      'the path to the automatas for -fbdd.')
@@ -112,45 +305,154 @@ if __name__ == '__main__':
     args = parser.parse_args()
 
     # Checking if some options of -fbdd are used without -fbdd
-    if (args.dynord or args.arbord or args.rstredge) and not args.fbdd:
-        parser.error("-dynord, -arbord and -rstredge require -fbdd.")
+    if (args.dynord or args.arbord or args.rstredge or args.nogrp or args.prodord != 'sequential' or
+            args.reenc or args.bisim or args.onestep or args.cache or args.early or
+            args.safety) and \
+            not args.fbdd:
+        parser.error("-dynord, -arbord, -rstredge, -nogrp, -prodord, -reenc, -bisim, -onestep, -cache, -early and "
+                     "-safety require -fbdd.")
+
+    if any(phase not in ['load', 'product', 'arena', 'solve'] for phase in args.ordphases.split(',')):
+        parser.error("-ordphases must be a comma-separated list of phases among load, product, arena and solve.")
+
+    if args.reddim and not args.gpg:
+        parser.error("-reddim requires -gpg.")
+
+    if args.sepord and args.reg:
+        parser.error("-sepord requires -bdd or -fbdd.")
+
+    if args.scc and args.reg:
+        parser.error("-scc requires -bdd or -fbdd.")
+
+    if args.fix and args.reg:
+        parser.error("-fix requires -bdd or -fbdd.")
+
+    if args.qpz and args.reg:
+        parser.error("-qpz requires -bdd or -fbdd.")
+
+    if args.pp and not args.reg:
+        parser.error("-pp requires -reg.")
+
+    if args.psshare != 0.5 and not args.adp:
+        parser.error("-psshare requires -adp.")
+
+    if not 0 < args.psshare <= 1:
+        parser.error("-psshare must be greater than 0 and at most 1.")
+
+    if args.memo is not None and (not args.gpg or args.pp or args.fix or args.qpz):
+        parser.error("-memo requires -gpg and -rec, -snl, -par or -adp.")
+
+    if args.memo is not None and args.memo < 1:
+        parser.error("-memo must be at least 1.")
+
+    # with -memo, the generalized recursive algorithm looks up the solutions of the subgames in a cache
+    memo = SubgameCache(args.memo) if args.memo is not None else None
+
+    # with -scc, the symbolic algorithms solve the strongly connected components of the game one by one
+    decompose = bdd.scc.scc_decomposition if args.scc else (lambda solver: solver)
+
+    # Parameters of the BDD manager, the memory estimate and the size of the cache are given to its constructor
+    cudd_options = {'memory_estimate': args.memest,
+                    'initial_cache_size': args.cachesize,
+                    'max_cache_hard': args.maxcache,
+                    'max_memory': args.maxmem,
+                    'loose_up_to': args.looseupto,
+                    'min_hit': args.minhit,
+                    'garbage_collection': False if args.nogc else None,
+                    'max_growth': args.maxgrowth,
+                    'max_swaps': args.maxswaps,
+                    'max_vars': args.maxvars}
+
+    if args.reg and any(value is not None for value in cudd_options.values()):
+        parser.error("CUDD options require -bdd or -fbdd.")
+
+    if args.ordmethod != 'sift' and not args.dynord:
+        parser.error("-ordmethod requires -dynord.")
 
     if args.pg:
 
         if args.reg:
 
-            arena = regular.pg2arena.pg2arena(args.input_path, is_gpg=False)
+            arena = regular.pg2arena.pg2arena(args.input_path, is_gpg=False, prune_unreachable=args.prunereach)
 
-            if args.rec:
+            solution = None
+            if args.onlyinit:
+                arena, solution = regular.localSolver.local_prepass(arena, 0)
+            if solution is None and args.buchi:
+                solution = regular.buchiGames.buchi_fast_path(arena)
+
+            # with -onlyinit, the recursive algorithms stop as soon as the winner of vertex 0 is known
+            local = {'init': 0} if args.onlyinit else {}
+
+            if solution is not None:
+                winning_region_player0, winning_region_player1 = solution
+
+            elif args.rec:
                 winning_region_player0, winning_region_player1 = \
-                    regular.recursive.recursive(arena)
+                    regular.recursive.recursive(arena, **local)
+
+            elif args.pp:
+                winning_region_player0, winning_region_player1 = \
+                    regular.priorityPromotion.priority_promotion(arena)
 
             elif args.snl:
                 winning_region_player0, winning_region_player1 = \
-                    regular.recursive.recursive_single_call(arena)
+                    regular.recursive.recursive_single_call(arena, **local)
+
+            elif args.adp:
+                winning_region_player0, winning_region_player1 = \
+                    regular.recursive.recursive_with_buchi(arena, schedule=AdaptiveSchedule(args.psshare), **local)
 
             else:
                 winning_region_player0, winning_region_player1 = \
-                    regular.recursive.recursive_with_buchi(arena)
+                    regular.recursive.recursive_with_buchi(arena, **local)
 
             vertex_0_won_by_player0 = 0 in winning_region_player0
 
         else:  # if args.bdd or default
 
-            manager = _bdd.BDD()
-            arena, all_vertices = bdd.pg2bdd.pg2bdd(args.input_path, manager, is_gpg=False)
+            manager = create_manager(**cudd_options)
+            arena, all_vertices = bdd.pg2bdd.pg2bdd(args.input_path, manager, is_gpg=False,
+                                                      interleaved=not args.sepord,
+                                                      prune_unreachable=args.prunereach)
+
+            solution = None
+            if args.onlyinit:
+                arena, solution = bdd.localSolver.local_prepass(arena, all_vertices[0], manager)
+            if solution is None and args.buchi:
+                solution = bdd.buchiGames.buchi_fast_path(arena, manager)
 
-            if args.rec:
+            # with -onlyinit, the recursive algorithms stop as soon as the winner of the initial vertex is known, except
+            # with -scc which solves each component without it
+            local = {'init': all_vertices[0]} if args.onlyinit and not args.scc else {}
+
+            if solution is not None:
+                winning_region_player0, winning_region_player1 = solution
+
+            elif args.rec:
                 winning_region_player0, winning_region_player1 = \
-                    bdd.recursive.recursive(arena, manager)
+                    decompose(partial(bdd.recursive.recursive, **local))(arena, manager)
+
+            elif args.fix:
+                winning_region_player0, winning_region_player1 = \
+                    decompose(bdd.nestedFixpoint.nested_fixpoint)(arena, manager)
+
+            elif args.qpz:
+                winning_region_player0, winning_region_player1 = \
+                    decompose(bdd.quasiPolynomial.quasi_polynomial)(arena, manager)
 
             elif args.snl:
                 winning_region_player0, winning_region_player1 = \
-                    bdd.recursive.recursive_single_call(arena, manager)
+                    decompose(partial(bdd.recursive.recursive_single_call, **local))(arena, manager)
+
+            elif args.adp:
+                schedule = AdaptiveSchedule(args.psshare)
+                winning_region_player0, winning_region_player1 = \
+                    decompose(partial(bdd.recursive.recursive_with_buchi, schedule=schedule, **local))(arena, manager)
 
             else:
                 winning_region_player0, winning_region_player1 = \
-                    bdd.recursive.recursive_with_buchi(arena, manager)
+                    decompose(partial(bdd.recursive.recursive_with_buchi, **local))(arena, manager)
 
             vertex_0_dict_rep = next(manager.pick_iter(all_vertices[0]))
             vertex_0_won_by_player0 = manager.let(vertex_0_dict_rep, winning_region_player0) == manager.true
@@ -159,83 +461,236 @@ if __name__ == '__main__':
 
         if args.reg:
 
-            arena = reg_gen_loader.gpg2arena(args.input_path)
+            arena = reg_gen_loader.gpg2arena(args.input_path, prune_unreachable=args.prunereach)
+
+            if args.reddim:
+                arena = arena.reduce_dimensions()
+
+            solution = None
+            if args.onlyinit:
+                arena, solution = regular.localSolver.local_prepass(arena, 0)
+            if solution is None and args.buchi:
+                solution = regular.buchiGames.buchi_fast_path(arena)
 
-            if args.rec:
+            # with -onlyinit, the recursive algorithms stop as soon as the winner of vertex 0 is known
+            local = {'init': 0} if args.onlyinit else {}
+
+            if solution is not None:
+                winning_region_player0, winning_region_player1 = solution
+
+            elif args.rec:
                 winning_region_player0, winning_region_player1 = \
-                    regular.generalizedRecursive.generalized_recursive(arena)
+                    regular.generalizedRecursive.generalized_recursive(arena, cache=memo, **local)
+
+            elif args.pp:
+                if arena.nbr_functions > 1:
+                    parser.error("-pp requires a game with a single priority function.")
+                winning_region_player0, winning_region_player1 = \
+                    regular.priorityPromotion.priority_promotion(arena)
 
             elif args.snl:
                 winning_region_player0, winning_region_player1 = \
-                    regular.generalizedRecursive.generalized_recursive_with_buchi(arena)
+                    regular.generalizedRecursive.generalized_recursive_with_buchi(arena, cache=memo, **local)
+
+            elif args.adp:
+                winning_region_player0, winning_region_player1 = \
+                    regular.generalizedRecursive.generalized_recursive_with_buchi_multiple_calls(
+                        arena, schedule=AdaptiveSchedule(args.psshare), cache=memo, **local)
 
             else:
                 winning_region_player0, winning_region_player1 = \
-                    regular.generalizedRecursive.generalized_recursive_with_buchi_multiple_calls(arena)
+                    regular.generalizedRecursive.generalized_recursive_with_buchi_multiple_calls(arena, cache=memo,
+                                                                                                 **local)
 
             vertex_0_won_by_player0 = 0 in winning_region_player0
 
         elif args.fbdd:
 
-            manager = _bdd.BDD()
+            manager = create_manager(**cudd_options)
             manager.configure(reordering=args.dynord)
 
+            # dynamic ordering is only enabled during some phases
+            reordering_phases = args.ordphases.split(',') if args.dynord else None
+
             input_signals, output_signals, automata_paths = decomp_data_file(args.input_path)
 
-            manager.declare(*input_signals)
-            manager.declare(*output_signals)
+            if args.reddim:
+                automata_paths = unique_automata(automata_paths)
 
-            product = get_product_automaton(automata_paths, manager, arbitrary_reordering=args.arbord,
-                                            aps=input_signals + output_signals, remap=not args.noremap)
+            signals = declare_signals(input_signals, output_signals, manager,
+                                      interleaved=not args.sepord, grouped=not args.nogrp)
 
-            arena, init = symb_dpa2gpg(product, input_signals, output_signals,
-                                       manager, restrict_reach_edges=args.rstredge)
+            cache = BDDCache(args.cache) if args.cache else None
 
-            if args.rec:
-                if arena.nbr_functions > 1:
-                    winning_region_player0, _ = bdd.generalizedRecursive.generalized_recursive(arena, manager)
-                else:
-                    winning_region_player0, _ = bdd.recursive.recursive(arena, manager)
+            # with -early, the game of each automaton and intermediate product is solved while the product is built
+            early = UnrealizabilityCheck(input_signals, output_signals, manager) if args.early else None
 
-            elif args.snl:
-                if arena.nbr_functions > 1:
-                    winning_region_player0, _ =\
-                        bdd.generalizedRecursive.generalized_recursive_with_psolver(arena, manager)
-                else:
-                    winning_region_player0, _ = bdd.recursive.recursive_with_buchi(arena, manager)
+            # the arena depends on the files and on the options that change its BDDs, but not on the variable order
+            arena_key = content_key([args.input_path] + automata_paths, "arena", args.noremap, args.prodord,
+                                    args.prunereach, args.reenc, args.bisim, args.onestep, args.rstredge,
+                                    args.safety, args.reddim)
+            cached_arena = cache.load_arena(arena_key, manager, interleaved=not args.sepord, grouped=not args.nogrp) \
+                if cache is not None else None
+
+            if cached_arena is not None:
+                arena, init = cached_arena
 
             else:
-                if arena.nbr_functions > 1:
-                    winning_region_player0, _ =\
-                        bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls(arena, manager)
+                product = get_product_automaton(automata_paths, manager, arbitrary_reordering=args.arbord,
+                                                aps=signals, remap=not args.noremap,
+                                                interleaved=not args.sepord, grouped=not args.nogrp,
+                                                reordering_phases=reordering_phases,
+                                                reordering_method=args.ordmethod, product_order=args.prodord,
+                                                prune_reachable=args.prunereach, reencode=args.reenc,
+                                                minimize=args.bisim, cache=cache, step_callback=early,
+                                                fold_weak=args.safety)
+
+                if early is not None and early.unrealizable:
+                    # the game of an automaton or an intermediate product is lost, the product is not needed
+                    arena, init = None, None
+
                 else:
-                    # TODO: Is psolver with multiple calls implemented for not generalized parity games ?
-                    winning_region_player0, _ =\
-                        bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls(arena, manager)
+                    set_reordering_phase("arena", manager, reordering_phases, args.ordmethod)
 
-            vertex_0_dict_rep = next(manager.pick_iter(init))
-            vertex_0_won_by_player0 = manager.let(vertex_0_dict_rep, winning_region_player0) == manager.true
+                    if args.onestep:
+                        arena, init = symb_dpa2onestep(product, input_signals, output_signals,
+                                                       manager, restrict_reach_edges=args.rstredge)
+                    else:
+                        arena, init = symb_dpa2gpg(product, input_signals, output_signals,
+                                                   manager, restrict_reach_edges=args.rstredge,
+                                                   interleaved=not args.sepord, grouped=not args.nogrp)
+
+                    if cache is not None:
+                        cache.dump_arena(arena_key, arena, init, manager)
+
+            if arena is not None and args.reddim:
+                arena = arena.reduce_dimensions(manager)
+
+            if arena is None:
+                vertex_0_won_by_player0 = False
+
+            else:
+                set_reordering_phase("solve", manager, reordering_phases, args.ordmethod)
+
+                solution = None
+                if args.onlyinit:
+                    arena, solution = bdd.localSolver.local_prepass(arena, init, manager)
+                if solution is None and args.buchi:
+                    solution = bdd.buchiGames.buchi_fast_path(arena, manager)
+
+                # with -onlyinit, the recursive algorithms stop as soon as the winner of the initial vertex is known,
+                # except with -scc which solves each component without it
+                local = {'init': init} if args.onlyinit and not args.scc else {}
+
+                if solution is not None:
+                    winning_region_player0, winning_region_player1 = solution
+
+                elif args.rec:
+                    if arena.nbr_functions > 1:
+                        winning_region_player0, _ = \
+                            decompose(partial(bdd.generalizedRecursive.generalized_recursive, cache=memo,
+                                              **local))(arena, manager)
+                    else:
+                        winning_region_player0, _ = decompose(partial(bdd.recursive.recursive, **local))(arena,
+                                                                                                         manager)
+
+                elif args.fix:
+                    winning_region_player0, _ = decompose(bdd.nestedFixpoint.nested_fixpoint)(arena, manager)
+
+                elif args.qpz:
+                    if arena.nbr_functions > 1:
+                        parser.error("-qpz requires a game with a single priority function.")
+                    winning_region_player0, _ = decompose(bdd.quasiPolynomial.quasi_polynomial)(arena, manager)
+
+                elif args.snl:
+                    if arena.nbr_functions > 1:
+                        winning_region_player0, _ =\
+                            decompose(partial(bdd.generalizedRecursive.generalized_recursive_with_psolver,
+                                              cache=memo, **local))(arena, manager)
+                    else:
+                        winning_region_player0, _ = decompose(partial(bdd.recursive.recursive_with_buchi,
+                                                                      **local))(arena, manager)
+
+                elif args.adp:
+                    # as with -par, games with a single priority function are also solved by the generalized algorithm
+                    schedule = AdaptiveSchedule(args.psshare)
+                    winning_region_player0, _ = \
+                        decompose(partial(bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls,
+                                          schedule=schedule, cache=memo, **local))(arena, manager)
+
+                else:
+                    if arena.nbr_functions > 1:
+                        winning_region_player0, _ = decompose(partial(
+                            bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls, cache=memo,
+                            **local))(arena, manager)
+                    else:
+                        # TODO: Is psolver with multiple calls implemented for not generalized parity games ?
+                        winning_region_player0, _ = decompose(partial(
+                            bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls, cache=memo,
+                            **local))(arena, manager)
+
+                vertex_0_dict_rep = next(manager.pick_iter(init))
+                vertex_0_won_by_player0 = manager.let(vertex_0_dict_rep, winning_region_player0) == manager.true
 
         else:  # if args.bdd or default
 
-            manager = _bdd.BDD()
-            arena, all_vertices = bdd_gen_loader.gpg2bdd(args.input_path, manager)
+            manager = create_manager(**cudd_options)
+            arena, all_vertices = bdd_gen_loader.gpg2bdd(args.input_path, manager, interleaved=not args.sepord,
+                                                         prune_unreachable=args.prunereach)
+
+            if args.reddim:
+                arena = arena.reduce_dimensions(manager)
+
+            solution = None
+            if args.onlyinit:
+                arena, solution = bdd.localSolver.local_prepass(arena, all_vertices[0], manager)
+            if solution is None and args.buchi:
+                solution = bdd.buchiGames.buchi_fast_path(arena, manager)
+
+            # with -onlyinit, the recursive algorithms stop as soon as the winner of the initial vertex is known, except
+            # with -scc which solves each component without it
+            local = {'init': all_vertices[0]} if args.onlyinit and not args.scc else {}
+
+            if solution is not None:
+                winning_region_player0, winning_region_player1 = solution
+
+            elif args.rec:
+                winning_region_player0, winning_region_player1 = \
+                    decompose(partial(bdd.generalizedRecursive.generalized_recursive, cache=memo, **local))(arena,
+                                                                                                            manager)
+
+            elif args.fix:
+                winning_region_player0, winning_region_player1 = \
+                    decompose(bdd.nestedFixpoint.nested_fixpoint)(arena, manager)
 
-            if args.rec:
+            elif args.qpz:
+                if arena.nbr_functions > 1:
+                    parser.error("-qpz requires a game with a single priority function.")
                 winning_region_player0, winning_region_player1 = \
-                    bdd.generalizedRecursive.generalized_recursive(arena, manager)
+                    decompose(bdd.quasiPolynomial.quasi_polynomial)(arena, manager)
 
             elif args.snl:
                 winning_region_player0, winning_region_player1 = \
-                    bdd.generalizedRecursive.generalized_recursive_with_psolver(arena, manager)
+                    decompose(partial(bdd.generalizedRecursive.generalized_recursive_with_psolver, cache=memo,
+                                      **local))(arena, manager)
+
+            elif args.adp:
+                schedule = AdaptiveSchedule(args.psshare)
+                winning_region_player0, winning_region_player1 = \
+                    decompose(partial(bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls,
+                                      schedule=schedule, cache=memo, **local))(arena, manager)
 
             else:
                 winning_region_player0, winning_region_player1 = \
-                    bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls(arena, manager)
+                    decompose(partial(bdd.generalizedRecursive.generalized_recursive_with_psolver_multiple_calls,
+                                      cache=memo, **local))(arena, manager)
 
             vertex_0_dict_rep = next(manager.pick_iter(all_vertices[0]))
             vertex_0_won_by_player0 = manager.let(vertex_0_dict_rep, winning_region_player0) == manager.true
 
+    if memo is not None:
+        print(memo.stats(), file=sys.stderr)
+
     if vertex_0_won_by_player0:
         print("REALIZABLE")
     else: